@@ -1,17 +1,28 @@
+import abc
 import asyncio
 import contextvars  # noqa
 import copy
+import dataclasses
+import gzip
+import hashlib
 import inspect
+import json
 import logging
+import os
+import re
+import sys
+import time
 import typing
-from collections import ChainMap, defaultdict
+from collections import ChainMap, OrderedDict, defaultdict
 from collections.abc import Coroutine
-from contextlib import AsyncExitStack, AbstractAsyncContextManager, asynccontextmanager, contextmanager
-from functools import cached_property
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from contextlib import AsyncExitStack, AbstractAsyncContextManager, AbstractContextManager, asynccontextmanager, contextmanager
 from types import FunctionType
-from typing import List, Tuple, Union, Any, Callable, Type, Optional, Dict, Sequence, Literal
+from typing import List, Tuple, Union, Any, Callable, Type, Optional, Dict, Sequence, Literal, AsyncIterator
 
 import pydantic
+import pydantic_core
 from fastapi.dependencies.utils import _should_embed_body_fields  # noqa
 from fastapi.openapi.constants import REF_PREFIX
 
@@ -25,16 +36,20 @@ from fastapi.dependencies.utils import solve_dependencies, get_dependant, get_fl
     get_parameterless_sub_dependant
 from fastapi.exceptions import RequestValidationError, HTTPException
 from fastapi.routing import APIRoute, APIRouter, request_response, serialize_response
+from fastapi.utils import create_model_field
 from pydantic import BaseModel, ValidationError, StrictStr, Field, create_model, ConfigDict
 from starlette.background import BackgroundTasks
 from starlette.concurrency import run_in_threadpool
-from starlette.requests import Request
-from starlette.responses import Response, JSONResponse
-from starlette.routing import Match, compile_path, Mount
+from starlette.requests import ClientDisconnect, Request
+from starlette.responses import Response, JSONResponse, StreamingResponse
+from starlette.routing import Match, compile_path, Mount, Route
 from starlette.types import Lifespan
 from fastapi.routing import _DefaultLifespan  # noqa: WPS450  starlette's _DefaultLifespan is a no-op; fastapi's runs on_startup/on_shutdown
+import fastapi
 import fastapi.params
 import aiojobs
+import anyio
+import anyio.to_thread
 import warnings
 
 logger = logging.getLogger(__name__)
@@ -47,6 +62,21 @@ except ImportError:
     sentry_sdk = None  # type: ignore
     sentry_transaction_from_function = None  # type: ignore
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None  # type: ignore
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # type: ignore
+
 try:
     from fastapi._compat import _normalize_errors  # noqa
 except ImportError:
@@ -115,6 +145,31 @@ class Params(fastapi.params.Body):
 components: Dict[Tuple[str, str], Type[BaseModel]] = {}
 
 
+def component_title(name: str, module: Optional[str]) -> Optional[str]:
+    """Unique title for pydantic schema generation to prevent deduplication.
+
+    Pydantic uses title (if set) for schema key generation. Exclude fastapi_jsonrpc (core library)
+    and __main__ (entry point, unlikely to collide).
+    """
+    if module and module not in ('fastapi_jsonrpc', '__main__'):
+        return f'{module}.{name}'
+    return None
+
+
+def register_component(name: str, module: Optional[str], obj: Type[BaseModel]) -> Type[BaseModel]:
+    key = (name, module)
+    if key in components:
+        lhs = components[key].model_json_schema()
+        rhs = obj.model_json_schema()
+        if lhs != rhs:
+            raise RuntimeError(
+                f"Different models with the same name detected: {lhs!r} != {rhs}"
+            )
+        return components[key]
+    components[key] = obj
+    return obj
+
+
 def component_name(name: str, module: Optional[str] = None) -> Callable[[Type[BaseModel]], Type[BaseModel]]:
     """OpenAPI components must be unique by name.
 
@@ -126,10 +181,6 @@ def component_name(name: str, module: Optional[str] = None) -> Callable[[Type[Ba
         assert issubclass(obj, BaseModel)
         effective_module = module or obj.__module__
 
-        # Determine if we need module prefix in title to prevent deduplication
-        # Exclude fastapi_jsonrpc (core library) and __main__ (entry point, unlikely to collide)
-        needs_module_prefix = effective_module and effective_module not in ('fastapi_jsonrpc', '__main__')
-
         opts: dict[str, Any] = {
             '__base__': tuple(obj.mro()[1:]),  # remove self from __base__
             '__module__': effective_module,
@@ -146,29 +197,28 @@ def component_name(name: str, module: Optional[str] = None) -> Callable[[Type[Ba
         # since Pydantic 2.0 model json schema generated at class creation process
         obj = create_model(name, **opts)
 
-        # Set unique title for pydantic schema generation to prevent deduplication
-        # Pydantic uses title (if set) for schema key generation
-        if needs_module_prefix:
-            obj.model_config['title'] = f'{effective_module}.{name}'
+        title = component_title(name, effective_module)
+        if title is not None:
+            obj.model_config['title'] = title
 
         if module is not None:
             obj.__module__ = module  # see: pydantic._internal._core_utils.get_type_ref
 
-        key = (name, effective_module)
-        if key in components:
-            lhs = components[key].model_json_schema()
-            rhs = obj.model_json_schema()
-            if lhs != rhs:
-                raise RuntimeError(
-                    f"Different models with the same name detected: {lhs!r} != {rhs}"
-                )
-            return components[key]
-        components[key] = obj
-        return obj
+        return register_component(name, effective_module, obj)
 
     return decorator
 
 
+def create_component(name: str, module: str, config: Optional[ConfigDict] = None, /, **fields) -> Type[BaseModel]:
+    """Same as `component_name(name, module)(create_model(...))`, but the model is created once"""
+    config = ConfigDict(**(config or {}))
+    title = component_title(name, module)
+    if title is not None:
+        config['title'] = title
+    obj = create_model(name, __config__=config, __module__=module, **fields)
+    return register_component(name, module, obj)
+
+
 def is_scope_child(owner: Type[BaseModel], child: Type[BaseModel]) -> bool:
     return (
         (
@@ -299,15 +349,7 @@ class BaseError(Exception):
         }
 
         name = f'_ErrorData[{error_model.__name__}]'
-        _ErrorData = create_model(
-            name,
-            __base__=(BaseModel,),
-            __module__=error_model.__module__,
-            **field_definitions,
-        )
-        _ErrorData = component_name(name, error_model.__module__)(_ErrorData)
-
-        return _ErrorData
+        return create_component(name, error_model.__module__, **field_definitions)
 
     @classmethod
     def get_resp_model(cls):
@@ -334,23 +376,16 @@ class BaseError(Exception):
 
         name = cls._component_name or cls.__name__
 
-        _JsonRpcErrorModel = create_model(
-            name,
-            __base__=(BaseModel,),
-            __module__=cls.__module__,
-            **fields_definition,
-        )
-        _JsonRpcErrorModel = component_name(name, cls.__module__)(_JsonRpcErrorModel)
-
-        @component_name(f'_ErrorResponse[{name}]', cls.__module__)
-        class _ErrorResponseModel(BaseModel):
-            jsonrpc: Literal['2.0'] = Field('2.0', json_schema_extra={'example': '2.0'})
-            id: Union[StrictStr, int] = Field(None, json_schema_extra={'example': 0})
-            error: _JsonRpcErrorModel
-
-            model_config = ConfigDict(extra='forbid')
+        _JsonRpcErrorModel = create_component(name, cls.__module__, **fields_definition)
 
-        return _ErrorResponseModel
+        return create_component(
+            f'_ErrorResponse[{name}]',
+            cls.__module__,
+            ConfigDict(extra='forbid'),
+            jsonrpc=(Literal['2.0'], Field('2.0', json_schema_extra={'example': '2.0'})),
+            id=(Union[StrictStr, int], Field(None, json_schema_extra={'example': 0})),
+            error=(_JsonRpcErrorModel, ...),
+        )
 
 
 @component_name('_Error')
@@ -393,10 +428,172 @@ class InternalError(BaseError):
     MESSAGE = "Internal error"
 
 
+class RequestTimeout(BaseError):
+    """Method call did not finish in time"""
+    CODE = -32002
+    MESSAGE = "Request timeout"
+
+
+class ServerOverloaded(BaseError):
+    """Too many concurrent calls of the method, try again later"""
+    CODE = -32001
+    MESSAGE = "Server overloaded"
+
+
 class NoContent(Exception):
     pass
 
 
+class JsonCodec:
+    """Encodes and decodes JSON-RPC payloads. Stdlib `json` based.
+
+    `loads` must raise `ValueError` on malformed input, `dumps` must return `bytes`.
+    """
+
+    media_type = 'application/json'
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        # Same output as starlette.responses.JSONResponse
+        return json.dumps(
+            obj,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(',', ':'),
+        ).encode('utf-8')
+
+
+class OrjsonCodec(JsonCodec):
+    def __init__(self):
+        if orjson is None:
+            raise RuntimeError("OrjsonCodec requires 'orjson' to be installed")
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+
+class MsgspecCodec(JsonCodec):
+    def __init__(self):
+        if msgspec is None:
+            raise RuntimeError("MsgspecCodec requires 'msgspec' to be installed")
+        self.decoder = msgspec.json.Decoder()
+        self.encoder = msgspec.json.Encoder()
+
+    def loads(self, data: bytes) -> Any:
+        try:
+            return self.decoder.decode(data)
+        except msgspec.DecodeError as exc:
+            raise ValueError(str(exc)) from exc
+
+    def dumps(self, obj: Any) -> bytes:
+        return self.encoder.encode(obj)
+
+
+default_json_codec = JsonCodec()
+
+
+class JsonArrayStreamParser:
+    """Incrementally splits JSON array body into elements while it is being received.
+
+    Only element boundaries are found here, each element is decoded by the codec.
+    Consumed bytes are dropped, so the whole raw body is never held in memory.
+    Non-array body is accumulated and decoded as a whole on `close`.
+    """
+
+    _structural = re.compile(rb'[\[\]{}",]')
+    _string_tail = re.compile(rb'(?:[^"\\]|\\.)*"', re.DOTALL)
+    _whitespace = b' \t\n\r'
+
+    def __init__(self, json_codec: JsonCodec):
+        self.json_codec = json_codec
+        self.buffer = b''
+        self.is_array: Optional[bool] = None
+        self.is_closed = False
+        self.count = 0
+        self._pos = 0
+        self._depth = 0
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        self.buffer += chunk
+
+        if self.is_array is None:
+            stripped = self.buffer.lstrip(self._whitespace)
+            if not stripped:
+                return []
+            self.is_array = stripped[:1] == b'['
+            if self.is_array:
+                self.buffer = stripped[1:]
+
+        if not self.is_array:
+            return []
+
+        if self.is_closed:
+            if self.buffer.strip(self._whitespace):
+                raise ValueError("Extra data after JSON array")
+            return []
+
+        elements = []
+        buffer = self.buffer
+        pos = self._pos
+        start = 0
+        while True:
+            match = self._structural.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+
+            index = match.start()
+            char = buffer[index:index + 1]
+            if char == b'"':
+                string_tail = self._string_tail.match(buffer, index + 1)
+                if string_tail is None:
+                    # wait for the rest of string
+                    pos = index
+                    break
+                pos = string_tail.end()
+                continue
+
+            pos = index + 1
+            if char in b'[{':
+                self._depth += 1
+            elif self._depth:
+                if char in b']}':
+                    self._depth -= 1
+            elif char in b',]':
+                element = buffer[start:index]
+                if char == b']' and not self.count and not element.strip(self._whitespace):
+                    pass  # empty array
+                else:
+                    elements.append(self.json_codec.loads(element))
+                    self.count += 1
+                start = pos
+                if char == b']':
+                    self.is_closed = True
+                    if buffer[start:].strip(self._whitespace):
+                        raise ValueError("Extra data after JSON array")
+                    break
+            else:
+                raise ValueError(f"Unexpected {char!r} in JSON array")
+
+        self.buffer = buffer[start:]
+        self._pos = pos - start
+        return elements
+
+    def close(self) -> Any:
+        """Returns decoded body if it is not an array"""
+        if self.is_array:
+            if not self.is_closed:
+                raise ValueError("Unterminated JSON array")
+            return None
+        return self.json_codec.loads(self.buffer)
+
+
 async def call_sync_async(call, *args, **kwargs):
     is_coroutine = asyncio.iscoroutinefunction(call)
     if is_coroutine:
@@ -405,7 +602,53 @@ async def call_sync_async(call, *args, **kwargs):
         return await run_in_threadpool(call, *args, **kwargs)
 
 
-def errors_responses(errors: Optional[Sequence[Type[BaseError]]] = None)->Dict[Any, Any]:
+class DependencyOverrides(dict):
+    """`FastAPI.dependency_overrides` which counts its changes, so routes know when to recompile"""
+
+    version = 0
+
+    def _changed(self):
+        self.version += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def pop(self, *args):
+        self._changed()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._changed()
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        self._changed()
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+
+def has_content(resp: Union[dict, bytes]) -> bool:
+    # pre-rendered JSON is produced only for responses with id
+    return isinstance(resp, bytes) or 'error' in resp or 'id' in resp
+
+
+def errors_responses(errors: Optional[Sequence[Type[BaseError]]] = None, with_models: bool = True)->Dict[Any, Any]:
     responses: Dict[Any, Any] = {'default': {}}
 
     if errors:
@@ -413,13 +656,52 @@ def errors_responses(errors: Optional[Sequence[Type[BaseError]]] = None)->Dict[A
         # generate fake status codes for each error
         for fake_status_code, error_cls in enumerate(errors, start=210):
             responses[fake_status_code] = {
-                'model': error_cls.get_resp_model(),
                 'description': error_cls.get_description(),
             }
+            if with_models:
+                responses[fake_status_code]['model'] = error_cls.get_resp_model()
 
     return responses
 
 
+def build_errors_responses(route: APIRoute) -> None:
+    """Add error response models to the route created with `errors_responses(with_models=False)`.
+
+    Error models are only needed for OpenAPI, routes call it on the first read of `ErrorModels` attributes.
+    """
+    for fake_status_code, error_cls in enumerate(route.errors, start=210):
+        response = route.responses.setdefault(fake_status_code, {'description': error_cls.get_description()})
+        if 'model' in response:
+            continue
+        response['model'] = error_cls.get_resp_model()
+        route.response_fields[fake_status_code] = create_model_field(
+            name=f'Response_{fake_status_code}_{route.unique_id}',
+            type_=response['model'],
+            mode='serialization',
+        )
+
+
+class ErrorModels:
+    """Route `responses` / `response_fields` with error models built on the first read.
+
+    So the models are there whatever generates the schema, `API.openapi()` or `fastapi.openapi.utils.get_openapi`.
+    """
+
+    def __set_name__(self, owner, name):
+        self.attr = f'_{name}'
+
+    def __get__(self, route, owner=None):
+        if route is None:
+            return self
+        if route.__dict__.get('error_models_pending'):
+            route.error_models_pending = False
+            build_errors_responses(route)
+        return route.__dict__[self.attr]
+
+    def __set__(self, route, value):
+        route.__dict__[self.attr] = value
+
+
 @component_name(f'_Request')
 class JsonRpcRequest(BaseModel):
     jsonrpc: Literal['2.0'] = Field('2.0', json_schema_extra={'example': '2.0'})
@@ -482,6 +764,54 @@ def insert_dependencies(target: Dependant, dependencies: Optional[Sequence[Depen
         )
 
 
+def is_params_only_dependant(dependant: Dependant) -> bool:
+    """Method takes JSON-RPC params only: no dependencies, headers, cookies, request, etc."""
+    return not (
+        dependant.dependencies
+        or dependant.path_params
+        or dependant.query_params
+        or dependant.header_params
+        or dependant.cookie_params
+        or dependant.request_param_name
+        or dependant.websocket_param_name
+        or dependant.http_connection_param_name
+        or dependant.response_param_name
+        or dependant.background_tasks_param_name
+        or dependant.security_scopes_param_name
+    )
+
+
+def has_generator_dependencies(dependant: Dependant) -> bool:
+    """Some of dependencies, including nested ones, are generators (`yield` dependencies)"""
+    return any(
+        sub_dependant.is_gen_callable or sub_dependant.is_async_gen_callable or has_generator_dependencies(sub_dependant)
+        for sub_dependant in dependant.dependencies
+    )
+
+
+def without_sub_dependencies(dependant: Dependant, cache_keys: typing.AbstractSet[Any]) -> Dependant:
+    """Copy of dependant where dependencies with `cache_keys` have neither params nor sub-dependencies.
+
+    FastAPI solves sub-dependencies before looking a dependency up in `dependency_cache`,
+    so they are dropped for dependencies whose values are already there.
+    """
+    dependencies = []
+    for sub_dependant in dependant.dependencies:
+        if sub_dependant.use_cache and sub_dependant.cache_key in cache_keys:
+            cache_key = sub_dependant.cache_key
+            sub_dependant = dataclasses.replace(
+                sub_dependant,
+                path_params=[], query_params=[], header_params=[], cookie_params=[], body_params=[],
+                dependencies=[],
+            )
+            # Depends on sub-dependencies (security scopes), must stay the same
+            sub_dependant.__dict__['cache_key'] = cache_key
+        else:
+            sub_dependant = without_sub_dependencies(sub_dependant, cache_keys)
+        dependencies.append(sub_dependant)
+    return dataclasses.replace(dependant, dependencies=dependencies)
+
+
 def make_request_model(name: str, module: str, body_params: List[ModelField]) -> Type[BaseModel]:
     whole_params_list = [p for p in body_params if isinstance(p.field_info, Params)]
     if len(whole_params_list):
@@ -506,44 +836,477 @@ def make_request_model(name: str, module: str, body_params: List[ModelField]) ->
             param.name: (param.field_info.annotation, param.field_info)
             for param in body_params
         }
-        _JsonRpcRequestParams = create_model(
-            f'_Params[{name}]',
-            __base__=(BaseModel,),
-            __module__=module,
-            **fields,
-        )
-        _JsonRpcRequestParams = component_name(f'_Params[{name}]', module)(_JsonRpcRequestParams)
+        _JsonRpcRequestParams = create_component(f'_Params[{name}]', module, **fields)
 
         params_annotation = _JsonRpcRequestParams
         params_field_info = ...
 
-    _Request = create_model(
+    _Request = create_component(
         f'_Request[{name}]',
-        __config__=ConfigDict(extra='forbid'),
-        __module__=module,
+        module,
+        ConfigDict(extra='forbid'),
         jsonrpc=(Literal['2.0'], Field('2.0', json_schema_extra={'example': '2.0'})),
         id=(Union[StrictStr, int], Field(None, json_schema_extra={'example': 0})),
         method=(StrictStr, Field(name, frozen=True, json_schema_extra={'example': name})),
         params=(params_annotation, params_field_info)
     )
-    _Request = component_name(f'_Request[{name}]', module)(_Request)
 
     return _Request
 
 
 def make_response_model(name: str, module: str, result_model: Type[BaseModel]) -> Type[BaseModel]:
-    @component_name(f'_Response[{name}]', module)
-    class _Response(BaseModel):
-        jsonrpc: Literal['2.0'] = Field('2.0', json_schema_extra={'example': '2.0'})
-        id: Union[StrictStr, int] = Field(None, json_schema_extra={'example': 0})
-        result: result_model  # type: ignore[valid-type]
+    return create_component(
+        f'_Response[{name}]',
+        module,
+        ConfigDict(extra='forbid', json_schema_serialization_defaults_required=True),
+        jsonrpc=(Literal['2.0'], Field('2.0', json_schema_extra={'example': '2.0'})),
+        id=(Union[StrictStr, int], Field(None, json_schema_extra={'example': 0})),
+        result=(result_model, ...),
+    )
+
+
+class ConcurrencyLimiter:
+    """Limits concurrent calls of a method.
+
+    When all `max_concurrency` slots are busy, at most `max_queue` calls wait for a slot
+    (at most `queue_timeout` seconds), others are rejected with `ServerOverloaded`.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int = 0, queue_timeout: Optional[float] = None):
+        if max_concurrency < 1:
+            raise ValueError("'max_concurrency' must be positive")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.waiting = 0
+        self.rejected = 0
+
+    async def acquire(self):
+        if not self.semaphore.locked():
+            await self.semaphore.acquire()
+            return
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise ServerOverloaded()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ServerOverloaded()
+        finally:
+            self.waiting -= 1
+
+    def release(self):
+        self.semaphore.release()
+
+
+def _release_when_done(limiter: ConcurrencyLimiter, call: asyncio.Future):
+    limiter.release()
+    if not call.cancelled():
+        # Caller may be gone, do not warn about never retrieved exception
+        call.exception()
+
+
+async def _close_when_done(call: asyncio.Future, exit_stack: AsyncExitStack):
+    try:
+        await asyncio.wait([call])
+        if not call.cancelled():
+            call.exception()
+    finally:
+        await exit_stack.aclose()
+
+
+async def call_with_deadline(deadline: float, aw: typing.Awaitable) -> Any:
+    """Await `aw`, cancel it and raise `RequestTimeout` at `deadline` (event loop time)"""
+    if sys.version_info >= (3, 11):
+        timeout = asyncio.timeout_at(deadline)
+        try:
+            async with timeout:
+                return await aw
+        except TimeoutError:
+            if timeout.expired():
+                raise RequestTimeout()
+            raise
+    try:
+        return await asyncio.wait_for(aw, max(deadline - asyncio.get_running_loop().time(), 0))
+    except asyncio.TimeoutError:
+        raise RequestTimeout()
+
+
+def make_call_key(route: 'MethodRoute', values: dict, key_dependencies: Sequence[str] = ()) -> str:
+    """Method path and canonicalized validated params (and `key_dependencies` values)"""
+    # Params of the method itself, params taken by its dependencies are not in values
+    parts = {param.name: values[param.name] for param in route.func_dependant.body_params}
+    for name in key_dependencies:
+        parts[name] = values[name]
+    canonical = json.dumps(
+        pydantic_core.to_jsonable_python(parts),
+        sort_keys=True,
+        separators=(',', ':'),
+    )
+    return route.path + ':' + hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class CacheBackend(abc.ABC):
+    """Storage of `ResultCache`, implement it for a store shared by workers"""
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abc.abstractmethod
+    async def set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache with TTL"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        # key -> (expires at, value), least recently used first
+        self.items: OrderedDict[str, Tuple[Optional[float], bytes]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        item = self.items.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.items[key]
+            return None
+        self.items.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        self.items[key] = (time.monotonic() + ttl if ttl is not None else None, value)
+        self.items.move_to_end(key)
+        while len(self.items) > self.maxsize:
+            self.items.popitem(last=False)
+
+
+class ResultCache:
+    """Cache of method results, see `Entrypoint.method(cache=...)`.
+
+    Keyed by method path and validated params, plus values of `key_dependencies` (names of method
+    arguments filled by dependencies, e.g. the tenant). Methods with dependencies must pass
+    `key_dependencies` (may be empty). Serialized result is cached, so hits skip both the method
+    call and serialization.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = 60,
+        *,
+        maxsize: int = 1024,
+        key_dependencies: Optional[Sequence[str]] = None,
+        backend: Optional[CacheBackend] = None,
+    ):
+        self.ttl = ttl
+        # None means not given, then only methods taking nothing but params can be cached
+        self.key_dependencies = tuple(key_dependencies) if key_dependencies is not None else None
+        self.backend = backend if backend is not None else MemoryCacheBackend(maxsize)
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, route: 'MethodRoute', values: dict) -> str:
+        return make_call_key(route, values, self.key_dependencies or ())
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = await self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        await self.backend.set(key, value, self.ttl)
+
+
+class DependencyCache:
+    """In-process LRU cache with TTL of a dependency value, see `CachedDepends`"""
+
+    def __init__(
+        self,
+        key: Callable[[Request], Optional[typing.Hashable]],
+        ttl: Optional[float] = 60,
+        maxsize: int = 1024,
+    ):
+        self.key = key
+        self.ttl = ttl
+        self.maxsize = maxsize
+        # key -> (expires at, value), least recently used first
+        self.items: OrderedDict[typing.Hashable, Tuple[Optional[float], Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: typing.Hashable) -> Tuple[bool, Any]:
+        item = self.items.get(key)
+        if item is not None:
+            expires_at, value = item
+            if expires_at is None or expires_at > time.monotonic():
+                self.items.move_to_end(key)
+                self.hits += 1
+                return True, value
+            del self.items[key]
+        self.misses += 1
+        return False, None
+
+    def set(self, key: typing.Hashable, value: Any) -> None:
+        self.items[key] = (time.monotonic() + self.ttl if self.ttl is not None else None, value)
+        self.items.move_to_end(key)
+        while len(self.items) > self.maxsize:
+            self.items.popitem(last=False)
+
+    def __contains__(self, key: typing.Hashable) -> bool:
+        item = self.items.get(key)
+        return item is not None and (item[0] is None or item[0] > time.monotonic())
+
+
+class CachedDepends(Depends):
+    """`Depends` of the entrypoint `dependencies` / `common_dependencies` cached across HTTP requests.
+
+    `key(http_request)` returns the cache key, e.g. `Authorization` header, or None to not use the cache.
+    The value is shared by all requests with the same key, so it should not be mutated.
+    On a hit its sub-dependencies are not solved either. `yield` dependencies can't be cached.
+    """
+
+    def __init__(
+        self,
+        dependency: Callable[..., Any],
+        *,
+        key: Callable[[Request], Optional[typing.Hashable]],
+        ttl: Optional[float] = 60,
+        maxsize: int = 1024,
+        use_cache: bool = True,
+    ):
+        dependant = Dependant(call=dependency)
+        if dependant.is_gen_callable or dependant.is_async_gen_callable:
+            # Its value would be used by later requests after the cleanup
+            raise ValueError("Dependency with 'yield' can't be cached across requests")
+        super().__init__(dependency, use_cache=use_cache)
+        # Depends is frozen dataclass
+        object.__setattr__(self, 'cache', DependencyCache(key, ttl=ttl, maxsize=maxsize))
+
+
+SyncExecutor = Union[Executor, anyio.CapacityLimiter]
+
+
+def _warm_up():
+    pass
+
+
+class ProcessPool:
+    """Process pool of the entrypoint methods with `executor='process'`.
+
+    Workers are started on `Entrypoint.startup`. With `recycle_after` the pool is replaced by a fresh one
+    after that many calls, old workers exit when their calls are done.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        *,
+        recycle_after: Optional[int] = None,
+        initializer: Optional[Callable] = None,
+        initargs: tuple = (),
+        mp_context: Any = None,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.recycle_after = recycle_after
+        self.initializer = initializer
+        self.initargs = initargs
+        self.mp_context = mp_context
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.calls = 0
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self.mp_context,
+                initializer=self.initializer,
+                initargs=self.initargs,
+            )
+            self.calls = 0
+        return self.executor
+
+    async def start(self):
+        executor = self.get_executor()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(executor, _warm_up) for _ in range(self.max_workers)))
+
+    async def run(self, func: Callable, values: dict) -> Any:
+        executor = self.get_executor()
+        self.calls += 1
+        if self.recycle_after is not None and self.calls >= self.recycle_after:
+            self.executor = None
+            future = asyncio.get_running_loop().run_in_executor(executor, partial(func, **values))
+            executor.shutdown(wait=False)
+            return await future
+        return await asyncio.get_running_loop().run_in_executor(executor, partial(func, **values))
+
+    async def close(self):
+        executor, self.executor = self.executor, None
+        if executor is not None:
+            await run_in_threadpool(executor.shutdown)
+
+
+def check_sync_executor(executor: Optional[Union[SyncExecutor, Literal['process']]], allow_process: bool = True):
+    if executor is None or isinstance(executor, (Executor, anyio.CapacityLimiter)):
+        return
+    if executor == 'process' and allow_process:
+        return
+    raise TypeError(f"executor must be concurrent.futures.Executor or anyio.CapacityLimiter, got {executor!r}")
+
+
+async def run_in_executor(executor: Union[SyncExecutor, ProcessPool], func: Callable, values: dict) -> Any:
+    """Call sync `func` in executor, or in anyio threads limited by own `CapacityLimiter`"""
+    if isinstance(executor, ProcessPool):
+        return await executor.run(func, values)
+    if isinstance(executor, anyio.CapacityLimiter):
+        return await anyio.to_thread.run_sync(partial(func, **values), limiter=executor)
+    if isinstance(executor, ProcessPoolExecutor):
+        # Context can't be passed to another process, func and values must be picklable
+        call = partial(func, **values)
+    else:
+        call = partial(contextvars.copy_context().run, func, **values)
+    return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+
+class MethodRoutePlan:
+    """Everything `MethodRoute` needs on every request that depends only on the route.
+
+    Compiled once, recompiled when dependency overrides of the bound app change.
+    """
+
+    __slots__ = (
+        'embed_body_fields',
+        'is_coroutine',
+        'executor',
+        'runs_after_cancel',
+        'dependency_overrides_provider',
+        'dependency_overrides_version',
+        'solve_dependency_overrides_provider',
+        'response_serialize_kwargs',
+    )
+
+    def __init__(self, route: 'MethodRoute'):
+        self.embed_body_fields = _should_embed_body_fields(route.flat_dependant.body_params)
+        self.is_coroutine = asyncio.iscoroutinefunction(route.func)
+        executor = route.executor if route.executor is not None else route.entrypoint.executor
+        if executor == 'process':
+            executor = route.entrypoint.process_pool
+        self.executor = executor
+        # Sync call in executor keeps running when cancelled, unlike anyio threads which are waited for
+        self.runs_after_cancel = not self.is_coroutine and isinstance(executor, (Executor, ProcessPool))
+
+        provider = route.dependency_overrides_provider
+        overrides = getattr(provider, 'dependency_overrides', None)
+        self.dependency_overrides_provider = provider
+        self.dependency_overrides_version = getattr(overrides, 'version', None)
+        if isinstance(overrides, DependencyOverrides) and not overrides:
+            # solve_dependencies looks up overrides for every sub-dependency, nothing to look up
+            self.solve_dependency_overrides_provider = None
+        else:
+            self.solve_dependency_overrides_provider = provider
+
+        self.response_serialize_kwargs = dict(
+            include=route.response_model_include,
+            exclude=route.response_model_exclude,
+            by_alias=route.response_model_by_alias,
+            exclude_unset=route.response_model_exclude_unset,
+        )
+
+    def is_outdated(self, route: 'MethodRoute') -> bool:
+        provider = route.dependency_overrides_provider
+        if provider is not self.dependency_overrides_provider:
+            return True
+        overrides = getattr(provider, 'dependency_overrides', None)
+        return getattr(overrides, 'version', None) != self.dependency_overrides_version
+
+
+class ValidatedResponse:
+    """Successful response validated by the `MethodRoute` response model.
+
+    Rendered to JSON bytes by the model serializer in one pass,
+    the dict form is built only if someone asks for `JsonRpcContext.raw_response`.
+    """
+
+    __slots__ = ('method_route', 'value')
+
+    def __init__(self, method_route: 'MethodRoute', value: BaseModel):
+        self.method_route = method_route
+        self.value = value
+
+    def dump_python(self) -> dict:
+        route = self.method_route
+        return route.response_serializer.to_python(
+            self.value,
+            mode='json',
+            by_alias=route.response_model_by_alias,
+            exclude_unset=route.response_model_exclude_unset,
+        )
+
+    def dump_body(self) -> bytes:
+        """JSON without id"""
+        route = self.method_route
+        return route.response_serializer.to_json(
+            self.value,
+            by_alias=route.response_model_by_alias,
+            exclude_unset=route.response_model_exclude_unset,
+            exclude={'id'},
+        )
 
-        model_config = ConfigDict(extra='forbid', json_schema_serialization_defaults_required=True)
+    def dump_json(self, request_id: Union[str, int], json_codec: 'JsonCodec') -> bytes:
+        body = self.dump_body()
+        # id is taken from raw request as is, see JsonRpcContext.on_raw_response
+        separator = b',' if body != b'{}' else b''
+        return body[:-1] + separator + b'"id":' + json_codec.dumps(request_id) + b'}'
 
-    return _Response
+
+class SerializedResponse(ValidatedResponse):
+    """Successful response already rendered to JSON without id, e.g. taken from `ResultCache`"""
+
+    __slots__ = ()
+
+    def __init__(self, method_route: 'MethodRoute', value: bytes):
+        super().__init__(method_route, value)
+
+    def dump_python(self) -> dict:
+        return json.loads(self.value)
+
+    def dump_body(self) -> bytes:
+        return self.value
 
 
 class JsonRpcContext:
+    # `__dict__` is kept for attributes set by user code and middlewares
+    __slots__ = (
+        'entrypoint',
+        'raw_request',
+        'http_request',
+        'background_tasks',
+        'http_response',
+        'request_class',
+        'method_route',
+        '_request',
+        '_raw_response',
+        '_validated_response',
+        'validated_params',
+        'deadline',
+        'exception',
+        'is_unhandled_exception',
+        'exit_stack',
+        'jsonrpc_context_token',
+        '_old_sentry_integration',
+        '__dict__',
+        '__weakref__',
+    )
+
     def __init__(
         self,
         entrypoint: 'Entrypoint',
@@ -561,16 +1324,32 @@ class JsonRpcContext:
         self.http_response: Response = http_response
         self.request_class: Type[JsonRpcRequest] = json_rpc_request_class
         self.method_route: typing.Optional[MethodRoute] = method_route
+        self._request: Optional[JsonRpcRequest] = None
         self._raw_response: Optional[dict] = None
+        self._validated_response: Optional[ValidatedResponse] = None
+        # Method params validated together with request, see MethodRoute.validate_request
+        self.validated_params: Optional[Union[dict, BaseError]] = None
+        # Event loop time the method call must be done by, see MethodRoute.get_deadline
+        self.deadline: Optional[float] = None
         self.exception: Optional[Exception] = None
         self.is_unhandled_exception: bool = False
+        # Created on demand, only middlewares need it
         self.exit_stack: Optional[AsyncExitStack] = None
         self.jsonrpc_context_token: Optional[contextvars.Token] = None
+        self._old_sentry_integration: Optional[AbstractContextManager] = None
 
     def on_raw_response(
         self,
-        raw_response: Union[dict, Exception],
+        raw_response: Union[dict, ValidatedResponse, Exception],
     ):
+        if isinstance(raw_response, ValidatedResponse):
+            self._validated_response = raw_response
+            self._raw_response = None
+            self.exception = None
+            self.is_unhandled_exception = False
+            return
+
+        self._validated_response = None
         exception = None
         is_unhandled_exception = False
 
@@ -585,54 +1364,110 @@ class JsonRpcContext:
                 is_unhandled_exception = True
 
         if raw_response is not None:
-            raw_response.pop('id', None)
-            if isinstance(self.raw_request, dict) and 'id' in self.raw_request:
-                raw_response['id'] = self.raw_request.get('id')
-            elif 'error' in raw_response:
-                raw_response['id'] = None
+            self._set_response_id(raw_response)
 
         self._raw_response = raw_response
         self.exception = exception
         self.is_unhandled_exception = is_unhandled_exception
 
+    def _set_response_id(self, raw_response: dict):
+        raw_response.pop('id', None)
+        if isinstance(self.raw_request, dict) and 'id' in self.raw_request:
+            raw_response['id'] = self.raw_request.get('id')
+        elif 'error' in raw_response:
+            raw_response['id'] = None
+
     @property
     def raw_response(self) -> dict:
+        if self._validated_response is not None:
+            # Caller may mutate the dict, so pre-rendered JSON is not valid anymore
+            validated_response, self._validated_response = self._validated_response, None
+            raw_response = validated_response.dump_python()
+            self._set_response_id(raw_response)
+            self._raw_response = raw_response
         return self._raw_response
 
+    @property
+    def raw_response_json(self) -> Optional[bytes]:
+        """Response rendered to JSON bytes, if nobody needed it as dict"""
+        if self._validated_response is None:
+            return None
+        if not isinstance(self.raw_request, dict) or 'id' not in self.raw_request:
+            return None
+        return self._validated_response.dump_json(self.raw_request['id'], self.entrypoint.json_codec)
+
     @raw_response.setter
     def raw_response(self, value: dict):
         self.on_raw_response(value)
 
-    @cached_property
+    @property
     def request(self) -> JsonRpcRequest:
-        try:
-            return self.request_class.model_validate(self.raw_request)
-        except ValidationError as exc:
-            raise invalid_request_from_validation_error(exc)
+        request = self._request
+        if request is None:
+            try:
+                request = self._request = self.request_class.model_validate(self.raw_request)
+            except ValidationError as exc:
+                raise invalid_request_from_validation_error(exc)
+        return request
+
+    @request.setter
+    def request(self, value: JsonRpcRequest):
+        self._request = value
+
+    @property
+    def is_request_validated(self) -> bool:
+        return self._request is not None
+
+    def get_exit_stack(self) -> AsyncExitStack:
+        if self.exit_stack is None:
+            self.exit_stack = AsyncExitStack()
+        return self.exit_stack
 
     async def __aenter__(self):
-        assert self.exit_stack is None
-        self.exit_stack = await AsyncExitStack().__aenter__()
+        assert self.jsonrpc_context_token is None
         if (
             sentry_sdk is not None
             and get_sentry_integration() is None
         ):
-            self.exit_stack.enter_context(self._enter_old_sentry_integration())
+            self._old_sentry_integration = self._enter_old_sentry_integration()
+            self._old_sentry_integration.__enter__()
 
-        await self.exit_stack.enter_async_context(self._handle_exception(reraise=False))
         self.jsonrpc_context_token = _jsonrpc_context.set(self)
         return self
 
-    async def __aexit__(self, *exc_details):
+    async def __aexit__(self, exc_type, exc, tb):
         assert self.jsonrpc_context_token is not None
         _jsonrpc_context.reset(self.jsonrpc_context_token)
-        return await self.exit_stack.__aexit__(*exc_details)
-
-    @asynccontextmanager
-    async def _handle_exception(self, reraise=True):
         try:
-            yield
-        except Exception as exception:
+            exception = exc
+            if self.exit_stack is not None:
+                try:
+                    if await self.exit_stack.__aexit__(exc_type, exc, tb):
+                        exception = None
+                except BaseException as stack_exc:
+                    exception = stack_exc
+
+            if await self._handle_exception(exception, reraise=False):
+                return True
+            if exception is not None and exception is not exc:
+                raise exception
+            return False
+        finally:
+            if self._old_sentry_integration is not None:
+                self._old_sentry_integration.__exit__(None, None, None)
+
+    async def _handle_exception(self, exception: Optional[BaseException], reraise=True) -> bool:
+        """Exit callback of the context and of every middleware.
+
+        Converts the exception to response and returns True if it must be suppressed,
+        re-raises `self.exception` if it must be propagated further.
+        """
+        if exception is not None and not isinstance(exception, Exception):
+            # asyncio.CancelledError and the like
+            return False
+
+        suppress = False
+        if exception is not None:
             if exception is not self.exception:
                 try:
                     resp = await self.entrypoint.handle_exception(exception)
@@ -641,10 +1476,17 @@ class JsonRpcContext:
                 else:
                     self.on_raw_response(resp)
             if self.exception is not None and (reraise or isinstance(self.exception, HTTPException)):
+                if self.exception is exception:
+                    return False
                 raise self.exception
+            suppress = True
 
         if self.exception is not None and self.is_unhandled_exception:
             logger.exception(str(self.exception), exc_info=self.exception)
+        return suppress
+
+    async def _exit_middleware(self, exc_type, exc, tb) -> bool:
+        return await self._handle_exception(exc)
 
     @contextmanager
     def _enter_old_sentry_integration(self):
@@ -675,12 +1517,15 @@ class JsonRpcContext:
         return event_processor
 
     async def enter_middlewares(self, middlewares: Sequence['JsonRpcMiddleware']):
+        if not middlewares:
+            return
+        exit_stack = self.get_exit_stack()
         for mw in middlewares:
             cm = mw(self)
             if not isinstance(cm, AbstractAsyncContextManager):
                 raise RuntimeError("JsonRpcMiddleware(context) must return AsyncContextManager")
-            await self.exit_stack.enter_async_context(cm)
-            await self.exit_stack.enter_async_context(self._handle_exception())
+            await exit_stack.enter_async_context(cm)
+            exit_stack.push_async_exit(self._exit_middleware)
 
 
 JsonRpcMiddleware = Callable[[JsonRpcContext], AbstractAsyncContextManager]
@@ -700,7 +1545,89 @@ def get_jsonrpc_method() -> Optional[str]:
     return get_jsonrpc_context().raw_request.get('method')
 
 
+class CallNextMiddleware:
+    """Middleware written as `async def middleware(ctx, call_next)`.
+
+    `await call_next()` runs the rest of the chain and the method itself. Unlike `JsonRpcMiddleware`
+    no context manager is created for it per request.
+    """
+
+    __slots__ = ('func',)
+
+    def __init__(self, func: Callable[[JsonRpcContext, Callable[[], typing.Awaitable]], typing.Awaitable]):
+        self.func = func
+
+
+def _wrap_handle_exception(call_next: Callable[..., typing.Awaitable]) -> Callable[..., typing.Awaitable]:
+    # Same as exception handling JsonRpcContext does after every entered middleware
+    async def call(ctx: JsonRpcContext, *args):
+        try:
+            await call_next(ctx, *args)
+        except BaseException as exc:
+            if not await ctx._handle_exception(exc):
+                raise
+        else:
+            await ctx._handle_exception(None)
+
+    return call
+
+
+def _wrap_middleware(
+    mw: Union[JsonRpcMiddleware, CallNextMiddleware],
+    call_next: Callable[..., typing.Awaitable],
+) -> Callable[..., typing.Awaitable]:
+    call_next = _wrap_handle_exception(call_next)
+
+    if isinstance(mw, CallNextMiddleware):
+        func = mw.func
+
+        async def call(ctx: JsonRpcContext, *args):
+            await func(ctx, partial(call_next, ctx, *args))
+    else:
+        async def call(ctx: JsonRpcContext, *args):
+            cm = mw(ctx)
+            if not isinstance(cm, AbstractAsyncContextManager):
+                raise RuntimeError("JsonRpcMiddleware(context) must return AsyncContextManager")
+            async with cm:
+                await call_next(ctx, *args)
+
+    return call
+
+
+class MiddlewareChain:
+    """Middlewares compiled into one callable around route endpoint.
+
+    `call(ctx, *args)` enters middlewares in order and calls `endpoint(ctx, *args)`.
+    Compiled once, recompiled when the middlewares list changes.
+    """
+
+    __slots__ = ('middlewares', 'compiled_middlewares', 'call')
+
+    def __init__(
+        self,
+        middlewares: Sequence[Union[JsonRpcMiddleware, CallNextMiddleware]],
+        endpoint: Callable[..., typing.Awaitable],
+    ):
+        self.middlewares = middlewares
+        self.compiled_middlewares = tuple(middlewares)
+        call = endpoint
+        for mw in reversed(self.compiled_middlewares):
+            call = _wrap_middleware(mw, call)
+        self.call = call
+
+    def is_outdated(self, middlewares: Sequence[Union[JsonRpcMiddleware, CallNextMiddleware]]) -> bool:
+        if middlewares is not self.middlewares or len(middlewares) != len(self.compiled_middlewares):
+            return True
+        for mw, compiled_mw in zip(middlewares, self.compiled_middlewares):
+            if mw is not compiled_mw:
+                return True
+        return False
+
+
 class MethodRoute(APIRoute):
+    responses = ErrorModels()
+    response_fields = ErrorModels()
+
     def __init__(
         self,
         entrypoint: 'Entrypoint',
@@ -714,10 +1641,26 @@ class MethodRoute(APIRoute):
         response_class: Type[Response] = JSONResponse,
         request_class: Type[JsonRpcRequest] = JsonRpcRequest,
         middlewares: Optional[Sequence[JsonRpcMiddleware]] = None,
+        max_concurrency: Optional[int] = None,
+        max_queue: int = 0,
+        queue_timeout: Optional[float] = None,
+        timeout: Optional[float] = None,
+        executor: Optional[Union[SyncExecutor, Literal['process']]] = None,
+        cache: Union[bool, ResultCache, None] = None,
+        coalesce: Union[bool, Sequence[str]] = False,
         **kwargs,
     ):
         name = name or func.__name__
+        check_sync_executor(executor)
         result_model = result_model or func.__annotations__.get('return')
+        if max_concurrency is not None and ServerOverloaded not in (errors or ()):
+            errors = [*(errors or ()), ServerOverloaded]
+        if (
+            timeout is not None
+            or entrypoint.method_timeout is not None
+            or entrypoint.timeout_header is not None
+        ) and RequestTimeout not in (errors or ()):
+            errors = [*(errors or ()), RequestTimeout]
 
         _, path_format, _ = compile_path(path)
         func_dependant = get_dependant(path=path_format, call=func)
@@ -726,6 +1669,59 @@ class MethodRoute(APIRoute):
         fix_query_dependencies(func_dependant)
         flat_dependant = get_flat_dependant(func_dependant, skip_repeats=True)
 
+        # Method arguments, besides params, which may be part of the cache / coalesce key
+        argument_names = {dependency.name for dependency in func_dependant.dependencies}
+        for param in (
+            func_dependant.path_params + func_dependant.query_params
+            + func_dependant.header_params + func_dependant.cookie_params
+        ):
+            argument_names.add(param.name)
+
+        if cache is True:
+            cache = ResultCache()
+        if cache:
+            if cache.key_dependencies is None:
+                if not is_params_only_dependant(func_dependant):
+                    # Calls with same params may differ in dependencies, e.g. the user
+                    raise RuntimeError(
+                        f"Method {name!r} with dependencies can't be cached by params only, pass "
+                        f"ResultCache(key_dependencies=[names of arguments the result depends on]) (may be empty)"
+                    )
+            else:
+                unknown = set(cache.key_dependencies) - argument_names
+                if unknown:
+                    raise RuntimeError(f"Method {name!r} has no dependencies {sorted(unknown)} to use as cache key")
+
+        # Names of method arguments, besides params, that are part of the coalesce key
+        coalesce_key_dependencies: Optional[Tuple[str, ...]] = None
+        if coalesce is True:
+            if cache:
+                coalesce_key_dependencies = cache.key_dependencies or ()
+            elif is_params_only_dependant(func_dependant):
+                coalesce_key_dependencies = ()
+            else:
+                # Calls with same params may differ in dependencies, e.g. the user
+                raise RuntimeError(
+                    f"Method {name!r} with dependencies can't be coalesced by params only, "
+                    f"pass coalesce=[names of arguments the result depends on] (may be empty)"
+                )
+        elif coalesce is not False:
+            coalesce_key_dependencies = tuple(coalesce)
+            unknown = set(coalesce_key_dependencies) - argument_names
+            if unknown:
+                raise RuntimeError(f"Method {name!r} has no dependencies {sorted(unknown)} to use as coalesce key")
+        if coalesce_key_dependencies is not None and has_generator_dependencies(func_dependant):
+            # Shared call uses dependencies of the first caller, they are closed once its request is done
+            raise RuntimeError(f"Method {name!r} with yield dependencies can't be coalesced")
+
+        if executor == 'process':
+            if asyncio.iscoroutinefunction(func) or not is_params_only_dependant(func_dependant):
+                raise RuntimeError(
+                    f"Method {name!r} with executor='process' must be a sync function taking nothing but params"
+                )
+            if entrypoint.process_pool is None:
+                entrypoint.process_pool = ProcessPool()
+
         _Request = make_request_model(name, func.__module__, flat_dependant.body_params)
         _Response = make_response_model(name, func.__module__, result_model)
 
@@ -736,7 +1732,8 @@ class MethodRoute(APIRoute):
         endpoint.__name__ = func.__name__
         endpoint.__doc__ = func.__doc__
 
-        responses = errors_responses(errors)
+        # Error models are built for OpenAPI only, see ErrorModels
+        responses = errors_responses(errors, with_models=False)
 
         super().__init__(
             path,
@@ -765,6 +1762,143 @@ class MethodRoute(APIRoute):
         self.result_model = result_model
         self.params_model = _Request.model_fields['params'].annotation
         self.errors = errors or []
+        self.error_models_pending = bool(self.errors)
+        self.concurrency_limiter: Optional[ConcurrencyLimiter] = None
+        if max_concurrency is not None:
+            self.concurrency_limiter = ConcurrencyLimiter(max_concurrency, max_queue, queue_timeout)
+        self.timeout = timeout
+        # Runs sync method instead of the default anyio thread pool
+        self.executor = executor
+        self.result_cache: Optional[ResultCache] = cache or None
+        # Identical concurrent calls are made once, see handle_req. None means not coalesced
+        self.coalesce_key_dependencies = coalesce_key_dependencies
+        self.calls_in_flight: Dict[str, asyncio.Future] = {}
+        # Methods with params only are validated by params model in one call, without solve_dependencies
+        self.params_validator = None
+        self._request_validator = None
+        if (
+            is_params_only_dependant(func_dependant)
+            and flat_dependant.body_params
+            and inspect.isclass(self.params_model)
+            and issubclass(self.params_model, BaseModel)
+        ):
+            self.params_validator = self.params_model.__pydantic_validator__
+        # Request envelope model is built on first call, see request_validator
+        self._request_validator_pending = self.params_validator is not None
+        # Not embedded means method has single 'Params' param which takes whole params
+        self.params_embedded = _should_embed_body_fields(flat_dependant.body_params)
+        self.params_field_names = tuple(p.name for p in flat_dependant.body_params)
+        self._plan: Optional[MethodRoutePlan] = None
+        self._middleware_chain: Optional[MiddlewareChain] = None
+        self._entrypoint_middleware_chain: Optional[MiddlewareChain] = None
+        # Single pass response serialization, see ValidatedResponse
+        self.response_validator = _Response.__pydantic_validator__
+        self.response_serializer = _Response.__pydantic_serializer__
+        self.response_fast_path = (
+            self.response_model_include is None
+            and self.response_model_exclude is None
+        )
+
+    @property
+    def request_validator(self) -> Optional[pydantic_core.SchemaValidator]:
+        """Validates request envelope and typed params in one call"""
+        if self._request_validator_pending:
+            self._request_validator_pending = False
+            _RequestEnvelope = create_model(
+                f'_RequestEnvelope[{self.name}]',
+                __base__=self.request_class,
+                __module__=self.func.__module__,
+                params=(self.params_model, Field(default_factory=dict, validate_default=True)),
+            )
+            self._request_validator = _RequestEnvelope.__pydantic_validator__
+        return self._request_validator
+
+    @request_validator.setter
+    def request_validator(self, value: Optional[pydantic_core.SchemaValidator]):
+        self._request_validator_pending = False
+        self._request_validator = value
+
+    @property
+    def plan(self) -> MethodRoutePlan:
+        plan = self._plan
+        if plan is None or plan.is_outdated(self):
+            plan = self._plan = MethodRoutePlan(self)
+        return plan
+
+    @property
+    def middleware_chain(self) -> MiddlewareChain:
+        chain = self._middleware_chain
+        if chain is None or chain.is_outdated(self.middlewares):
+            chain = self._middleware_chain = MiddlewareChain(self.middlewares, self.handle_req_in_middlewares)
+        return chain
+
+    @property
+    def entrypoint_middleware_chain(self) -> MiddlewareChain:
+        chain = self._entrypoint_middleware_chain
+        if chain is None or chain.is_outdated(self.entrypoint.middlewares):
+            chain = self._entrypoint_middleware_chain = MiddlewareChain(
+                self.entrypoint.middlewares, self.handle_ctx,
+            )
+        return chain
+
+    def call_func(self, plan: MethodRoutePlan, values: dict) -> typing.Awaitable:
+        if plan.is_coroutine:
+            return self.func(**values)
+        if plan.executor is not None:
+            return run_in_executor(plan.executor, self.func, values)
+        return run_in_threadpool(self.func, **values)
+
+    async def call_func_limited(self, plan: MethodRoutePlan, values: dict) -> Any:
+        limiter = self.concurrency_limiter
+        await limiter.acquire()
+        if not plan.runs_after_cancel:
+            try:
+                return await self.call_func(plan, values)
+            finally:
+                limiter.release()
+        # Cancelled call keeps running in executor, the slot is taken until it is done
+        call = asyncio.ensure_future(self.call_func(plan, values))
+        call.add_done_callback(partial(_release_when_done, limiter))
+        return await asyncio.shield(call)
+
+    async def call_notification(self, plan: MethodRoutePlan, values: dict) -> None:
+        """Notifications are limited by `max_concurrency` too, rejected ones are dropped"""
+        if self.concurrency_limiter is None:
+            await self.call_func(plan, values)
+            return
+        try:
+            await self.call_func_limited(plan, values)
+        except ServerOverloaded:
+            logger.warning("Notification %s is dropped, method is overloaded", self.name)
+
+    def enter_call_exit_stack(self, http_request: Request) -> Tuple[AsyncExitStack, Request]:
+        """Exit stack of yield dependencies of one call, to close them as soon as the call times out.
+
+        FastAPI keeps them on the request scope stacks, closed only when the whole HTTP request is done.
+        Otherwise the call stack is closed together with them.
+        """
+        call_exit_stack = AsyncExitStack()
+        http_request.scope['fastapi_inner_astack'].push_async_callback(call_exit_stack.aclose)
+        call_request = RequestShadow(http_request)
+        call_request.scope['fastapi_inner_astack'] = call_exit_stack
+        call_request.scope['fastapi_function_astack'] = call_exit_stack
+        return call_exit_stack, call_request
+
+    def get_deadline(self, ctx: JsonRpcContext) -> Optional[float]:
+        """Method timeout, or entrypoint one, shortened by the client timeout header"""
+        timeout = self.timeout if self.timeout is not None else self.entrypoint.method_timeout
+        timeout_header = self.entrypoint.timeout_header
+        if timeout_header is not None and ctx.http_request is not None:
+            value = ctx.http_request.headers.get(timeout_header)
+            try:
+                client_timeout = float(value) if value is not None else None
+            except ValueError:
+                client_timeout = None
+            if client_timeout is not None and 0 <= client_timeout < float('inf'):
+                timeout = client_timeout if timeout is None else min(timeout, client_timeout)
+        if timeout is None:
+            return None
+        return asyncio.get_running_loop().time() + timeout
 
     def __hash__(self):
         return hash(self.path)
@@ -778,8 +1912,8 @@ class MethodRoute(APIRoute):
 
     async def parse_body(self, http_request) -> Any:
         try:
-            req = await http_request.json()
-        except ValueError:
+            req = self.entrypoint.json_codec.loads(await http_request.body())
+        except (ValueError, RecursionError, ClientDisconnect):
             raise ParseError()
         return req
 
@@ -794,7 +1928,7 @@ class MethodRoute(APIRoute):
             body = await self.parse_body(http_request)
         except Exception as exc:
             resp = await self.entrypoint.handle_exception_to_resp(exc)
-            response = self.response_class(content=resp, background=background_tasks)
+            response = self.entrypoint.make_response(self.response_class, resp, background_tasks)
         else:
             try:
                 resp = await self.handle_body(http_request, background_tasks, sub_response, body)
@@ -802,7 +1936,7 @@ class MethodRoute(APIRoute):
                 # no content for successful notifications
                 response = Response(media_type='application/json', background=background_tasks)
             else:
-                response = self.response_class(content=resp, background=background_tasks)
+                response = self.entrypoint.make_response(self.response_class, resp, background_tasks)
 
         response.headers.raw.extend(sub_response.headers.raw)
         if sub_response.status_code:
@@ -816,7 +1950,7 @@ class MethodRoute(APIRoute):
         background_tasks: BackgroundTasks,
         sub_response: Response,
         body: Any,
-    ) -> dict:
+    ) -> Union[dict, bytes]:
         async with AsyncExitStack() as async_exit_stack:
             # Shared dependencies for all requests in one json-rpc batch request
             shared_dependencies_error = None
@@ -838,8 +1972,7 @@ class MethodRoute(APIRoute):
             )
 
         # No response for successful notifications
-        has_content = 'error' in resp or 'id' in resp
-        if not has_content:
+        if not has_content(resp):
             raise NoContent
 
         return resp
@@ -852,7 +1985,7 @@ class MethodRoute(APIRoute):
         req: Any,
         dependency_cache: Optional[dict] = None,
         shared_dependencies_error: BaseError = None
-    ) -> dict:
+    ) -> Union[dict, bytes]:
         async with JsonRpcContext(
             entrypoint=self.entrypoint,
             method_route=self,
@@ -862,20 +1995,52 @@ class MethodRoute(APIRoute):
             http_response=sub_response,
             json_rpc_request_class=self.request_class,
         ) as ctx:
-            await ctx.enter_middlewares(self.entrypoint.middlewares)
-
-            if ctx.request.method != self.name:
-                raise MethodNotFound
-
-            resp = await self.handle_req(
-                http_request, background_tasks, sub_response, ctx,
-                dependency_cache=dependency_cache,
-                shared_dependencies_error=shared_dependencies_error,
+            await self.entrypoint_middleware_chain.call(
+                ctx, http_request, background_tasks, sub_response, dependency_cache, shared_dependencies_error,
             )
-            ctx.on_raw_response(resp)
+
+        if self.response_class is JSONResponse:
+            raw_response_json = ctx.raw_response_json
+            if raw_response_json is not None:
+                return raw_response_json
 
         return ctx.raw_response
 
+    async def handle_ctx(
+        self,
+        ctx: JsonRpcContext,
+        http_request: Request,
+        background_tasks: BackgroundTasks,
+        sub_response: Response,
+        dependency_cache: Optional[dict] = None,
+        shared_dependencies_error: Optional[BaseError] = None,
+    ):
+        # Called inside entrypoint middlewares
+        self.validate_request(ctx)
+        if ctx.request.method != self.name:
+            raise MethodNotFound
+
+        await self.middleware_chain.call(
+            ctx, http_request, background_tasks, sub_response, dependency_cache, shared_dependencies_error,
+        )
+
+    async def handle_req_in_middlewares(
+        self,
+        ctx: JsonRpcContext,
+        http_request: Request,
+        background_tasks: BackgroundTasks,
+        sub_response: Response,
+        dependency_cache: Optional[dict] = None,
+        shared_dependencies_error: Optional[BaseError] = None,
+    ):
+        # Called inside method middlewares, they see the response on exit
+        resp = await self.handle_req(
+            http_request, background_tasks, sub_response, ctx,
+            dependency_cache=dependency_cache,
+            shared_dependencies_error=shared_dependencies_error,
+        )
+        ctx.on_raw_response(resp)
+
     async def handle_req(
         self,
         http_request: Request,
@@ -885,61 +2050,291 @@ class MethodRoute(APIRoute):
         dependency_cache: Optional[dict] = None,
         shared_dependencies_error: Optional[BaseError] = None
     ):
-        await ctx.enter_middlewares(self.middlewares)
-
         if shared_dependencies_error:
             raise shared_dependencies_error
 
-        # dependency_cache - there are shared dependencies, we pass them to each method, since
-        # they are common to all methods in the batch.
-        # But if the methods have their own dependencies, they are resolved separately.
-        dependency_cache = copy.copy(dependency_cache)
+        plan = self.plan
+        deadline = ctx.deadline = self.get_deadline(ctx)
 
-        solved_dependency = await solve_dependencies(
-            request=http_request,
-            dependant=self.func_dependant,
-            body=ctx.request.params,
-            background_tasks=background_tasks,
-            response=sub_response,
-            dependency_overrides_provider=self.dependency_overrides_provider,
-            dependency_cache=dependency_cache,
-            async_exit_stack=ctx.exit_stack,
-            embed_body_fields=_should_embed_body_fields(self.flat_dependant.body_params),
-        )
+        params = ctx.request.params
+        if ctx.validated_params is not None:
+            if isinstance(ctx.validated_params, BaseError):
+                raise ctx.validated_params
+            values = ctx.validated_params
+        elif self.params_validator is not None and isinstance(params, dict):
+            values = self.validate_params(params)
+        else:
+            if deadline is None:
+                values = await self.solve_dependencies(
+                    http_request, background_tasks, sub_response, ctx,
+                    dependency_cache=dependency_cache,
+                    plan=plan,
+                )
+            else:
+                call_exit_stack, call_request = self.enter_call_exit_stack(http_request)
+                try:
+                    values = await call_with_deadline(deadline, self.solve_dependencies(
+                        call_request, background_tasks, sub_response, ctx,
+                        dependency_cache=dependency_cache,
+                        plan=plan,
+                    ))
+                    return await self.respond(plan, ctx, values, params, deadline, call_exit_stack)
+                except RequestTimeout:
+                    await call_exit_stack.aclose()
+                    raise
 
-        if solved_dependency.errors:
-            raise invalid_params_from_validation_error(
-                RequestValidationError(_normalize_errors(solved_dependency.errors))
-            )
+        return await self.respond(plan, ctx, values, params, deadline)
 
+    async def respond(
+        self,
+        plan: MethodRoutePlan,
+        ctx: JsonRpcContext,
+        values: dict,
+        params: Any,
+        deadline: Optional[float],
+        call_exit_stack: Optional[AsyncExitStack] = None,
+    ) -> Union[dict, ValidatedResponse]:
+        """Call the method with solved `values`, or queue it for notification"""
         # We MUST NOT return response for Notification
         # https://www.jsonrpc.org/specification#notification
-        # Since we do not need response - run in scheduler
+        # Since we do not need response - run in scheduler or notification queue
         if ctx.request.id is None:
-            scheduler = await self.entrypoint.get_scheduler()
-            await scheduler.spawn(call_sync_async(self.func, **solved_dependency.values))
+            notification_queue = self.entrypoint.notification_queue
+            if notification_queue is not None:
+                await notification_queue.put(self, values, params)
+            else:
+                scheduler = await self.entrypoint.get_scheduler()
+                await scheduler.spawn(self.call_notification(plan, values))
             return {}
 
+        cache = self.result_cache
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.make_key(self, values)
+            cached = await cache.get(cache_key)
+            if cached is not None:
+                return SerializedResponse(self, cached)
+
         # Для обычных запросов продолжаем как раньше
-        result = await call_sync_async(self.func, **solved_dependency.values)
+        if self.coalesce_key_dependencies is None:
+            respond = self.call_and_serialize(plan, values, cache_key)
+            if deadline is None:
+                return await respond
+            if call_exit_stack is None or not plan.runs_after_cancel:
+                return await call_with_deadline(deadline, respond)
+            # Method keeps running in executor after the timeout, its dependencies are closed once it is done
+            call = asyncio.ensure_future(respond)
+            try:
+                return await call_with_deadline(deadline, asyncio.shield(call))
+            except RequestTimeout:
+                scheduler = await self.entrypoint.get_scheduler()
+                await scheduler.spawn(_close_when_done(call, call_exit_stack.pop_all()))
+                raise
+
+        # Identical calls share the one in flight, its cancellation by one caller must not affect others
+        key = make_call_key(self, values, self.coalesce_key_dependencies)
+        task = self.calls_in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.call_and_serialize(plan, values, cache_key))
+            self.calls_in_flight[key] = task
+            task.add_done_callback(partial(self._call_done, key))
+        shared = asyncio.shield(task)
+        resp = await (shared if deadline is None else call_with_deadline(deadline, shared))
+        # Response dict gets id of the request, see JsonRpcContext.on_raw_response
+        return copy.copy(resp) if isinstance(resp, dict) else resp
+
+    def _call_done(self, key: str, task: asyncio.Future):
+        if self.calls_in_flight.get(key) is task:
+            del self.calls_in_flight[key]
+        if not task.cancelled():
+            # Callers may be gone, do not warn about never retrieved exception
+            task.exception()
+
+    async def call_and_serialize(
+        self,
+        plan: MethodRoutePlan,
+        values: dict,
+        cache_key: Optional[str] = None,
+    ) -> Union[dict, ValidatedResponse]:
+        if self.concurrency_limiter is None:
+            result = await self.call_func(plan, values)
+        else:
+            result = await self.call_func_limited(plan, values)
 
         response = {
             'jsonrpc': '2.0',
             'result': result,
         }
 
+        if self.response_fast_path:
+            try:
+                value = self.response_validator.validate_python(response, from_attributes=True)
+            except ValidationError:
+                # serialize_response below raises detailed ResponseValidationError
+                pass
+            else:
+                validated_response = ValidatedResponse(self, value)
+                if cache_key is None:
+                    return validated_response
+                body = validated_response.dump_body()
+                await self.result_cache.set(cache_key, body)
+                return SerializedResponse(self, body)
+
         # noinspection PyTypeChecker
         resp = await serialize_response(
             field=self.response_field,
             response_content=response,
-            include=self.response_model_include,
-            exclude=self.response_model_exclude,
-            by_alias=self.response_model_by_alias,
-            exclude_unset=self.response_model_exclude_unset,
+            **plan.response_serialize_kwargs,
         )
 
+        if cache_key is not None:
+            # Same as ValidatedResponse.dump_body: compact JSON without id, it is added on each hit
+            body = pydantic_core.to_json({key: value for key, value in resp.items() if key != 'id'})
+            await self.result_cache.set(cache_key, body)
+
         return resp
 
+    async def solve_dependencies(
+        self,
+        http_request: Request,
+        background_tasks: BackgroundTasks,
+        sub_response: Response,
+        ctx: JsonRpcContext,
+        dependency_cache: Optional[dict] = None,
+        plan: Optional[MethodRoutePlan] = None,
+    ) -> dict:
+        if plan is None:
+            plan = self.plan
+
+        # dependency_cache - there are shared dependencies, we pass them to each method, since
+        # they are common to all methods in the batch.
+        # But if the methods have their own dependencies, they are resolved separately:
+        # they are written to the own layer, shared ones are read through without copying.
+        if dependency_cache is not None:
+            dependency_cache = ChainMap({}, dependency_cache)
+
+        entrypoint_route = self.entrypoint.entrypoint_route
+        dependant = self.func_dependant
+        if entrypoint_route.cached_dependencies and dependency_cache is not None:
+            dependant = entrypoint_route.skip_cached_dependencies(dependant, dependency_cache)
+
+        solved_dependency = await solve_dependencies(
+            request=http_request,
+            dependant=dependant,
+            body=ctx.request.params,
+            background_tasks=background_tasks,
+            response=sub_response,
+            dependency_overrides_provider=plan.solve_dependency_overrides_provider,
+            dependency_cache=dependency_cache,
+            # FastAPI keeps yield dependencies on the request scope stacks and only passes this one down
+            async_exit_stack=ctx.exit_stack,
+            embed_body_fields=plan.embed_body_fields,
+        )
+
+        if solved_dependency.errors:
+            raise invalid_params_from_validation_error(
+                RequestValidationError(_normalize_errors(solved_dependency.errors))
+            )
+
+        if entrypoint_route.cached_dependencies and dependency_cache is not None:
+            # common_dependencies are solved together with the method ones
+            entrypoint_route.store_cached_dependencies(
+                http_request, dependency_cache, plan.solve_dependency_overrides_provider,
+            )
+
+        return solved_dependency.values
+
+    def validate_request(self, ctx: JsonRpcContext) -> None:
+        """Validate request envelope together with typed params in one pydantic-core call.
+
+        Envelope errors are raised as `InvalidRequest` right away. Params validation result
+        (values or `InvalidParams`) is kept in `ctx.validated_params` for `handle_req`.
+        Not used for methods with own middlewares, params they see must be the ones validated.
+        """
+        raw_request = ctx.raw_request
+        if (
+            self.request_validator is None
+            or ctx.request_class is not self.request_class
+            or ctx.is_request_validated  # e.g. by middleware
+            # Method middlewares run after this and may change params, they are validated in handle_req then
+            or self.middlewares
+            or not isinstance(raw_request, dict)
+            or not isinstance(raw_request.get('params', {}), dict)
+        ):
+            ctx.request  # noqa
+            return
+
+        params = raw_request.get('params', {})
+        if self.params_embedded and any(value is None for value in params.values()):
+            # Same as FastAPI: null value is treated as missing one
+            raw_request = {
+                **raw_request,
+                'params': {key: value for key, value in params.items() if value is not None},
+            }
+
+        try:
+            validated = self.request_validator.validate_python(raw_request, from_attributes=True)
+        except ValidationError as exc:
+            request_errors = []
+            params_errors = []
+            for err in exc.errors(include_url=False):
+                if err['loc'][:1] == ('params',):
+                    if self.params_embedded and err['type'] == 'missing' and len(err['loc']) == 2:
+                        err['input'] = None
+                    err['loc'] = ('body',) + err['loc'][1:]
+                    params_errors.append(err)
+                else:
+                    request_errors.append(err)
+            if request_errors:
+                raise InvalidRequest(data={'errors': request_errors})
+            # Envelope is valid, middlewares still see params as they were sent
+            envelope = self.request_class.model_validate({**ctx.raw_request, 'params': {}})
+            ctx.request = self.construct_request(envelope, params)
+            ctx.validated_params = invalid_params_from_validation_error(RequestValidationError(params_errors))
+            return
+
+        ctx.request = self.construct_request(validated, params)
+        if self.params_embedded:
+            ctx.validated_params = {name: getattr(validated.params, name) for name in self.params_field_names}
+        else:
+            ctx.validated_params = {self.params_field_names[0]: validated.params}
+
+    def construct_request(self, validated: BaseModel, params: dict) -> JsonRpcRequest:
+        """Request with envelope fields of `validated` and raw params, without validating them again"""
+        return self.request_class.model_construct(
+            **{
+                field_name: getattr(validated, field_name)
+                for field_name in self.request_class.model_fields
+                if field_name != 'params'
+            },
+            params=params,
+        )
+
+    def validate_params(self, params: dict) -> dict:
+        if self.params_embedded:
+            # Same as FastAPI: null value is treated as missing one
+            if any(value is None for value in params.values()):
+                params = {key: value for key, value in params.items() if value is not None}
+            try:
+                value = self.params_validator.validate_python(params, from_attributes=True)
+            except ValidationError as exc:
+                errors = exc.errors(include_url=False)
+                for err in errors:
+                    if err['type'] == 'missing' and len(err['loc']) == 1:
+                        err['input'] = None
+                    err['loc'] = ('body',) + err['loc']
+                raise invalid_params_from_validation_error(RequestValidationError(errors))
+            return {name: getattr(value, name) for name in self.params_field_names}
+
+        try:
+            value = self.params_validator.validate_python(params, from_attributes=True)
+        except ValidationError as exc:
+            errors = exc.errors(include_url=False)
+            for err in errors:
+                err['loc'] = ('body',) + err['loc']
+            raise invalid_params_from_validation_error(RequestValidationError(errors))
+        return {self.params_field_names[0]: value}
+
 
 class RequestShadow(Request):
     def __init__(self, request: Request):
@@ -966,7 +2361,26 @@ class RequestShadow(Request):
         return await self.request.is_disconnected()
 
 
+class BatchStreamingResponse(StreamingResponse):
+    """Closes the batch exit stack even if the stream is never iterated or iteration is interrupted"""
+
+    def __init__(self, content: AsyncIterator[bytes], async_exit_stack: AsyncExitStack, **kwargs):
+        super().__init__(content, **kwargs)
+        self.async_exit_stack = async_exit_stack
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # No-op if already closed by the stream
+            with anyio.CancelScope(shield=True):
+                await self.async_exit_stack.aclose()
+
+
 class EntrypointRoute(APIRoute):
+    responses = ErrorModels()
+    response_fields = ErrorModels()
+
     def __init__(
         self,
         entrypoint: 'Entrypoint',
@@ -998,7 +2412,8 @@ class EntrypointRoute(APIRoute):
         def endpoint(__request__: _Request):
             del __request__
 
-        responses = errors_responses(errors)
+        # Error models are built for OpenAPI only, see ErrorModels
+        responses = errors_responses(errors, with_models=False)
 
         super().__init__(
             path,
@@ -1040,8 +2455,27 @@ class EntrypointRoute(APIRoute):
         self.app = request_response(self.handle_http_request)
         self.entrypoint = entrypoint
         self.common_dependencies = common_dependencies
+        # (FastAPI dependency cache key, cache) of CachedDepends
+        self.cached_dependencies: List[Tuple[Any, DependencyCache]] = [
+            (get_parameterless_sub_dependant(depends=depends, path=path_format).cache_key, depends.cache)
+            for depends in [*(kwargs.get('dependencies') or []), *(common_dependencies or [])]
+            if isinstance(depends, CachedDepends)
+        ]
+        # (id of dependant, cache keys to skip) -> (dependant, its copy), see skip_cached_dependencies
+        self._skipping_dependants: Dict[Tuple[int, frozenset], Tuple[Dependant, Dependant]] = {}
         self.request_class = request_class
         self.errors = errors or []
+        self.error_models_pending = bool(self.errors)
+        self._entrypoint_middleware_chain: Optional[MiddlewareChain] = None
+
+    @property
+    def entrypoint_middleware_chain(self) -> MiddlewareChain:
+        chain = self._entrypoint_middleware_chain
+        if chain is None or chain.is_outdated(self.entrypoint.middlewares):
+            chain = self._entrypoint_middleware_chain = MiddlewareChain(
+                self.entrypoint.middlewares, self.handle_ctx,
+            )
+        return chain
 
     def __hash__(self):
         return hash(self.path)
@@ -1061,10 +2495,13 @@ class EntrypointRoute(APIRoute):
     ) -> dict:
         # Must not be empty, otherwise FastAPI re-creates it
         dependency_cache = {(lambda: None, ('',)): 1}
+        if self.cached_dependencies:
+            # FastAPI does not call dependencies found in dependency_cache
+            self.load_cached_dependencies(http_request, dependency_cache)
         if self.dependencies:
             solved_dependency = await solve_dependencies(
                 request=http_request,
-                dependant=self.shared_dependant,
+                dependant=self.skip_cached_dependencies(self.shared_dependant, dependency_cache),
                 body=None,
                 background_tasks=background_tasks,
                 response=sub_response,
@@ -1077,20 +2514,71 @@ class EntrypointRoute(APIRoute):
                 raise invalid_params_from_validation_error(
                     RequestValidationError(_normalize_errors(solved_dependency.errors))
                 )
+            if self.cached_dependencies:
+                self.store_cached_dependencies(http_request, dependency_cache, self.dependency_overrides_provider)
         return dependency_cache
 
+    def iter_cached_dependencies(self, http_request: Request, dependency_overrides_provider: Any):
+        overrides = getattr(dependency_overrides_provider, 'dependency_overrides', None) or {}
+        for cache_key, cache in self.cached_dependencies:
+            # Overridden dependency is looked up by cache key of the original one
+            if cache_key[0] in overrides:
+                continue
+            key = cache.key(http_request)
+            if key is not None:
+                yield cache_key, cache, key
+
+    def skip_cached_dependencies(self, dependant: Dependant, dependency_cache: typing.Mapping) -> Dependant:
+        """Dependant which does not solve sub-dependencies of `CachedDepends` already in `dependency_cache`"""
+        cache_keys = frozenset(
+            cache_key for cache_key, _ in self.cached_dependencies if cache_key in dependency_cache
+        )
+        if not cache_keys:
+            return dependant
+        key = (id(dependant), cache_keys)
+        pruned = self._skipping_dependants.get(key)
+        if pruned is None or pruned[0] is not dependant:
+            pruned = self._skipping_dependants[key] = (dependant, without_sub_dependencies(dependant, cache_keys))
+        return pruned[1]
+
+    def load_cached_dependencies(self, http_request: Request, dependency_cache: dict):
+        for cache_key, cache, key in self.iter_cached_dependencies(http_request, self.dependency_overrides_provider):
+            found, value = cache.get(key)
+            if found:
+                dependency_cache[cache_key] = value
+
+    def store_cached_dependencies(self, http_request: Request, dependency_cache: dict, dependency_overrides_provider: Any):
+        for cache_key, cache, key in self.iter_cached_dependencies(http_request, dependency_overrides_provider):
+            # Values loaded from cache are not stored again, it would extend their TTL
+            if cache_key in dependency_cache and key not in cache:
+                cache.set(key, dependency_cache[cache_key])
+
     async def parse_body(self, http_request) -> Any:
         try:
-            body = await http_request.json()
-        except ValueError:
+            body = self.entrypoint.json_codec.loads(await http_request.body())
+        except (ValueError, RecursionError, ClientDisconnect):
             raise ParseError()
 
-        if isinstance(body, list) and not body:
+        if isinstance(body, list):
+            self.check_batch_size(len(body))
+
+        return body
+
+    def check_batch_size(self, size: int):
+        if not size:
             raise InvalidRequest(data={'errors': [
                 {'loc': (), 'type': 'value_error.empty', 'msg': "rpc call with an empty array"}
             ]})
 
-        return body
+        max_batch_size = self.entrypoint.max_batch_size
+        if max_batch_size is not None and size > max_batch_size:
+            raise InvalidRequest(data={'errors': [
+                {
+                    'loc': (),
+                    'type': 'value_error.batch_too_large',
+                    'msg': f"rpc call with a batch of {size} requests, max allowed is {max_batch_size}",
+                }
+            ]})
 
     async def handle_http_request(self, http_request: Request):
         background_tasks = BackgroundTasks()
@@ -1099,19 +2587,41 @@ class EntrypointRoute(APIRoute):
         del sub_response.headers["content-length"]
         sub_response.status_code = None  # type: ignore
 
+        if self.entrypoint.batch_incremental_parsing:
+            try:
+                resp = await self.handle_body_incremental(http_request, background_tasks, sub_response)
+            except NoContent:
+                # no content for successful notifications
+                response = Response(media_type='application/json', background=background_tasks)
+            except Exception as exc:
+                # body parse errors
+                resp = await self.entrypoint.handle_exception_to_resp(exc)
+                response = self.entrypoint.make_response(self.response_class, resp, background_tasks)
+            else:
+                response = self.entrypoint.make_response(self.response_class, resp, background_tasks)
+
+            response.headers.raw.extend(sub_response.headers.raw)
+            if sub_response.status_code:
+                response.status_code = sub_response.status_code
+
+            return response
+
         try:
             body = await self.parse_body(http_request)
         except Exception as exc:
             resp = await self.entrypoint.handle_exception_to_resp(exc)
-            response = self.response_class(content=resp, background=background_tasks)
+            response = self.entrypoint.make_response(self.response_class, resp, background_tasks)
         else:
-            try:
-                resp = await self.handle_body(http_request, background_tasks, sub_response, body)
-            except NoContent:
-                # no content for successful notifications
-                response = Response(media_type='application/json', background=background_tasks)
+            if isinstance(body, list) and self.entrypoint.batch_streaming is not None:
+                response = await self.handle_body_streaming(http_request, background_tasks, sub_response, body)
             else:
-                response = self.response_class(content=resp, background=background_tasks)
+                try:
+                    resp = await self.handle_body(http_request, background_tasks, sub_response, body)
+                except NoContent:
+                    # no content for successful notifications
+                    response = Response(media_type='application/json', background=background_tasks)
+                else:
+                    response = self.entrypoint.make_response(self.response_class, resp, background_tasks)
 
         response.headers.raw.extend(sub_response.headers.raw)
         if sub_response.status_code:
@@ -1125,7 +2635,7 @@ class EntrypointRoute(APIRoute):
         background_tasks: BackgroundTasks,
         sub_response: Response,
         body: Any,
-    ) -> dict:
+    ) -> Union[dict, bytes, list]:
         async with AsyncExitStack() as async_exit_stack:
             # Shared dependencies for all requests in one json-rpc batch request
             shared_dependencies_error = None
@@ -1147,24 +2657,115 @@ class EntrypointRoute(APIRoute):
             else:
                 req_list = [body]
 
-            # Run concurrently through scheduler
-            job_list = []
-            for req in req_list:
-                job = await scheduler.spawn(
-                    self.handle_req_to_resp(
+            max_batch_concurrency = self.entrypoint.max_batch_concurrency
+            if max_batch_concurrency is None or len(req_list) <= max_batch_concurrency:
+                # Run concurrently through scheduler
+                job_list = []
+                for req in req_list:
+                    job = await scheduler.spawn(
+                        self.handle_req_to_resp(
+                            http_request, background_tasks, sub_response, req,
+                            dependency_cache=dependency_cache,
+                            shared_dependencies_error=shared_dependencies_error,
+                        )
+                    )
+                    job_list.append(job.wait())
+                all_resp = await asyncio.gather(*job_list)
+            else:
+                all_resp = await self.handle_req_list_bounded(
+                    scheduler, max_batch_concurrency,
+                    http_request, background_tasks, sub_response, req_list,
+                    dependency_cache=dependency_cache,
+                    shared_dependencies_error=shared_dependencies_error,
+                )
+
+            resp_list = []
+
+            for resp in all_resp:
+                # No response for successful notifications
+                if not has_content(resp):
+                    continue
+
+                resp_list.append(resp)
+
+        if not resp_list:
+            raise NoContent
+
+        if not isinstance(body, list):
+            content = resp_list[0]
+        else:
+            content = resp_list
+
+        return content
+
+    async def handle_body_incremental(
+        self,
+        http_request: Request,
+        background_tasks: BackgroundTasks,
+        sub_response: Response,
+    ) -> Union[dict, bytes, list]:
+        """Dispatch batch requests while the rest of the body is still being received.
+
+        If the body turns out to be malformed, requests dispatched so far are still run to the end,
+        but the response is a single `ParseError`.
+        """
+        parser = JsonArrayStreamParser(self.entrypoint.json_codec)
+        max_batch_concurrency = self.entrypoint.max_batch_concurrency
+        semaphore = asyncio.Semaphore(max_batch_concurrency) if max_batch_concurrency else None
+
+        async with AsyncExitStack() as async_exit_stack:
+            # Shared dependencies for all requests in one json-rpc batch request
+            shared_dependencies_error = None
+            try:
+                dependency_cache = await self.solve_shared_dependencies(
+                    http_request,
+                    background_tasks,
+                    sub_response,
+                    async_exit_stack=async_exit_stack,
+                )
+            except BaseError as error:
+                shared_dependencies_error = error
+                dependency_cache = None
+
+            scheduler = await self.entrypoint.get_scheduler()
+
+            async def handle_req(req):
+                try:
+                    return await self.handle_req_to_resp(
                         http_request, background_tasks, sub_response, req,
                         dependency_cache=dependency_cache,
                         shared_dependencies_error=shared_dependencies_error,
                     )
-                )
+                finally:
+                    if semaphore is not None:
+                        semaphore.release()
+
+            job_list = []
+
+            async def spawn(req):
+                if semaphore is not None:
+                    # back-pressure: do not read body further while batch is at its concurrency limit
+                    await semaphore.acquire()
+                job = await scheduler.spawn(handle_req(req))
                 job_list.append(job.wait())
 
+            try:
+                async for req in self.iter_body_requests(http_request, parser):
+                    if self.entrypoint.max_batch_size is not None:
+                        self.check_batch_size(len(job_list) + 1)
+                    await spawn(req)
+
+                if parser.is_array:
+                    self.check_batch_size(len(job_list))
+            except BaseException:
+                await asyncio.gather(*job_list, return_exceptions=True)
+                raise
+
             resp_list = []
 
             for resp in await asyncio.gather(*job_list):
                 # No response for successful notifications
-                has_content = 'error' in resp or 'id' in resp
-                if not has_content:
+                if not has_content(resp):
                     continue
 
                 resp_list.append(resp)
@@ -1172,13 +2773,187 @@ class EntrypointRoute(APIRoute):
         if not resp_list:
             raise NoContent
 
-        if not isinstance(body, list):
+        if not parser.is_array:
             content = resp_list[0]
         else:
             content = resp_list
 
         return content
 
+    async def iter_body_requests(self, http_request: Request, parser: 'JsonArrayStreamParser') -> AsyncIterator[Any]:
+        """Yield batch elements as they are received, or the whole body if it is not an array.
+
+        A truncated or malformed body and a client disconnected before the end of the body are `ParseError`.
+        """
+        try:
+            async for chunk in http_request.stream():
+                for req in parser.feed(chunk):
+                    yield req
+            body = parser.close()
+        except (ValueError, RecursionError, ClientDisconnect) as exc:
+            raise ParseError() from exc
+        if not parser.is_array:
+            yield body
+
+    async def handle_body_streaming(
+        self,
+        http_request: Request,
+        background_tasks: BackgroundTasks,
+        sub_response: Response,
+        body: List[Any],
+    ) -> StreamingResponse:
+        """Batch response which is written element by element as soon as each request is done.
+
+        Headers set by shared dependencies are sent, headers set later by methods are not.
+        """
+        async_exit_stack = AsyncExitStack()
+        await async_exit_stack.__aenter__()
+        try:
+            # Shared dependencies for all requests in one json-rpc batch request
+            shared_dependencies_error = None
+            try:
+                dependency_cache = await self.solve_shared_dependencies(
+                    http_request,
+                    background_tasks,
+                    sub_response,
+                    async_exit_stack=async_exit_stack,
+                )
+            except BaseError as error:
+                shared_dependencies_error = error
+                dependency_cache = None
+
+            scheduler = await self.entrypoint.get_scheduler()
+        except BaseException:
+            await async_exit_stack.aclose()
+            raise
+
+        json_codec = self.entrypoint.json_codec
+        ndjson = self.entrypoint.batch_streaming == 'ndjson'
+
+        async def stream():
+            # Closed here to run cleanups before background tasks, BatchStreamingResponse closes it otherwise
+            async with async_exit_stack:
+                if not ndjson:
+                    yield b'['
+                first = True
+                async for resp in self.iter_req_list(
+                    scheduler,
+                    http_request, background_tasks, sub_response, body,
+                    dependency_cache=dependency_cache,
+                    shared_dependencies_error=shared_dependencies_error,
+                    ordered=self.entrypoint.batch_streaming_order == 'request',
+                ):
+                    # No response for successful notifications
+                    if not has_content(resp):
+                        continue
+                    chunk = resp if isinstance(resp, bytes) else json_codec.dumps(resp)
+                    if ndjson:
+                        yield chunk + b'\n'
+                    else:
+                        yield chunk if first else b',' + chunk
+                    first = False
+                if not ndjson:
+                    yield b']'
+
+        return BatchStreamingResponse(
+            stream(),
+            async_exit_stack,
+            media_type='application/x-ndjson' if ndjson else json_codec.media_type,
+            background=background_tasks,
+        )
+
+    async def iter_req_list(
+        self,
+        scheduler: aiojobs.Scheduler,
+        http_request: Request,
+        background_tasks: BackgroundTasks,
+        sub_response: Response,
+        req_list: List[Any],
+        dependency_cache: Optional[dict] = None,
+        shared_dependencies_error: BaseError = None,
+        ordered: bool = True,
+    ) -> AsyncIterator[Union[dict, bytes]]:
+        """Yield responses in request order or as soon as each one is done"""
+        done: asyncio.Queue = asyncio.Queue()
+        queue = iter(enumerate(req_list))
+
+        async def worker():
+            for index, req in queue:
+                try:
+                    resp = await self.handle_req_to_resp(
+                        http_request, background_tasks, sub_response, req,
+                        dependency_cache=dependency_cache,
+                        shared_dependencies_error=shared_dependencies_error,
+                    )
+                except Exception as exc:
+                    # Status is already sent, the element is an error instead of a truncated body
+                    resp = self.streamed_error_resp(req, exc)
+                done.put_nowait((index, resp))
+
+        max_concurrency = self.entrypoint.max_batch_concurrency or len(req_list)
+        job_list = []
+        try:
+            for _ in range(min(max_concurrency, len(req_list))):
+                job_list.append(await scheduler.spawn(worker()))
+
+            pending: Dict[int, Union[dict, bytes]] = {}
+            next_index = 0
+            for _ in range(len(req_list)):
+                index, resp = await done.get()
+                if not ordered:
+                    yield resp
+                    continue
+                pending[index] = resp
+                while next_index in pending:
+                    yield pending.pop(next_index)
+                    next_index += 1
+        finally:
+            # Client may go away in the middle of the stream
+            for job in job_list:
+                await job.close()
+
+    def streamed_error_resp(self, req: Any, exc: Exception) -> dict:
+        """Batch element for an exception escaping a request, e.g. `HTTPException` raised by a method"""
+        if isinstance(exc, HTTPException):
+            logger.warning("HTTPException(%s) can't be streamed, sent as internal error", exc.status_code)
+        else:
+            logger.exception(str(exc), exc_info=exc)
+        resp = InternalError().get_resp()
+        if isinstance(req, dict) and 'id' in req:
+            resp['id'] = req['id']
+        return resp
+
+    async def handle_req_list_bounded(
+        self,
+        scheduler: aiojobs.Scheduler,
+        max_concurrency: int,
+        http_request: Request,
+        background_tasks: BackgroundTasks,
+        sub_response: Response,
+        req_list: List[Any],
+        dependency_cache: Optional[dict] = None,
+        shared_dependencies_error: BaseError = None
+    ) -> List[Union[dict, bytes]]:
+        """Run batch with at most `max_concurrency` requests at once, the rest wait in queue"""
+        resp_list: List[Union[dict, bytes]] = [{}] * len(req_list)
+        queue = iter(enumerate(req_list))
+
+        async def worker():
+            for index, req in queue:
+                resp_list[index] = await self.handle_req_to_resp(
+                    http_request, background_tasks, sub_response, req,
+                    dependency_cache=dependency_cache,
+                    shared_dependencies_error=shared_dependencies_error,
+                )
+
+        job_list = []
+        for _ in range(max_concurrency):
+            job = await scheduler.spawn(worker())
+            job_list.append(job.wait())
+        await asyncio.gather(*job_list)
+
+        return resp_list
+
     async def handle_req_to_resp(
         self,
         http_request: Request,
@@ -1187,7 +2962,7 @@ class EntrypointRoute(APIRoute):
         req: Any,
         dependency_cache: Optional[dict] = None,
         shared_dependencies_error: BaseError = None
-    ) -> dict:
+    ) -> Union[dict, bytes]:
         async with JsonRpcContext(
             entrypoint=self.entrypoint,
             raw_request=req,
@@ -1196,17 +2971,33 @@ class EntrypointRoute(APIRoute):
             http_response=sub_response,
             json_rpc_request_class=self.request_class
         ) as ctx:
-            await ctx.enter_middlewares(self.entrypoint.middlewares)
-
-            resp = await self.handle_req(
-                http_request, background_tasks, sub_response, ctx,
-                dependency_cache=dependency_cache,
-                shared_dependencies_error=shared_dependencies_error,
+            await self.entrypoint_middleware_chain.call(
+                ctx, http_request, background_tasks, sub_response, dependency_cache, shared_dependencies_error,
             )
-            ctx.on_raw_response(resp)
+
+        if self.response_class is JSONResponse:
+            raw_response_json = ctx.raw_response_json
+            if raw_response_json is not None:
+                return raw_response_json
 
         return ctx.raw_response
 
+    async def handle_ctx(
+        self,
+        ctx: JsonRpcContext,
+        http_request: Request,
+        background_tasks: BackgroundTasks,
+        sub_response: Response,
+        dependency_cache: Optional[dict] = None,
+        shared_dependencies_error: Optional[BaseError] = None,
+    ):
+        # Called inside entrypoint middlewares
+        await self.handle_req(
+            http_request, background_tasks, sub_response, ctx,
+            dependency_cache=dependency_cache,
+            shared_dependencies_error=shared_dependencies_error,
+        )
+
     async def handle_req(
         self,
         http_request: Request,
@@ -1216,22 +3007,247 @@ class EntrypointRoute(APIRoute):
         dependency_cache: Optional[dict] = None,
         shared_dependencies_error: BaseError = None
     ):
+        # Request is validated by method route itself if possible, see MethodRoute.validate_request
+        method = ctx.raw_request.get('method') if isinstance(ctx.raw_request, dict) else None
+        if not isinstance(method, str):
+            method = ctx.request.method
+
         http_request_shadow = RequestShadow(http_request)
-        http_request_shadow.scope['path'] = self.path + '/' + ctx.request.method
+        http_request_shadow.scope['path'] = self.path + '/' + method
 
-        for route in self.entrypoint.routes:  # type: MethodRoute
-            match, child_scope = route.matches(http_request_shadow.scope)
-            if match == Match.FULL:
-                # http_request is a transport layer and it is common for all JSON-RPC requests in a batch
-                ctx.method_route = route
-                return await route.handle_req(
-                    http_request_shadow, background_tasks, sub_response, ctx,
-                    dependency_cache=dependency_cache,
-                    shared_dependencies_error=shared_dependencies_error,
-                )
-        else:
+        route = self.entrypoint.get_method_route(method, http_request_shadow.scope)
+        if route is None:
+            ctx.request  # noqa: invalid request has priority over unknown method
             raise MethodNotFound()
 
+        route.validate_request(ctx)
+
+        # http_request is a transport layer and it is common for all JSON-RPC requests in a batch
+        ctx.method_route = route
+        await route.middleware_chain.call(
+            ctx, http_request_shadow, background_tasks, sub_response, dependency_cache, shared_dependencies_error,
+        )
+
+
+class NotificationStore(abc.ABC):
+    """Persistence backend of `NotificationQueue`.
+
+    Keeps queued notifications until they are done, so they survive a restart.
+    """
+
+    @abc.abstractmethod
+    async def add(self, method: str, params: dict) -> Any:
+        """Store notification, returns its key"""
+
+    @abc.abstractmethod
+    async def remove(self, key: Any) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def load(self) -> List[Tuple[Any, str, dict]]:
+        """Stored notifications as (key, method, params), oldest first"""
+
+    async def close(self) -> None:
+        """Release resources, called on shutdown after the queue is drained.
+
+        Store is used again if the queue is restarted.
+        """
+
+
+class SqliteNotificationStore(NotificationStore):
+    """Local SQLite file as notification store, e.g. for a single instance deployment.
+
+    Queries run in a dedicated thread, not blocking the event loop. The database is in WAL mode with
+    `synchronous=NORMAL`: a notification survives a process crash, but may be lost on power failure.
+    """
+
+    def __init__(self, path: str, table: str = 'jsonrpc_notifications'):
+        self.path = path
+        self.table = table
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.connection = None
+        self._open()
+
+    def _open(self):
+        import sqlite3
+
+        # Single thread serializes access to the connection
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='jsonrpc-notifications')
+        self.connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(
+            f'CREATE TABLE IF NOT EXISTS {self.table} '
+            f'(id INTEGER PRIMARY KEY AUTOINCREMENT, method TEXT NOT NULL, params TEXT NOT NULL)'
+        )
+
+    async def _run(self, func: Callable, *args) -> Any:
+        if self.connection is None:
+            # Reopened after close, e.g. on the next startup
+            self._open()
+        return await asyncio.get_running_loop().run_in_executor(self.executor, partial(func, *args))
+
+    def _add(self, method: str, params: str) -> int:
+        cursor = self.connection.execute(f'INSERT INTO {self.table} (method, params) VALUES (?, ?)', (method, params))
+        return cursor.lastrowid
+
+    async def add(self, method: str, params: dict) -> int:
+        return await self._run(self._add, method, json.dumps(params))
+
+    def _remove(self, key: int) -> None:
+        self.connection.execute(f'DELETE FROM {self.table} WHERE id = ?', (key,))
+
+    async def remove(self, key: int) -> None:
+        await self._run(self._remove, key)
+
+    def _load(self) -> List[Tuple[int, str, str]]:
+        return self.connection.execute(f'SELECT id, method, params FROM {self.table} ORDER BY id').fetchall()
+
+    async def load(self) -> List[Tuple[int, str, dict]]:
+        rows = await self._run(self._load)
+        return [(key, method, json.loads(params)) for key, method, params in rows]
+
+    async def close(self) -> None:
+        if self.connection is None:
+            return
+        connection, self.connection = self.connection, None
+        executor, self.executor = self.executor, None
+        await asyncio.get_running_loop().run_in_executor(executor, connection.close)
+        executor.shutdown()
+
+
+class NotificationQueue:
+    """Bounded queue of notifications executed by a fixed number of worker tasks.
+
+    `overflow` is what to do with a new notification when the queue is full:
+    * `'block'` - wait for a free slot, so the HTTP request waits too
+    * `'drop_oldest'` - drop the oldest queued notification, counted in `dropped`
+    * `'reject'` - drop the new notification, counted in `rejected`
+
+    With `store` notifications of methods taking nothing but params are persisted until they are
+    done and the rest of the queue is restored on `Entrypoint.startup`. Other notifications can't be
+    replayed without their HTTP request and are kept in memory only.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        *,
+        workers: int = 1,
+        overflow: Literal['block', 'drop_oldest', 'reject'] = 'block',
+        store: Optional[NotificationStore] = None,
+        drain_timeout: Optional[float] = None,
+    ):
+        if maxsize < 1:
+            raise ValueError("'maxsize' must be positive")
+        if workers < 1:
+            raise ValueError("'workers' must be positive")
+        if overflow not in ('block', 'drop_oldest', 'reject'):
+            raise ValueError(f"unknown overflow policy: {overflow!r}")
+        self.maxsize = maxsize
+        self.workers = workers
+        self.overflow = overflow
+        self.store = store
+        self.drain_timeout = drain_timeout
+        self.dropped = 0
+        self.rejected = 0
+        # Created on start, bound to the running event loop
+        self.queue: Optional[asyncio.Queue] = None
+        self.worker_tasks: List[asyncio.Task] = []
+        # Notifications put after close are rejected until start
+        self.closed = False
+
+    def qsize(self) -> int:
+        return self.queue.qsize() if self.queue is not None else 0
+
+    async def start(self, entrypoint: 'Entrypoint'):
+        self.closed = False
+        if self.queue is not None:
+            return
+        self.queue = asyncio.Queue(self.maxsize)
+        self.worker_tasks = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+        if self.store is not None:
+            await self._restore(entrypoint)
+
+    async def _restore(self, entrypoint: 'Entrypoint'):
+        for key, method, params in await self.store.load():
+            route = entrypoint.method_routes_index.get(method)
+            try:
+                if route is None or route.params_validator is None:
+                    raise MethodNotFound()
+                values = route.validate_params(params)
+            except BaseError as exc:
+                logger.warning("Stored notification %s(%r) is dropped: %s", method, params, exc.MESSAGE)
+                await self.store.remove(key)
+                continue
+            await self._put((partial(route.call_notification, route.plan, values), contextvars.copy_context(), key))
+
+    async def put(self, route: 'MethodRoute', values: dict, params: Any):
+        if self.closed:
+            self.rejected += 1
+            logger.warning("Notification %s is rejected, queue is closed", route.name)
+            return
+
+        if self.queue is None:
+            await self.start(route.entrypoint)
+
+        if self.overflow == 'reject' and self.queue.full():
+            self.rejected += 1
+            logger.warning("Notification %s is rejected, queue is full", route.name)
+            return
+
+        key = None
+        if self.store is not None and route.params_validator is not None and isinstance(params, dict):
+            key = await self.store.add(route.name, params)
+
+        # Method is called in the context of the request, as it would be with scheduler.spawn
+        await self._put((partial(route.call_notification, route.plan, values), contextvars.copy_context(), key))
+
+    async def _put(self, item: tuple):
+        if self.overflow == 'drop_oldest' and self.queue.full():
+            _, _, dropped_key = self.queue.get_nowait()
+            self.queue.task_done()
+            self.dropped += 1
+            if dropped_key is not None:
+                await self.store.remove(dropped_key)
+        await self.queue.put(item)
+
+    async def _work(self):
+        queue = self.queue
+        while True:
+            call, context, key = await queue.get()
+            try:
+                await context.run(asyncio.ensure_future, call())
+            except asyncio.CancelledError:
+                # Not done, stored notification will be restored after restart
+                queue.task_done()
+                raise
+            except Exception as exc:
+                logger.exception(str(exc), exc_info=exc)
+            try:
+                if key is not None:
+                    await self.store.remove(key)
+            except Exception as exc:
+                logger.exception(str(exc), exc_info=exc)
+            finally:
+                queue.task_done()
+
+    async def close(self):
+        """Wait until queued notifications are done (at most `drain_timeout`), stop workers and close store"""
+        self.closed = True
+        queue, self.queue = self.queue, None
+        if queue is not None:
+            try:
+                await asyncio.wait_for(queue.join(), self.drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("%s notifications are not done on shutdown", queue.qsize())
+            for task in self.worker_tasks:
+                task.cancel()
+            await asyncio.gather(*self.worker_tasks, return_exceptions=True)
+            self.worker_tasks = []
+        if self.store is not None:
+            await self.store.close()
+
 
 class Entrypoint(APIRouter):
     method_route_class = MethodRoute
@@ -1253,6 +3269,18 @@ class Entrypoint(APIRouter):
         scheduler_factory: Callable[..., aiojobs.Scheduler] = aiojobs.Scheduler,
         scheduler_kwargs: Optional[dict] = None,
         request_class: Type[JsonRpcRequest] = JsonRpcRequest,
+        json_codec: Optional[JsonCodec] = None,
+        max_batch_size: Optional[int] = None,
+        max_batch_concurrency: Optional[int] = None,
+        batch_streaming: Optional[Literal['json', 'ndjson']] = None,
+        batch_streaming_order: Literal['request', 'completion'] = 'request',
+        batch_incremental_parsing: bool = False,
+        notification_queue: Optional[NotificationQueue] = None,
+        method_timeout: Optional[float] = None,
+        timeout_header: Optional[str] = None,
+        executor: Optional[SyncExecutor] = None,
+        process_pool: Optional[ProcessPool] = None,
+        module: Optional[str] = None,
         **kwargs,
     ) -> None:
         super().__init__(redirect_slashes=False)
@@ -1262,8 +3290,34 @@ class Entrypoint(APIRouter):
         self.scheduler_factory = scheduler_factory
         self.scheduler_kwargs = scheduler_kwargs
         self.request_class = request_class
+        # None means "use API codec or stdlib one", see API.bind_entrypoint
+        self.json_codec_override: Optional[JsonCodec] = json_codec
+        self.json_codec: JsonCodec = json_codec or default_json_codec
+        self.max_batch_size = max_batch_size
+        self.max_batch_concurrency = max_batch_concurrency
+        self.batch_streaming = batch_streaming
+        self.batch_streaming_order = batch_streaming_order
+        if batch_incremental_parsing and batch_streaming is not None:
+            raise RuntimeError("'batch_incremental_parsing' can't be used together with 'batch_streaming'")
+        self.batch_incremental_parsing = batch_incremental_parsing
+        # None means notifications are spawned in scheduler
+        self.notification_queue = notification_queue
+        self.method_timeout = method_timeout
+        self.timeout_header = timeout_header
+        # executor='process' is per method only, it needs methods taking nothing but params
+        check_sync_executor(executor, allow_process=False)
+        self.executor = executor
+        # Created on demand for methods with executor='process'
+        self.process_pool = process_pool
         self.scheduler = None
-        self.callee_module = inspect.getmodule(inspect.stack()[1][0]).__name__
+        # method name -> MethodRoute, for routes without path parameters
+        self.method_routes_index: Dict[str, MethodRoute] = {}
+        # routes with path parameters can only be matched by regex
+        self.method_routes_with_path_params: List[MethodRoute] = []
+        # method name -> seconds spent on building its route, see startup_report
+        self.method_build_times: Dict[str, float] = {}
+        # Module of entrypoint models, the module where entrypoint is created by default
+        self.callee_module = module or sys._getframe(1).f_globals.get('__name__', '__main__')
         self.entrypoint_route = self.entrypoint_route_class(
             self,
             path,
@@ -1289,7 +3343,18 @@ class Entrypoint(APIRouter):
     def common_dependencies(self):
         return self.entrypoint_route.common_dependencies
 
+    async def startup(self):
+        if self.process_pool is not None:
+            await self.process_pool.start()
+        if self.notification_queue is not None:
+            # Also restores notifications queued before restart
+            await self.notification_queue.start(self)
+
     async def shutdown(self):
+        if self.notification_queue is not None:
+            await self.notification_queue.close()
+        if self.process_pool is not None:
+            await self.process_pool.close()
         scheduler = self.scheduler
         self.scheduler = None
         if scheduler is not None:
@@ -1316,6 +3381,25 @@ class Entrypoint(APIRouter):
             resp = InternalError().get_resp()
         return resp
 
+    def make_response(self, response_class: Type[Response], content: Any, background: BackgroundTasks) -> Response:
+        if response_class is JSONResponse:
+            # Default response class is rendered by the entrypoint codec
+            if isinstance(content, bytes):
+                body = content
+            elif isinstance(content, list):
+                body = b'[' + b','.join(
+                    item if isinstance(item, bytes) else self.json_codec.dumps(item)
+                    for item in content
+                ) + b']'
+            else:
+                body = self.json_codec.dumps(content)
+            return Response(
+                body,
+                media_type=self.json_codec.media_type,
+                background=background,
+            )
+        return response_class(content=content, background=background)
+
     def bind_dependency_overrides_provider(self, value):
         for route in self.routes:
             route.dependency_overrides_provider = value
@@ -1344,6 +3428,7 @@ class Entrypoint(APIRouter):
         name = name or func.__name__
         tags = list(self.entrypoint_route.tags)
         tags.extend(kwargs.pop('tags', ()))
+        started_at = time.perf_counter()
         route = self.method_route_class(
             self,
             self.entrypoint_route.path + '/' + name,
@@ -1353,7 +3438,39 @@ class Entrypoint(APIRouter):
             tags=tags,
             **kwargs,
         )
+        self.method_build_times[name] = time.perf_counter() - started_at
         self.routes.append(route)
+        self.index_method_route(route)
+
+    def startup_report(self, limit: Optional[int] = None) -> str:
+        """Time spent on building method routes, slowest first"""
+        build_times = sorted(self.method_build_times.items(), key=lambda item: item[1], reverse=True)
+        lines = [
+            f'{self.entrypoint_route.path}: {len(build_times)} methods built in '
+            f'{sum(self.method_build_times.values()):.3f}s',
+        ]
+        for name, seconds in build_times[:limit]:
+            lines.append(f'  {seconds * 1000:8.2f}ms  {name}')
+        return '\n'.join(lines)
+
+    def index_method_route(self, route: MethodRoute) -> None:
+        if route.param_convertors:
+            self.method_routes_with_path_params.append(route)
+        else:
+            # first registered route wins, as with sequential matching
+            self.method_routes_index.setdefault(route.name, route)
+
+    def get_method_route(self, method: str, scope: typing.MutableMapping[str, Any]) -> Optional[MethodRoute]:
+        route = self.method_routes_index.get(method)
+        if route is not None:
+            return route
+
+        for route in self.method_routes_with_path_params:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route
+
+        return None
 
     def method(
         self,
@@ -1369,6 +3486,86 @@ class Entrypoint(APIRouter):
         return decorator
 
 
+def accepted_encodings(accept_encoding: Optional[str]) -> set:
+    encodings = set()
+    for item in (accept_encoding or '').split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        if any(param.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000') for param in params):
+            continue
+        if coding:
+            encodings.add(coding.lower())
+    return encodings
+
+
+def iter_annotation_types(annotation: Any, seen: set) -> typing.Iterator[type]:
+    """Classes referenced by annotation: models, dataclasses, TypedDicts, enums, etc., including nested ones"""
+    if inspect.isclass(annotation):
+        if annotation in seen:
+            return
+        seen.add(annotation)
+        yield annotation
+        if issubclass(annotation, BaseModel):
+            field_annotations = [field.annotation for field in annotation.model_fields.values()]
+        elif dataclasses.is_dataclass(annotation) or typing.is_typeddict(annotation) or issubclass(annotation, tuple):
+            try:
+                field_annotations = list(typing.get_type_hints(annotation).values())
+            except Exception:
+                # Unresolvable forward references, the module source is hashed anyway
+                field_annotations = []
+        else:
+            field_annotations = []
+        for field_annotation in field_annotations:
+            yield from iter_annotation_types(field_annotation, seen)
+    for arg in typing.get_args(annotation):
+        yield from iter_annotation_types(arg, seen)
+
+
+def iter_dependant_calls(dependant: Dependant) -> typing.Iterator[Callable]:
+    for sub_dependant in dependant.dependencies:
+        if sub_dependant.call is not None:
+            yield sub_dependant.call
+        yield from iter_dependant_calls(sub_dependant)
+
+
+class SchemaDocument:
+    """Schema document (OpenAPI, OpenRPC) encoded and compressed once, served with ETag"""
+
+    __slots__ = ('schema', 'bodies', 'etags')
+
+    def __init__(self, schema: dict, content: Optional[dict] = None):
+        if content is None:
+            content = schema
+        # Same encoding as JSONResponse
+        body = json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(',', ':')).encode()
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        # Source schema, document is outdated once it is regenerated
+        self.schema = schema
+        self.bodies: Dict[str, bytes] = {'identity': body, 'gzip': gzip.compress(body, mtime=0)}
+        if brotli is not None:
+            self.bodies['br'] = brotli.compress(body)
+        # Strong ETag of each representation
+        self.etags = {
+            encoding: f'"{digest}"' if encoding == 'identity' else f'"{digest}-{encoding}"'
+            for encoding in self.bodies
+        }
+
+    def is_not_modified(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+        return '*' in tags or not tags.isdisjoint(self.etags.values())
+
+    def response(self, request: Request) -> Response:
+        accepted = accepted_encodings(request.headers.get('accept-encoding'))
+        encoding = next((e for e in ('br', 'gzip') if e in self.bodies and e in accepted), 'identity')
+        headers = {'ETag': self.etags[encoding], 'Vary': 'Accept-Encoding'}
+        if self.is_not_modified(request.headers.get('if-none-match')):
+            return Response(status_code=304, headers=headers)
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return Response(self.bodies[encoding], media_type='application/json', headers=headers)
+
+
 class API(FastAPI):
     def __init__(
         self,
@@ -1376,11 +3573,24 @@ class API(FastAPI):
         fastapi_jsonrpc_components_fine_names: bool = True,
         openrpc_url: Optional[str] = "/openrpc.json",
         lifespan: Optional[Lifespan["API"]] = None,
+        json_codec: Optional[JsonCodec] = None,
+        prebuild_schemas: bool = False,
+        schemas_file: Optional[str] = None,
         **kwargs,
     ):
         self.fastapi_jsonrpc_components_fine_names = fastapi_jsonrpc_components_fine_names
+        # Precomputed schemas, see save_schemas
+        self.schemas_file = schemas_file
+        self._stored_schemas: Optional[dict] = None
+        self.json_codec = json_codec
         self.openrpc_schema = None
         self.openrpc_url = openrpc_url
+        # root_path -> encoded OpenAPI document, see openapi_document
+        self._openapi_documents: Dict[str, SchemaDocument] = {}
+        self._openrpc_document: Optional[SchemaDocument] = None
+        self.startup_functions: List = []
+        if prebuild_schemas:
+            self.startup_functions.append(self.build_schemas)
         self.shutdown_functions: List = []
 
         user_lifespan = lifespan  # capture before super().__init__ consumes the name
@@ -1406,6 +3616,7 @@ class API(FastAPI):
                 if user_lifespan is not None:
                     await stack.enter_async_context(user_lifespan(app))
 
+                await self.run_startup_functions()
                 try:
                     yield
                 finally:
@@ -1415,6 +3626,15 @@ class API(FastAPI):
 
         super().__init__(*args, lifespan=composed_lifespan, **kwargs)
 
+    @property
+    def dependency_overrides(self) -> DependencyOverrides:
+        return self._dependency_overrides
+
+    @dependency_overrides.setter
+    def dependency_overrides(self, value: dict):
+        # Changes are tracked, see MethodRoutePlan
+        self._dependency_overrides = DependencyOverrides(value)
+
     def _restore_json_schema_fine_component_names(self, data: dict):
         """Restore human-readable schema names and clean up module prefixes.
 
@@ -1521,6 +3741,15 @@ class API(FastAPI):
         update_refs(data)
 
     def openapi(self):
+        if self.openapi_schema:
+            # Already generated and cleaned up
+            return self.openapi_schema
+
+        stored = self.load_schemas().get('openapi')
+        if stored is not None:
+            self.openapi_schema = stored
+            return stored
+
         result = super().openapi()
 
         if self.fastapi_jsonrpc_components_fine_names and 'components' in result:
@@ -1533,6 +3762,20 @@ class API(FastAPI):
                     result['paths'][route.path][media_type]['responses'].pop('default', None)
         return result
 
+    def openapi_document(self, root_path: str = '') -> SchemaDocument:
+        schema = self.openapi()
+        document = self._openapi_documents.get(root_path)
+        if document is None or document.schema is not schema:
+            content = schema
+            # Same as FastAPI openapi endpoint
+            if root_path and self.root_path_in_servers:
+                server_urls = {s.get('url') for s in schema.get('servers', [])}
+                if root_path not in server_urls:
+                    content = {**schema, 'servers': [{'url': root_path}] + schema.get('servers', [])}
+            document = SchemaDocument(schema, content)
+            self._openapi_documents[root_path] = document
+        return document
+
     def get_openrpc(self):
         methods_spec = []
         schemas_spec = {}
@@ -1636,31 +3879,155 @@ class API(FastAPI):
 
     def openrpc(self):
         if self.openrpc_schema is None:
-            self.openrpc_schema = self.get_openrpc()
+            self.openrpc_schema = self.load_schemas().get('openrpc')
 
-        if self.fastapi_jsonrpc_components_fine_names and 'components' in self.openrpc_schema:
-            self._restore_json_schema_fine_component_names(self.openrpc_schema)
+        if self.openrpc_schema is None:
+            openrpc_schema = self.get_openrpc()
+            if self.fastapi_jsonrpc_components_fine_names and 'components' in openrpc_schema:
+                self._restore_json_schema_fine_component_names(openrpc_schema)
+            self.openrpc_schema = openrpc_schema
 
         return self.openrpc_schema
 
+    def openrpc_document(self) -> SchemaDocument:
+        schema = self.openrpc()
+        document = self._openrpc_document
+        if document is None or document.schema is not schema:
+            document = self._openrpc_document = SchemaDocument(schema)
+        return document
+
+    def schemas_fingerprint(self) -> str:
+        """Hash of what schemas are generated from: routes, their models, errors and dependencies,
+        sources of modules defining them and every type (enum, dataclass, TypedDict, etc.) reachable
+        from their annotations, and library versions. Models are not built for it.
+        """
+        parts: List[Any] = [
+            fastapi.__version__, pydantic.VERSION,
+            self.title, self.version, self.description, self.servers, self.openapi_version,
+            self.openrpc_url, self.fastapi_jsonrpc_components_fine_names,
+        ]
+        # Sources of this library are hashed too, as it may be not installed from a release
+        module_names = {__name__}
+        annotation_types: set = set()
+        for route in self.routes:
+            parts.append((type(route).__qualname__, getattr(route, 'path', None), getattr(route, 'name', None)))
+            if not isinstance(route, APIRoute):
+                continue
+            parts.append((
+                sorted(route.methods), route.tags, route.summary, route.description,
+                route.deprecated, route.include_in_schema, route.operation_id,
+            ))
+            module_names.add(route.endpoint.__module__)
+            annotations = [route.response_model]
+            if isinstance(route, MethodRoute):
+                module_names.add(route.func.__module__)
+                annotations += [route.params_model, route.result_model]
+            for error in getattr(route, 'errors', ()):
+                parts.append((error.__module__, error.__qualname__, error.CODE, error.MESSAGE))
+                module_names.add(error.__module__)
+                annotations += [error.ErrorModel, error.DataModel, error.error_model, error.data_model]
+            for call in iter_dependant_calls(route.dependant):
+                module_names.add(getattr(call, '__module__', None) or type(call).__module__)
+            flat_dependant = get_flat_dependant(route.dependant, skip_repeats=True)
+            for param in (
+                *flat_dependant.path_params, *flat_dependant.query_params, *flat_dependant.header_params,
+                *flat_dependant.cookie_params, *flat_dependant.body_params,
+            ):
+                annotations.append(param.field_info.annotation)
+            for annotation in annotations:
+                for annotation_type in iter_annotation_types(annotation, annotation_types):
+                    module_names.add(annotation_type.__module__)
+
+        digest = hashlib.sha256(repr(parts).encode())
+        for module_name in sorted(filter(None, module_names)):
+            digest.update(module_name.encode())
+            filename = getattr(sys.modules.get(module_name), '__file__', None)
+            if filename:
+                try:
+                    with open(filename, 'rb') as f:
+                        digest.update(hashlib.sha256(f.read()).digest())
+                except OSError:
+                    pass
+        return digest.hexdigest()
+
+    def load_schemas(self) -> dict:
+        """Schemas saved by `save_schemas` to `schemas_file`, empty if there is no such file
+        or it was saved for other routes or code.
+        """
+        if self._stored_schemas is None:
+            self._stored_schemas = {}
+            if self.schemas_file is not None:
+                try:
+                    with open(self.schemas_file, 'rb') as f:
+                        stored_schemas = json.load(f)
+                except FileNotFoundError:
+                    pass
+                except ValueError:
+                    logger.warning("Invalid schemas file %s, schemas are generated", self.schemas_file)
+                else:
+                    if stored_schemas.get('fingerprint') == self.schemas_fingerprint():
+                        self._stored_schemas = stored_schemas
+                    else:
+                        logger.info("Schemas file %s is outdated, schemas are generated", self.schemas_file)
+        return self._stored_schemas
+
+    def save_schemas(self, path: Optional[str] = None) -> None:
+        """Save generated OpenAPI and OpenRPC schemas to be loaded instead of generating them"""
+        path = path or self.schemas_file
+        if path is None:
+            raise ValueError("No path to save schemas to, pass it or set 'schemas_file'")
+        schemas = {'fingerprint': self.schemas_fingerprint(), 'openapi': self.openapi()}
+        if self.openrpc_url:
+            schemas['openrpc'] = self.openrpc()
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(schemas, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    async def build_schemas(self):
+        """Generate and encode schema documents ahead of the first request"""
+        if self.openapi_url:
+            self.openapi_document()
+        if self.openrpc_url:
+            self.openrpc_document()
+
     def setup(self) -> None:
         super().setup()
 
+        if self.openapi_url:
+            async def openapi(request: Request) -> Response:
+                root_path = request.scope.get('root_path', '').rstrip('/')
+                return self.openapi_document(root_path).response(request)
+
+            # Replace FastAPI endpoint, keeping routes order
+            for i, route in enumerate(self.router.routes):
+                if isinstance(route, Route) and route.path == self.openapi_url:
+                    self.router.routes[i] = Route(self.openapi_url, openapi, include_in_schema=False)
+                    break
+
         if self.openrpc_url:
             assert self.title, "A title must be provided for OpenRPC, e.g.: 'My API'"
             assert self.version, "A version must be provided for OpenRPC, e.g.: '2.1.0'"
 
-            async def openrpc(_: Request) -> JSONResponse:
-                return JSONResponse(self.openrpc())
+            async def openrpc(request: Request) -> Response:
+                return self.openrpc_document().response(request)
 
             self.add_route(self.openrpc_url, openrpc, include_in_schema=False)
 
     def bind_entrypoint(self, ep):
         ep.bind_dependency_overrides_provider(self)
+        if self.json_codec is not None and getattr(ep, 'json_codec_override', None) is None:
+            ep.json_codec = self.json_codec
         self.routes.extend(ep.routes)
+        if hasattr(ep, 'startup') and callable(ep.startup):
+            self.startup_functions.append(ep.startup)
         if hasattr(ep, 'shutdown') and callable(ep.shutdown):
             self.shutdown_functions.append(ep.shutdown)
 
+    async def run_startup_functions(self):
+        for startup_function in self.startup_functions:
+            await startup_function()
+
     async def run_shutdown_functions(self):
         for shutdown_function in self.shutdown_functions:
             await shutdown_function()
@@ -0,0 +1,53 @@
+"""Command line tools.
+
+    python -m fastapi_jsonrpc build-schemas myservice.main:app --output schemas.json
+
+saves OpenAPI and OpenRPC schemas of the API to be loaded by `API(schemas_file=...)`,
+e.g. during the image build.
+"""
+import argparse
+import importlib
+import os
+import sys
+from typing import Optional, Sequence
+
+from fastapi_jsonrpc import API
+
+
+def load_app(path: str) -> API:
+    module_name, _, attrs = path.partition(':')
+    app = importlib.import_module(module_name)
+    for attr in (attrs or 'app').split('.'):
+        app = getattr(app, attr)
+    return app
+
+
+def build_schemas(parser: argparse.ArgumentParser, args: argparse.Namespace):
+    app = load_app(args.app)
+    if not isinstance(app, API):
+        parser.error(f"{args.app} is not fastapi_jsonrpc.API")
+    output = args.output or app.schemas_file
+    if output is None:
+        parser.error("Pass --output or set 'schemas_file' of the API")
+    app.save_schemas(output)
+    print(f"Schemas of {args.app} saved to {output}")
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(prog='fastapi-jsonrpc')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build-schemas', help="Save OpenAPI and OpenRPC schemas to a file")
+    build.add_argument('app', help="API to load as 'module:attribute', e.g. 'myservice.main:app'")
+    build.add_argument('-o', '--output', help="File to write, default is 'schemas_file' of the API")
+    build.set_defaults(handler=build_schemas)
+
+    args = parser.parse_args(argv)
+    # Same as uvicorn: the app is imported from the current directory
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    args.handler(parser, args)
+
+
+if __name__ == '__main__':
+    main()
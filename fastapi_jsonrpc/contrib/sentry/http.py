@@ -9,7 +9,13 @@ sentry_asgi_context: ContextVar[dict] = ContextVar("_sentry_asgi_context")
 
 
 def set_shared_sentry_context(cls):
-    original_handle_body = cls.handle_body
+    for method_name in ('handle_body', 'handle_body_streaming', 'handle_body_incremental'):
+        if hasattr(cls, method_name):
+            _patch_handle_body(cls, method_name)
+
+
+def _patch_handle_body(cls, method_name):
+    original_handle_body = getattr(cls, method_name)
 
     @wraps(original_handle_body)
     async def _patched_handle_body(self, http_request: Request, *args, **kwargs):
@@ -17,4 +23,4 @@ def set_shared_sentry_context(cls):
         sentry_asgi_context.set({"sampled_sentry_trace_id": uuid.uuid4(), "asgi_headers": headers})
         return await original_handle_body(self, http_request, *args, **kwargs)
 
-    cls.handle_body = _patched_handle_body
+    setattr(cls, method_name, _patched_handle_body)
@@ -0,0 +1,124 @@
+import json
+
+import pytest
+from fastapi import Body
+
+import fastapi_jsonrpc as jsonrpc
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def ep(ep_path, calls):
+    ep = jsonrpc.Entrypoint(ep_path, batch_incremental_parsing=True, max_batch_size=3)
+
+    @ep.method()
+    def probe(data: str = Body(...)) -> str:
+        calls.append(data)
+        return data
+
+    return ep
+
+
+def test_single(method_request):
+    resp = method_request('probe', {'data': 'x'})
+    assert resp == {'id': 0, 'jsonrpc': '2.0', 'result': 'x'}
+
+
+def test_batch(raw_request):
+    body = json.dumps([
+        {'id': 1, 'jsonrpc': '2.0', 'method': 'probe', 'params': {'data': 'a,]}"'}},
+        {'jsonrpc': '2.0', 'method': 'probe', 'params': {'data': 'notification'}},
+        {'id': 2, 'jsonrpc': '2.0', 'method': 'unknown'},
+    ])
+
+    def chunks():
+        for i in range(0, len(body), 7):
+            yield body[i:i + 7].encode()
+
+    resp = raw_request(chunks())
+    assert resp.json() == [
+        {'id': 1, 'jsonrpc': '2.0', 'result': 'a,]}"'},
+        {'id': 2, 'jsonrpc': '2.0', 'error': {'code': -32601, 'message': 'Method not found'}},
+    ]
+
+
+def test_only_notifications(raw_request):
+    resp = raw_request(json.dumps([{'jsonrpc': '2.0', 'method': 'probe', 'params': {'data': 'x'}}]))
+    assert resp.content == b''
+
+
+@pytest.mark.parametrize('body', ['[{"id": 1, "jsonrpc": "2.0", "method": "probe", "params": {"data": "x"}}', '{'])
+def test_parse_error(raw_request, calls, ep_wait_all_requests_done, body):
+    resp = raw_request(body)
+    assert resp.json() == {'id': None, 'jsonrpc': '2.0', 'error': {'code': -32700, 'message': 'Parse error'}}
+
+
+def test_empty_batch(json_request):
+    resp = json_request([])
+    assert resp['error']['code'] == -32600
+    assert resp['error']['data']['errors'][0]['type'] == 'value_error.empty'
+
+
+def test_batch_too_large(json_request, calls):
+    resp = json_request([
+        {'id': i, 'jsonrpc': '2.0', 'method': 'probe', 'params': {'data': str(i)}}
+        for i in range(4)
+    ])
+    assert resp['error']['code'] == -32600
+    assert resp['error']['data']['errors'][0]['type'] == 'value_error.batch_too_large'
+    # requests received before the limit was hit are run anyway
+    assert sorted(calls) == ['0', '1', '2']
+
+
+def test_streaming_not_allowed(ep_path):
+    with pytest.raises(RuntimeError):
+        jsonrpc.Entrypoint(ep_path, batch_incremental_parsing=True, batch_streaming='json')
+
+
+def test_parser_drops_consumed_bytes():
+    parser = jsonrpc.JsonArrayStreamParser(jsonrpc.JsonCodec())
+    assert parser.feed(b'[{"a": 1}, {"b"') == [{'a': 1}]
+    assert parser.buffer == b' {"b"'
+    assert parser.feed(b': 2}]') == [{'b': 2}]
+    assert parser.close() is None
+
+
+PARSE_ERROR = {'id': None, 'jsonrpc': '2.0', 'error': {'code': -32700, 'message': 'Parse error'}}
+
+
+@pytest.mark.parametrize('body', [
+    '[{"id": 1, "jsonrpc": "2.0", "method": "probe", "params": {"data": "x"}}, {"id": 2',
+    '[{"id": 1, "jsonrpc": "2.0", "method": "probe", "params": {"data": "x"}}, ' + '[' * 100000 + ']' * 100000 + ']',
+], ids=['truncated', 'too_deep'])
+def test_truncated(raw_request, ep_wait_all_requests_done, body):
+    assert raw_request(body).json() == PARSE_ERROR
+
+
+def test_client_disconnect(app, app_client, ep_path, calls, ep_wait_all_requests_done):
+    messages = [
+        {'type': 'http.request', 'body': b'[{"id": 1, "jsonrpc": "2.0", "method": "probe", "params": {"data": "x"}},', 'more_body': True},
+        {'type': 'http.disconnect'},
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'POST',
+        'scheme': 'http', 'path': ep_path, 'raw_path': ep_path.encode(), 'root_path': '', 'query_string': b'',
+        'headers': [(b'content-type', b'application/json')], 'client': ('testclient', 50000), 'server': ('testserver', 80),
+    }
+    app_client.portal.call(app, scope, receive, send)
+
+    assert sent[0]['status'] == 200
+    assert json.loads(b''.join(m.get('body', b'') for m in sent[1:])) == PARSE_ERROR
+    # request received before disconnect is run anyway
+    assert calls == ['x']
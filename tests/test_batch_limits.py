@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+from fastapi import Body
+
+import fastapi_jsonrpc as jsonrpc
+
+
+class ConcurrencyTracker:
+    def __init__(self):
+        self.current = 0
+        self.max = 0
+
+
+@pytest.fixture
+def tracker():
+    return ConcurrencyTracker()
+
+
+@pytest.fixture
+def ep(ep_path, tracker):
+    ep = jsonrpc.Entrypoint(ep_path, max_batch_size=10, max_batch_concurrency=3)
+
+    @ep.method()
+    async def probe(data: int = Body(...)) -> int:
+        tracker.current += 1
+        tracker.max = max(tracker.max, tracker.current)
+        await asyncio.sleep(0.01)
+        tracker.current -= 1
+        return data
+
+    return ep
+
+
+def make_batch(size):
+    return [
+        {'id': i, 'jsonrpc': '2.0', 'method': 'probe', 'params': {'data': i}}
+        for i in range(size)
+    ]
+
+
+def test_bounded_concurrency(json_request, tracker):
+    resp = json_request(make_batch(10))
+    assert resp == [{'id': i, 'jsonrpc': '2.0', 'result': i} for i in range(10)]
+    assert tracker.max == 3
+
+
+def test_small_batch(json_request, tracker):
+    resp = json_request(make_batch(2))
+    assert resp == [{'id': i, 'jsonrpc': '2.0', 'result': i} for i in range(2)]
+    assert tracker.max == 2
+
+
+def test_notifications_in_bounded_batch(json_request, tracker):
+    batch = make_batch(5)
+    del batch[1]['id']
+    resp = json_request(batch)
+    assert [r['id'] for r in resp] == [0, 2, 3, 4]
+
+
+def test_batch_too_large(json_request, tracker):
+    resp = json_request(make_batch(11))
+    assert resp == {
+        'id': None,
+        'jsonrpc': '2.0',
+        'error': {
+            'code': -32600,
+            'message': 'Invalid Request',
+            'data': {'errors': [{
+                'loc': [],
+                'type': 'value_error.batch_too_large',
+                'msg': 'rpc call with a batch of 11 requests, max allowed is 10',
+            }]},
+        },
+    }
+    assert tracker.max == 0
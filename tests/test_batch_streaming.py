@@ -0,0 +1,138 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import Body, HTTPException
+from starlette.testclient import TestClient
+
+import fastapi_jsonrpc as jsonrpc
+
+
+@pytest.fixture(params=['request', 'completion'])
+def batch_streaming_order(request):
+    return request.param
+
+
+@pytest.fixture(params=['json', 'ndjson'])
+def batch_streaming(request):
+    return request.param
+
+
+@pytest.fixture
+def ep(ep_path, batch_streaming, batch_streaming_order):
+    ep = jsonrpc.Entrypoint(
+        ep_path,
+        batch_streaming=batch_streaming,
+        batch_streaming_order=batch_streaming_order,
+    )
+
+    @ep.method()
+    async def probe(delay: float = Body(...), data: str = Body(...)) -> str:
+        await asyncio.sleep(delay)
+        return data
+
+    @ep.method()
+    async def forbidden() -> str:
+        raise HTTPException(403)
+
+    return ep
+
+
+def parse(resp, batch_streaming):
+    if batch_streaming == 'ndjson':
+        assert resp.headers['content-type'] == 'application/x-ndjson'
+        return [json.loads(line) for line in resp.text.splitlines()]
+    assert resp.headers['content-type'] == 'application/json'
+    return resp.json()
+
+
+def test_batch(raw_request, batch_streaming, batch_streaming_order):
+    resp = raw_request(json.dumps([
+        {'id': 1, 'jsonrpc': '2.0', 'method': 'probe', 'params': {'delay': 0.2, 'data': 'slow'}},
+        {'jsonrpc': '2.0', 'method': 'probe', 'params': {'delay': 0, 'data': 'notification'}},
+        {'id': 2, 'jsonrpc': '2.0', 'method': 'probe', 'params': {'delay': 0, 'data': 'fast'}},
+        {'id': 3, 'jsonrpc': '2.0', 'method': 'unknown'},
+    ]))
+    resp_list = parse(resp, batch_streaming)
+
+    expected = [
+        {'id': 1, 'jsonrpc': '2.0', 'result': 'slow'},
+        {'id': 2, 'jsonrpc': '2.0', 'result': 'fast'},
+        {'id': 3, 'jsonrpc': '2.0', 'error': {'code': -32601, 'message': 'Method not found'}},
+    ]
+    if batch_streaming_order == 'request':
+        assert resp_list == expected
+    else:
+        assert resp_list[-1] == expected[0]
+        assert sorted(resp_list, key=lambda r: r['id']) == expected
+
+
+def test_only_notifications(raw_request, batch_streaming):
+    resp = raw_request(json.dumps([
+        {'jsonrpc': '2.0', 'method': 'probe', 'params': {'delay': 0, 'data': 'notification'}},
+    ]))
+    assert parse(resp, batch_streaming) == []
+
+
+def test_single_request_not_streamed(json_request):
+    resp = json_request({'id': 1, 'jsonrpc': '2.0', 'method': 'probe', 'params': {'delay': 0, 'data': 'x'}})
+    assert resp == {'id': 1, 'jsonrpc': '2.0', 'result': 'x'}
+
+
+def test_bounded_concurrency(ep, raw_request, batch_streaming):
+    ep.max_batch_concurrency = 2
+    resp = raw_request(json.dumps([
+        {'id': i, 'jsonrpc': '2.0', 'method': 'probe', 'params': {'delay': 0, 'data': str(i)}}
+        for i in range(5)
+    ]))
+    resp_list = parse(resp, batch_streaming)
+    assert sorted(r['id'] for r in resp_list) == list(range(5))
+
+
+def test_http_exception_is_error_element(raw_request, batch_streaming):
+    resp = raw_request(json.dumps([
+        {'id': 1, 'jsonrpc': '2.0', 'method': 'probe', 'params': {'delay': 0, 'data': 'x'}},
+        {'id': 2, 'jsonrpc': '2.0', 'method': 'forbidden'},
+    ]))
+    assert resp.status_code == 200
+    resp_list = parse(resp, batch_streaming)
+    assert sorted(resp_list, key=lambda r: r['id']) == [
+        {'id': 1, 'jsonrpc': '2.0', 'result': 'x'},
+        {'id': 2, 'jsonrpc': '2.0', 'error': {'code': -32603, 'message': 'Internal error'}},
+    ]
+
+
+@pytest.mark.parametrize('fail_on', ['http.response.start', 'http.response.body'])
+def test_exit_stack_closed_if_not_streamed(ep, app, ep_path, monkeypatch, fail_on):
+    cleanups = []
+    solve_shared_dependencies = ep.entrypoint_route.solve_shared_dependencies
+
+    async def with_cleanup(*args, async_exit_stack, **kwargs):
+        async_exit_stack.callback(cleanups.append, 'closed')
+        return await solve_shared_dependencies(*args, async_exit_stack=async_exit_stack, **kwargs)
+
+    monkeypatch.setattr(ep.entrypoint_route, 'solve_shared_dependencies', with_cleanup)
+
+    body = json.dumps([{'id': 1, 'jsonrpc': '2.0', 'method': 'probe', 'params': {'delay': 0, 'data': 'x'}}]).encode()
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(10)
+
+    async def send(message):
+        # client has gone
+        if message['type'] == fail_on:
+            raise OSError()
+
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'POST',
+        'scheme': 'http', 'path': ep_path, 'raw_path': ep_path.encode(), 'root_path': '', 'query_string': b'',
+        'headers': [(b'content-type', b'application/json')], 'client': ('testclient', 50000), 'server': ('testserver', 80),
+    }
+    with TestClient(app) as app_client:
+        with pytest.raises(OSError):
+            app_client.portal.call(app, scope, receive, send)
+
+    assert cleanups == ['closed']
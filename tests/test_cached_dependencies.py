@@ -0,0 +1,177 @@
+import time
+from collections import Counter
+
+import pytest
+from fastapi import Depends, Header, HTTPException
+from starlette.testclient import TestClient
+
+import fastapi_jsonrpc as jsonrpc
+
+
+def authorization_key(request):
+    return request.headers.get('Authorization')
+
+
+@pytest.fixture
+def calls():
+    return Counter()
+
+
+@pytest.fixture
+def auth_user(calls):
+    def auth_user(authorization: str = Header(None)) -> str:
+        calls['auth_user'] += 1
+        if authorization is None or not authorization.startswith('Bearer '):
+            raise HTTPException(status_code=401)
+        return authorization[len('Bearer '):]
+
+    return auth_user
+
+
+@pytest.fixture
+def get_account(calls):
+    def get_account(authorization: str = Header(None)) -> str:
+        calls['get_account'] += 1
+        return f'account-of-{authorization}'
+
+    return get_account
+
+
+@pytest.fixture
+def ep(ep_path, auth_user, get_account):
+    ep = jsonrpc.Entrypoint(
+        ep_path,
+        dependencies=[jsonrpc.CachedDepends(auth_user, key=authorization_key, ttl=0.2, maxsize=2)],
+        common_dependencies=[jsonrpc.CachedDepends(get_account, key=authorization_key)],
+    )
+
+    @ep.method()
+    def whoami(user: str = Depends(auth_user)) -> str:
+        return user
+
+    @ep.method()
+    def account(value: str = Depends(get_account)) -> str:
+        return value
+
+    return ep
+
+
+@pytest.fixture
+def call(ep_path, app_client):
+    def call(token, method='whoami', size=None):
+        headers = {'Authorization': f'Bearer {token}'} if token is not None else {}
+        request = {'id': 1, 'jsonrpc': '2.0', 'method': method, 'params': {}}
+        resp = app_client.post(ep_path, json=request if size is None else [request] * size, headers=headers)
+        return resp.status_code, resp.json()
+
+    return call
+
+
+def test_cached_across_requests(call, calls):
+    assert call('one') == (200, {'id': 1, 'jsonrpc': '2.0', 'result': 'one'})
+    assert call('one') == (200, {'id': 1, 'jsonrpc': '2.0', 'result': 'one'})
+    assert calls['auth_user'] == 1
+
+    assert call('two') == (200, {'id': 1, 'jsonrpc': '2.0', 'result': 'two'})
+    assert calls['auth_user'] == 2
+
+
+def test_ttl(call, calls):
+    call('one')
+    time.sleep(0.25)
+    call('one')
+    assert calls['auth_user'] == 2
+
+
+def test_lru(call, calls):
+    for token in ('one', 'two', 'one', 'three'):
+        call(token)
+    assert calls['auth_user'] == 3
+    # 'two' is least recently used and evicted
+    call('two')
+    assert calls['auth_user'] == 4
+
+
+def test_errors_not_cached(call, calls):
+    assert call(None)[0] == 401
+    assert call(None)[0] == 401
+    assert calls['auth_user'] == 2
+
+
+def test_common_dependencies(call, calls):
+    status, resp = call('one', method='account', size=2)
+    assert status == 200
+    assert [r['result'] for r in resp] == ['account-of-Bearer one'] * 2
+    assert calls['get_account'] == 2
+
+    call('one', method='account', size=2)
+    assert calls['get_account'] == 2
+
+
+def test_overridden(app, call, calls, auth_user):
+    app.dependency_overrides[auth_user] = lambda: 'override'
+    try:
+        assert call('one')[1]['result'] == 'override'
+    finally:
+        app.dependency_overrides.clear()
+    assert calls['auth_user'] == 0
+
+    # override value was not cached
+    assert call('one')[1]['result'] == 'one'
+    assert calls['auth_user'] == 1
+
+
+def test_cache_counters(ep, call):
+    call('one')
+    call('one')
+    cache = ep.entrypoint_route.cached_dependencies[0][1]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_sub_dependencies_not_solved_on_hit(ep_path, calls):
+    def decode_jwt(authorization: str = Header(...)) -> str:
+        calls['decode_jwt'] += 1
+        return authorization
+
+    def current_user(payload: str = Depends(decode_jwt)) -> str:
+        calls['current_user'] += 1
+        return f'user-{payload}'
+
+    def current_account(payload: str = Depends(decode_jwt)) -> str:
+        calls['current_account'] += 1
+        return f'account-{payload}'
+
+    ep = jsonrpc.Entrypoint(
+        ep_path,
+        dependencies=[jsonrpc.CachedDepends(current_user, key=authorization_key)],
+        common_dependencies=[jsonrpc.CachedDepends(current_account, key=authorization_key)],
+    )
+
+    @ep.method()
+    def whoami_jwt(user: str = Depends(current_user), account: str = Depends(current_account)) -> str:
+        return f'{user}/{account}'
+
+    app = jsonrpc.API()
+    app.bind_entrypoint(ep)
+    with TestClient(app) as client:
+        for _ in range(3):
+            resp = client.post(
+                ep_path,
+                json={'id': 1, 'jsonrpc': '2.0', 'method': 'whoami_jwt', 'params': {}},
+                headers={'Authorization': 'token'},
+            )
+            assert resp.json()['result'] == 'user-token/account-token'
+
+    assert calls == {'decode_jwt': 1, 'current_user': 1, 'current_account': 1}
+
+
+def test_yield_dependency_not_allowed():
+    def session():
+        yield 'session'
+
+    async def async_session():
+        yield 'session'
+
+    for dependency in (session, async_session):
+        with pytest.raises(ValueError):
+            jsonrpc.CachedDepends(dependency, key=authorization_key)
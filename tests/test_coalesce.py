@@ -0,0 +1,197 @@
+import asyncio
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import Body, Depends, Header
+
+import fastapi_jsonrpc as jsonrpc
+
+
+class SlowError(jsonrpc.BaseError):
+    CODE = 5000
+    MESSAGE = 'Slow error'
+
+
+def get_user(x_user: str = Header(...)) -> str:
+    return x_user
+
+
+def get_scale(scale: int = Body(1)) -> int:
+    return scale
+
+
+@pytest.fixture
+def calls():
+    return Counter()
+
+
+@pytest.fixture
+def ep(ep, calls):
+    @ep.method(coalesce=True)
+    async def slow(data: int = Body(...)) -> dict:
+        calls['slow'] += 1
+        await asyncio.sleep(0.1)
+        return {'data': data}
+
+    @ep.method(coalesce=True, errors=[SlowError])
+    async def slow_fail(data: int = Body(...)) -> int:
+        calls['slow_fail'] += 1
+        await asyncio.sleep(0.1)
+        raise SlowError()
+
+    @ep.method(coalesce=True)
+    def slow_sync(data: int = Body(...)) -> int:
+        calls['slow_sync'] += 1
+        time.sleep(0.1)
+        return data
+
+    @ep.method(coalesce=True, cache=True)
+    async def slow_cached(data: int = Body(...)) -> int:
+        calls['slow_cached'] += 1
+        await asyncio.sleep(0.1)
+        return data
+
+    @ep.method(coalesce=['user'])
+    async def slow_user(data: int = Body(...), user: str = Depends(get_user)) -> str:
+        calls['slow_user'] += 1
+        await asyncio.sleep(0.2)
+        return f'{user}-{data}'
+
+    @ep.method(coalesce=['s'])
+    async def slow_scaled(data: int = Body(...), s: int = Depends(get_scale)) -> int:
+        calls['slow_scaled'] += 1
+        await asyncio.sleep(0.1)
+        return data * s
+
+    @ep.method()
+    async def not_coalesced(data: int = Body(...)) -> int:
+        calls['not_coalesced'] += 1
+        await asyncio.sleep(0.1)
+        return data
+
+    return ep
+
+
+def batch(method, params):
+    return [
+        {'id': i, 'jsonrpc': '2.0', 'method': method, 'params': {'data': data}}
+        for i, data in enumerate(params)
+    ]
+
+
+def test_batch(json_request, calls):
+    assert json_request(batch('slow', [1, 1, 1])) == [
+        {'id': 0, 'jsonrpc': '2.0', 'result': {'data': 1}},
+        {'id': 1, 'jsonrpc': '2.0', 'result': {'data': 1}},
+        {'id': 2, 'jsonrpc': '2.0', 'result': {'data': 1}},
+    ]
+    assert calls['slow'] == 1
+
+
+def test_different_params(json_request, calls):
+    assert json_request(batch('slow', [1, 2, 1])) == [
+        {'id': 0, 'jsonrpc': '2.0', 'result': {'data': 1}},
+        {'id': 1, 'jsonrpc': '2.0', 'result': {'data': 2}},
+        {'id': 2, 'jsonrpc': '2.0', 'result': {'data': 1}},
+    ]
+    assert calls['slow'] == 2
+
+
+def test_error_shared(json_request, calls):
+    error = {'code': 5000, 'message': 'Slow error'}
+    assert json_request(batch('slow_fail', [1, 1])) == [
+        {'id': 0, 'jsonrpc': '2.0', 'error': error},
+        {'id': 1, 'jsonrpc': '2.0', 'error': error},
+    ]
+    assert calls['slow_fail'] == 1
+
+
+def test_sync(json_request, calls):
+    assert json_request(batch('slow_sync', [3, 3])) == [
+        {'id': 0, 'jsonrpc': '2.0', 'result': 3},
+        {'id': 1, 'jsonrpc': '2.0', 'result': 3},
+    ]
+    assert calls['slow_sync'] == 1
+
+
+def test_with_cache(json_request, calls):
+    json_request(batch('slow_cached', [1, 1]))
+    json_request(batch('slow_cached', [1]))
+    assert calls['slow_cached'] == 1
+
+
+def test_not_in_flight_after_done(ep, json_request, calls):
+    json_request(batch('slow', [1]))
+    json_request(batch('slow', [1]))
+    assert calls['slow'] == 2
+    routes = {r.name: r for r in ep.routes if isinstance(r, jsonrpc.MethodRoute)}
+    assert routes['slow'].calls_in_flight == {}
+
+
+def test_off_by_default(json_request, calls):
+    json_request(batch('not_coalesced', [1, 1]))
+    assert calls['not_coalesced'] == 2
+
+
+def test_dependencies_in_key(ep_path, app_client, calls):
+    def call(user):
+        return app_client.post(ep_path, json={
+            'id': 1, 'jsonrpc': '2.0', 'method': 'slow_user', 'params': {'data': 1},
+        }, headers={'X-User': user}).json()['result']
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(executor.map(call, ['alice', 'bob', 'alice']))
+
+    assert results == ['alice-1', 'bob-1', 'alice-1']
+    assert calls['slow_user'] == 2
+
+
+def test_dependencies_require_key(ep_path):
+    ep = jsonrpc.Entrypoint(ep_path)
+
+    with pytest.raises(RuntimeError):
+        @ep.method(coalesce=True)
+        def with_user(data: int = Body(...), user: str = Depends(get_user)) -> str:
+            return user
+
+    with pytest.raises(RuntimeError):
+        @ep.method(coalesce=['tenant'])
+        def unknown_key(data: int = Body(...), user: str = Depends(get_user)) -> str:
+            return user
+
+    @ep.method(coalesce=True, cache=jsonrpc.ResultCache(key_dependencies=['user']))
+    def cache_key(data: int = Body(...), user: str = Depends(get_user)) -> str:
+        return user
+
+    @ep.method(coalesce=[])
+    def ignore_dependencies(data: int = Body(...), user: str = Depends(get_user)) -> str:
+        return user
+
+
+def test_dependency_params(json_request, calls):
+    assert json_request([
+        {'id': i, 'jsonrpc': '2.0', 'method': 'slow_scaled', 'params': params}
+        for i, params in enumerate([{'data': 2, 'scale': 3}, {'data': 2, 'scale': 3}, {'data': 2, 'scale': 4}])
+    ]) == [
+        {'id': 0, 'jsonrpc': '2.0', 'result': 6},
+        {'id': 1, 'jsonrpc': '2.0', 'result': 6},
+        {'id': 2, 'jsonrpc': '2.0', 'result': 8},
+    ]
+    assert calls['slow_scaled'] == 2
+
+
+def test_yield_dependencies_not_allowed(ep_path):
+    ep = jsonrpc.Entrypoint(ep_path)
+
+    async def session():
+        yield 'session'
+
+    def get_session(value: str = Depends(session)) -> str:
+        return value
+
+    with pytest.raises(RuntimeError):
+        @ep.method(coalesce=['value'])
+        def with_session(data: int = Body(...), value: str = Depends(get_session)) -> str:
+            return value
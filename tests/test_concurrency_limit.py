@@ -0,0 +1,120 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import Body
+
+import fastapi_jsonrpc as jsonrpc
+
+
+@pytest.fixture
+def ep(ep):
+    @ep.method(max_concurrency=1)
+    async def limited(data: int = Body(...)) -> int:
+        await asyncio.sleep(0.1)
+        return data
+
+    @ep.method(max_concurrency=1, max_queue=2)
+    async def limited_queue(data: int = Body(...)) -> int:
+        await asyncio.sleep(0.1)
+        return data
+
+    @ep.method(max_concurrency=1, max_queue=2, queue_timeout=0.05)
+    async def limited_queue_timeout(data: int = Body(...)) -> int:
+        await asyncio.sleep(0.1)
+        return data
+
+    @ep.method(max_concurrency=1, timeout=0.05, executor=ThreadPoolExecutor(max_workers=2))
+    def limited_sync_timeout(data: int = Body(...)) -> int:
+        time.sleep(data / 10)
+        return data
+
+    @ep.method()
+    async def unlimited(data: int = Body(...)) -> int:
+        await asyncio.sleep(0.1)
+        return data
+
+    return ep
+
+
+def batch(method, size):
+    return [
+        {'id': i, 'jsonrpc': '2.0', 'method': method, 'params': {'data': i}}
+        for i in range(size)
+    ]
+
+
+def results(resp):
+    return sorted(
+        (r['id'], r['result'] if 'result' in r else r['error']['code'])
+        for r in resp
+    )
+
+
+def test_rejected(json_request):
+    assert results(json_request(batch('limited', 3))) == [(0, 0), (1, -32001), (2, -32001)]
+    # slot is released
+    assert results(json_request(batch('limited', 1))) == [(0, 0)]
+
+
+def test_queued(json_request):
+    assert results(json_request(batch('limited_queue', 4))) == [(0, 0), (1, 1), (2, 2), (3, -32001)]
+
+
+def test_queue_timeout(json_request):
+    assert results(json_request(batch('limited_queue_timeout', 3))) == [(0, 0), (1, -32001), (2, -32001)]
+
+
+def test_unlimited(json_request):
+    assert results(json_request(batch('unlimited', 3))) == [(0, 0), (1, 1), (2, 2)]
+
+
+def test_error_response(json_request):
+    resp = json_request(batch('limited', 2))
+    assert resp[1] == {'id': 1, 'jsonrpc': '2.0', 'error': {'code': -32001, 'message': 'Server overloaded'}}
+
+
+def test_errors_declared(ep, app, app_client):
+    routes = {r.name: r for r in ep.routes if isinstance(r, jsonrpc.MethodRoute)}
+    assert jsonrpc.ServerOverloaded in routes['limited'].errors
+    assert jsonrpc.ServerOverloaded not in routes['unlimited'].errors
+
+    openrpc = app_client.get('/openrpc.json').json()
+    methods = {m['name']: m for m in openrpc['methods']}
+    assert {'$ref': '#/components/errors/-32001'} in methods['limited']['errors']
+    assert {'$ref': '#/components/errors/-32001'} not in methods['unlimited']['errors']
+
+    openapi = app_client.get('/openapi.json').json()
+    limited_responses = openapi['paths']['/api/v1/jsonrpc/limited']['post']['responses']
+    assert any('Server overloaded' in r['description'] for r in limited_responses.values())
+
+
+def test_slot_taken_until_thread_done(method_request):
+    timeout_error = {'code': -32002, 'message': 'Request timeout'}
+    assert method_request('limited_sync_timeout', {'data': 3})['error'] == timeout_error
+    # thread is still running
+    assert method_request('limited_sync_timeout', {'data': 0})['error']['code'] == -32001
+    time.sleep(0.35)
+    assert method_request('limited_sync_timeout', {'data': 0})['result'] == 0
+
+
+def test_notifications_limited(ep, raw_request, ep_wait_all_requests_done, caplog):
+    calls = []
+
+    @ep.method(max_concurrency=1)
+    async def limited_notification(data: int = Body(...)) -> int:
+        calls.append(data)
+        await asyncio.sleep(0.1)
+        return data
+
+    resp = raw_request(json.dumps([
+        {'jsonrpc': '2.0', 'method': 'limited_notification', 'params': {'data': i}}
+        for i in range(3)
+    ]))
+    assert resp.content == b''
+    ep_wait_all_requests_done()
+
+    assert len(calls) == 1
+    assert caplog.text.count('Notification limited_notification is dropped, method is overloaded') == 2
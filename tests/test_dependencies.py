@@ -80,3 +80,25 @@ def test_batch(json_request):
         {'id': 333, 'jsonrpc': '2.0', 'result': ['shared-1', 'three', ANY]},
     ]
     assert set(r['result'][2] for r in resp) == {1, 2, 3}
+
+
+def test_shared_cache_not_modified(ep, json_request, monkeypatch):
+    route = ep.entrypoint_route
+    shared_caches = []
+    solve_shared_dependencies = route.solve_shared_dependencies
+
+    async def capture(*args, **kwargs):
+        dependency_cache = await solve_shared_dependencies(*args, **kwargs)
+        shared_caches.append((dependency_cache, dict(dependency_cache)))
+        return dependency_cache
+
+    monkeypatch.setattr(route, 'solve_shared_dependencies', capture)
+
+    json_request([
+        {'id': 1, 'jsonrpc': '2.0', 'method': 'probe', 'params': {'common': 'one'}},
+        {'id': 2, 'jsonrpc': '2.0', 'method': 'probe', 'params': {'common': 'two'}},
+    ])
+
+    [(dependency_cache, solved)] = shared_caches
+    # method own dependencies are kept apart from shared ones
+    assert dependency_cache == solved
@@ -0,0 +1,19 @@
+import fastapi_jsonrpc as jsonrpc
+
+
+class CustomEntrypoint(jsonrpc.Entrypoint):
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+
+
+def test_caller_module(ep_path):
+    assert jsonrpc.Entrypoint(ep_path).callee_module == __name__
+
+
+def test_subclass(ep_path):
+    # module where super().__init__ is called, same as before
+    assert CustomEntrypoint(ep_path).callee_module == __name__
+
+
+def test_explicit_module(ep_path):
+    assert jsonrpc.Entrypoint(ep_path, module='my_service.api').callee_module == 'my_service.api'
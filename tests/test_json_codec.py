@@ -0,0 +1,103 @@
+import pytest
+from fastapi import Body
+
+import fastapi_jsonrpc as jsonrpc
+
+
+class RecordingCodec(jsonrpc.JsonCodec):
+    def __init__(self):
+        self.loads_calls = 0
+        self.dumps_calls = 0
+
+    def loads(self, data: bytes):
+        self.loads_calls += 1
+        return super().loads(data)
+
+    def dumps(self, obj) -> bytes:
+        self.dumps_calls += 1
+        return super().dumps(obj)
+
+
+def make_codecs():
+    codecs = [pytest.param(jsonrpc.JsonCodec, id='stdlib')]
+    codecs.append(pytest.param(
+        jsonrpc.OrjsonCodec, id='orjson',
+        marks=pytest.mark.skipif(jsonrpc.orjson is None, reason='orjson is not installed'),
+    ))
+    codecs.append(pytest.param(
+        jsonrpc.MsgspecCodec, id='msgspec',
+        marks=pytest.mark.skipif(jsonrpc.msgspec is None, reason='msgspec is not installed'),
+    ))
+    return codecs
+
+
+@pytest.fixture(params=make_codecs())
+def ep(ep_path, request):
+    ep = jsonrpc.Entrypoint(ep_path, json_codec=request.param())
+
+    @ep.method()
+    def echo(data: str = Body(...)) -> str:
+        return data
+
+    return ep
+
+
+def test_result(method_request):
+    resp = method_request('echo', {'data': 'привет'})
+    assert resp == {'id': 0, 'jsonrpc': '2.0', 'result': 'привет'}
+
+
+def test_parse_error(raw_request):
+    resp = raw_request('{"id": 0,')
+    assert resp.headers['content-type'] == 'application/json'
+    assert resp.json() == {
+        'id': None, 'jsonrpc': '2.0', 'error': {'code': -32700, 'message': 'Parse error'},
+    }
+
+
+def test_invalid_params(method_request):
+    resp = method_request('echo', {})
+    assert resp['error']['code'] == -32602
+
+
+def test_batch(json_request):
+    resp = json_request([
+        {'id': 1, 'jsonrpc': '2.0', 'method': 'echo', 'params': {'data': 'a'}},
+        {'id': 2, 'jsonrpc': '2.0', 'method': 'echo', 'params': {'data': 'b'}},
+    ])
+    assert resp == [
+        {'id': 1, 'jsonrpc': '2.0', 'result': 'a'},
+        {'id': 2, 'jsonrpc': '2.0', 'result': 'b'},
+    ]
+
+
+def test_api_codec(ep_path):
+    from starlette.testclient import TestClient
+
+    codec = RecordingCodec()
+    ep = jsonrpc.Entrypoint(ep_path)
+
+    @ep.method()
+    def echo(data: str = Body(...)) -> str:
+        return data
+
+    app = jsonrpc.API(json_codec=codec)
+    app.bind_entrypoint(ep)
+
+    with TestClient(app) as client:
+        resp = client.post(ep_path, json={'id': 0, 'jsonrpc': '2.0', 'method': 'echo', 'params': {'data': 'x'}})
+        assert resp.json() == {'id': 0, 'jsonrpc': '2.0', 'result': 'x'}
+
+    assert codec.loads_calls == 1
+    assert codec.dumps_calls == 1
+
+
+def test_entrypoint_codec_wins_over_api_codec(ep_path):
+    api_codec = RecordingCodec()
+    ep_codec = RecordingCodec()
+    ep = jsonrpc.Entrypoint(ep_path, json_codec=ep_codec)
+
+    app = jsonrpc.API(json_codec=api_codec)
+    app.bind_entrypoint(ep)
+
+    assert ep.json_codec is ep_codec
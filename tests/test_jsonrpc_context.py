@@ -0,0 +1,106 @@
+import contextlib
+
+import pytest
+from fastapi import Body, Depends
+
+import fastapi_jsonrpc as jsonrpc
+
+
+contexts = []
+
+
+class _MiddlewareError(jsonrpc.BaseError):
+    CODE = 5000
+    MESSAGE = 'Middleware error'
+
+
+def get_ctx() -> jsonrpc.JsonRpcContext:
+    ctx = jsonrpc.get_jsonrpc_context()
+    contexts.append(ctx)
+    return ctx
+
+
+@pytest.fixture
+def ep(ep_path):
+    contexts.clear()
+
+    @contextlib.asynccontextmanager
+    async def mw(ctx: jsonrpc.JsonRpcContext):
+        ctx.user_value = 'mw'
+        try:
+            yield
+        except ZeroDivisionError:
+            raise _MiddlewareError()
+
+    ep = jsonrpc.Entrypoint(ep_path)
+
+    @ep.method()
+    def probe(data: str = Body(...), ctx: jsonrpc.JsonRpcContext = Depends(get_ctx)) -> str:
+        return data
+
+    @ep.method(middlewares=[mw])
+    def probe_mw(ctx: jsonrpc.JsonRpcContext = Depends(get_ctx)) -> str:
+        return ctx.user_value
+
+    @ep.method(middlewares=[mw])
+    def probe_mw_error(ctx: jsonrpc.JsonRpcContext = Depends(get_ctx)) -> str:
+        raise ZeroDivisionError
+
+    return ep
+
+
+def test_slots():
+    assert '_request' in jsonrpc.JsonRpcContext.__slots__
+    assert 'exit_stack' in jsonrpc.JsonRpcContext.__slots__
+
+
+def test_no_exit_stack_without_middlewares(ep, method_request):
+    assert method_request('probe', {'data': 'abc'}) == {'id': 0, 'jsonrpc': '2.0', 'result': 'abc'}
+    ctx, = contexts
+    assert ctx.exit_stack is None
+    assert ctx.is_request_validated
+    assert ctx.__dict__ == {}
+
+
+def test_no_exit_stack_with_middlewares(ep, method_request):
+    assert method_request('probe_mw', {}) == {'id': 0, 'jsonrpc': '2.0', 'result': 'mw'}
+    ctx, = contexts
+    assert ctx.exit_stack is None
+    assert ctx.__dict__ == {'user_value': 'mw'}
+
+
+def test_middleware_converts_exception(ep, method_request):
+    assert method_request('probe_mw_error', {}) == {
+        'id': 0,
+        'jsonrpc': '2.0',
+        'error': {'code': 5000, 'message': 'Middleware error'},
+    }
+
+
+def test_request_setter(ep, method_request):
+    ctx = jsonrpc.JsonRpcContext(
+        entrypoint=ep,
+        raw_request={'jsonrpc': '2.0', 'id': 1, 'method': 'probe'},
+        http_request=None,
+        background_tasks=None,
+        http_response=None,
+    )
+    assert not ctx.is_request_validated
+    assert ctx.request.method == 'probe'
+    assert ctx.is_request_validated
+
+    ctx.request = jsonrpc.JsonRpcRequest(jsonrpc='2.0', id=2, method='other')
+    assert ctx.request.method == 'other'
+
+
+def test_invalid_request_not_cached(ep):
+    ctx = jsonrpc.JsonRpcContext(
+        entrypoint=ep,
+        raw_request={'id': 1},
+        http_request=None,
+        background_tasks=None,
+        http_response=None,
+    )
+    with pytest.raises(jsonrpc.InvalidRequest):
+        ctx.request  # noqa
+    assert not ctx.is_request_validated
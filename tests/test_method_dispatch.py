@@ -0,0 +1,58 @@
+import pytest
+from fastapi import Body
+
+import fastapi_jsonrpc as jsonrpc
+
+
+@pytest.fixture
+def ep(ep):
+    for i in range(50):
+        def make_method(i=i):
+            def method(data: str = Body(...)) -> str:
+                return f'{i}:{data}'
+            return method
+
+        ep.add_method_route(make_method(), name=f'method_{i}')
+
+    return ep
+
+
+def test_index(ep):
+    assert len(ep.method_routes_index) == 50
+    assert not ep.method_routes_with_path_params
+    assert ep.method_routes_index['method_49'].name == 'method_49'
+
+
+def test_last_method(method_request):
+    resp = method_request('method_49', {'data': 'x'})
+    assert resp == {'id': 0, 'jsonrpc': '2.0', 'result': '49:x'}
+
+
+def test_method_not_found(json_request):
+    resp = json_request({'id': 0, 'jsonrpc': '2.0', 'method': 'unknown', 'params': {}})
+    assert resp == {
+        'id': 0, 'jsonrpc': '2.0', 'error': {'code': -32601, 'message': 'Method not found'},
+    }
+
+
+def test_path_params():
+    from starlette.testclient import TestClient
+
+    ep = jsonrpc.Entrypoint('/api/{version}/jsonrpc')
+
+    @ep.method()
+    def probe() -> str:
+        return 'probe'
+
+    assert not ep.method_routes_index
+    assert len(ep.method_routes_with_path_params) == 1
+
+    app = jsonrpc.API()
+    app.bind_entrypoint(ep)
+
+    with TestClient(app) as client:
+        resp = client.post('/api/v1/jsonrpc', json={'id': 0, 'jsonrpc': '2.0', 'method': 'probe', 'params': {}})
+        assert resp.json() == {'id': 0, 'jsonrpc': '2.0', 'result': 'probe'}
+
+        resp = client.post('/api/v1/jsonrpc', json={'id': 0, 'jsonrpc': '2.0', 'method': 'other', 'params': {}})
+        assert resp.json()['error']['code'] == -32601
@@ -0,0 +1,125 @@
+import contextlib
+
+import pytest
+from fastapi import Body
+
+import fastapi_jsonrpc as jsonrpc
+
+
+class _TestError(jsonrpc.BaseError):
+    CODE = 33333
+    MESSAGE = "Test error"
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def ep(ep_path, calls):
+    async def ep_call_next(ctx: jsonrpc.JsonRpcContext, call_next):
+        calls.append(('ep_call_next', 'enter', ctx.raw_request.get('method')))
+        try:
+            await call_next()
+        finally:
+            calls.append(('ep_call_next', 'exit', ctx.raw_response))
+
+    @contextlib.asynccontextmanager
+    async def ep_cm(ctx: jsonrpc.JsonRpcContext):
+        calls.append(('ep_cm', 'enter', ctx.raw_request.get('method')))
+        try:
+            yield
+        finally:
+            calls.append(('ep_cm', 'exit', ctx.raw_response))
+
+    async def method_call_next(ctx: jsonrpc.JsonRpcContext, call_next):
+        calls.append(('method_call_next', 'enter', ctx.request.params))
+        try:
+            await call_next()
+        except RuntimeError:
+            raise _TestError()
+        finally:
+            calls.append(('method_call_next', 'exit', ctx.raw_response))
+
+    async def method_swallow(ctx: jsonrpc.JsonRpcContext, call_next):
+        try:
+            await call_next()
+        except _TestError:
+            ctx.raw_response = {'jsonrpc': '2.0', 'result': 'swallowed'}
+
+    ep = jsonrpc.Entrypoint(
+        ep_path,
+        middlewares=[jsonrpc.CallNextMiddleware(ep_call_next), ep_cm],
+    )
+
+    @ep.method(middlewares=[jsonrpc.CallNextMiddleware(method_call_next)])
+    def probe(data: str = Body(...)) -> str:
+        return data
+
+    @ep.method(middlewares=[jsonrpc.CallNextMiddleware(method_call_next)])
+    def probe_error() -> str:
+        raise RuntimeError('converted by middleware')
+
+    @ep.method(middlewares=[jsonrpc.CallNextMiddleware(method_swallow)])
+    def probe_swallow() -> str:
+        raise _TestError()
+
+    return ep
+
+
+def route(ep, name) -> jsonrpc.MethodRoute:
+    return next(r for r in ep.routes if isinstance(r, jsonrpc.MethodRoute) and r.name == name)
+
+
+def test_order(ep, method_request, calls):
+    assert method_request('probe', {'data': 'one'}) == {'id': 0, 'jsonrpc': '2.0', 'result': 'one'}
+    assert calls == [
+        ('ep_call_next', 'enter', 'probe'),
+        ('ep_cm', 'enter', 'probe'),
+        ('method_call_next', 'enter', {'data': 'one'}),
+        ('method_call_next', 'exit', {'id': 0, 'jsonrpc': '2.0', 'result': 'one'}),
+        ('ep_cm', 'exit', {'id': 0, 'jsonrpc': '2.0', 'result': 'one'}),
+        ('ep_call_next', 'exit', {'id': 0, 'jsonrpc': '2.0', 'result': 'one'}),
+    ]
+
+
+def test_exception_converted(ep, method_request, calls):
+    error = {'id': 0, 'jsonrpc': '2.0', 'error': {'code': 33333, 'message': 'Test error'}}
+    assert method_request('probe_error', {}) == error
+    assert calls[-3:] == [
+        ('method_call_next', 'exit', {
+            'id': 0, 'jsonrpc': '2.0', 'error': {'code': -32603, 'message': 'Internal error'},
+        }),
+        ('ep_cm', 'exit', error),
+        ('ep_call_next', 'exit', error),
+    ]
+
+
+def test_exception_swallowed(ep, method_request, calls):
+    assert method_request('probe_swallow', {}) == {'id': 0, 'jsonrpc': '2.0', 'result': 'swallowed'}
+    assert calls[-1] == ('ep_call_next', 'exit', {'id': 0, 'jsonrpc': '2.0', 'result': 'swallowed'})
+
+
+def test_chain_compiled_once(ep, method_request):
+    assert method_request('probe', {'data': 'one'}) == {'id': 0, 'jsonrpc': '2.0', 'result': 'one'}
+    chain = route(ep, 'probe').middleware_chain
+    ep_chain = route(ep, 'probe').entrypoint_middleware_chain
+
+    assert method_request('probe', {'data': 'two'}) == {'id': 0, 'jsonrpc': '2.0', 'result': 'two'}
+    assert route(ep, 'probe').middleware_chain is chain
+    assert route(ep, 'probe').entrypoint_middleware_chain is ep_chain
+
+
+def test_chain_recompiled(ep, method_request, calls):
+    @contextlib.asynccontextmanager
+    async def extra(ctx: jsonrpc.JsonRpcContext):
+        calls.append(('extra', 'enter'))
+        yield
+
+    chain = route(ep, 'probe').middleware_chain
+    route(ep, 'probe').middlewares.append(extra)
+    assert route(ep, 'probe').middleware_chain is not chain
+
+    assert method_request('probe', {'data': 'one'}) == {'id': 0, 'jsonrpc': '2.0', 'result': 'one'}
+    assert ('extra', 'enter') in calls
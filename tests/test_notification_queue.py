@@ -0,0 +1,201 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import Body
+from starlette.testclient import TestClient
+
+import fastapi_jsonrpc as jsonrpc
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def notification_queue():
+    return jsonrpc.NotificationQueue(maxsize=1)
+
+
+@pytest.fixture
+def ep(ep_path, calls, notification_queue):
+    ep = jsonrpc.Entrypoint(ep_path, notification_queue=notification_queue)
+
+    @ep.method()
+    async def probe(data: int = Body(...)) -> int:
+        await asyncio.sleep(0.2)
+        calls.append((data, jsonrpc.get_jsonrpc_method()))
+        return data
+
+    return ep
+
+
+def notify(app_client, ep_path, data):
+    resp = app_client.post(ep_path, json={'jsonrpc': '2.0', 'method': 'probe', 'params': {'data': data}})
+    assert resp.status_code == 200
+    assert resp.content == b''
+
+
+def test_block(app, ep_path, calls, notification_queue):
+    with TestClient(app) as app_client:
+        for data in range(3):
+            notify(app_client, ep_path, data)
+        assert notification_queue.qsize() <= 1
+    # drained on shutdown
+    assert calls == [(0, 'probe'), (1, 'probe'), (2, 'probe')]
+    assert notification_queue.dropped == 0
+    assert notification_queue.rejected == 0
+
+
+@pytest.mark.parametrize('notification_queue', [jsonrpc.NotificationQueue(maxsize=1, overflow='drop_oldest')])
+def test_drop_oldest(app, ep_path, calls, notification_queue):
+    with TestClient(app) as app_client:
+        for data in range(3):
+            notify(app_client, ep_path, data)
+    assert calls == [(0, 'probe'), (2, 'probe')]
+    assert notification_queue.dropped == 1
+
+
+@pytest.mark.parametrize('notification_queue', [jsonrpc.NotificationQueue(maxsize=1, overflow='reject')])
+def test_reject(app, ep_path, calls, notification_queue):
+    with TestClient(app) as app_client:
+        for data in range(3):
+            notify(app_client, ep_path, data)
+    assert calls == [(0, 'probe'), (1, 'probe')]
+    assert notification_queue.rejected == 1
+
+
+@pytest.mark.parametrize('notification_queue', [jsonrpc.NotificationQueue(maxsize=10, workers=3)])
+def test_workers(app, ep_path, calls, notification_queue):
+    with TestClient(app) as app_client:
+        app_client.post(ep_path, json=[
+            {'jsonrpc': '2.0', 'method': 'probe', 'params': {'data': data}}
+            for data in range(6)
+        ])
+    assert sorted(calls) == [(data, 'probe') for data in range(6)]
+
+
+def test_requests_not_queued(app, app_client, method_request, notification_queue):
+    assert method_request('probe', {'data': 1}) == {'id': 0, 'jsonrpc': '2.0', 'result': 1}
+    assert notification_queue.qsize() == 0
+
+
+def test_store(ep_path, calls, tmp_path, caplog):
+    store = jsonrpc.SqliteNotificationStore(str(tmp_path / 'notifications.sqlite'))
+    asyncio.run(store.add('probe', {'data': 1}))
+    asyncio.run(store.add('unknown', {'data': 2}))
+    asyncio.run(store.add('probe', {'data': 'invalid'}))
+
+    ep = jsonrpc.Entrypoint(ep_path, notification_queue=jsonrpc.NotificationQueue(store=store))
+
+    @ep.method()
+    async def probe(data: int = Body(...)) -> int:
+        calls.append(data)
+        return data
+
+    app = jsonrpc.API()
+    app.bind_entrypoint(ep)
+
+    with TestClient(app) as app_client:
+        app_client.post(ep_path, json={'jsonrpc': '2.0', 'method': 'probe', 'params': {'data': 3}})
+
+    assert calls == [1, 3]
+    assert store.connection is None
+    assert asyncio.run(store.load()) == []
+    assert [r.message for r in caplog.records if 'is dropped' in r.message] == [
+        "Stored notification unknown({'data': 2}) is dropped: Method not found",
+        "Stored notification probe({'data': 'invalid'}) is dropped: Invalid params",
+    ]
+    asyncio.run(store.close())
+
+
+def test_store_keeps_unfinished(ep_path, tmp_path):
+    store = jsonrpc.SqliteNotificationStore(str(tmp_path / 'notifications.sqlite'))
+    ep = jsonrpc.Entrypoint(
+        ep_path,
+        notification_queue=jsonrpc.NotificationQueue(store=store, drain_timeout=0.01),
+    )
+
+    @ep.method()
+    async def probe(data: int = Body(...)) -> int:
+        await asyncio.sleep(10)
+        return data
+
+    app = jsonrpc.API()
+    app.bind_entrypoint(ep)
+
+    with TestClient(app) as app_client:
+        app_client.post(ep_path, json={'jsonrpc': '2.0', 'method': 'probe', 'params': {'data': 1}})
+
+    assert [(method, params) for _, method, params in asyncio.run(store.load())] == [('probe', {'data': 1})]
+    asyncio.run(store.close())
+
+
+def test_invalid_params():
+    with pytest.raises(ValueError):
+        jsonrpc.NotificationQueue(overflow='unknown')
+
+
+def test_put_after_close(app, ep, ep_path, calls, notification_queue):
+    with TestClient(app) as app_client:
+        pass
+    assert notification_queue.closed
+
+    route = ep.method_routes_index['probe']
+    asyncio.run(notification_queue.put(route, {'data': 1}, {'data': 1}))
+    assert notification_queue.rejected == 1
+    assert notification_queue.queue is None
+    assert notification_queue.worker_tasks == []
+    assert calls == []
+
+    # reopened on the next startup
+    with TestClient(app) as app_client:
+        notify(app_client, ep_path, 2)
+    assert calls == [(2, 'probe')]
+
+
+def test_store_off_event_loop(tmp_path, monkeypatch):
+    store = jsonrpc.SqliteNotificationStore(str(tmp_path / 'notifications.sqlite'))
+    threads = []
+    add = store._add
+
+    def recording_add(*args):
+        threads.append(threading.current_thread().name)
+        return add(*args)
+
+    monkeypatch.setattr(store, '_add', recording_add)
+
+    async def main():
+        key = await store.add('probe', {'data': 1})
+        await store.remove(key)
+        return await store.load()
+
+    assert asyncio.run(main()) == []
+    assert threads and threads[0].startswith('jsonrpc-notifications')
+    assert threads[0] != threading.current_thread().name
+    assert store.connection.execute('PRAGMA journal_mode').fetchone() == ('wal',)
+    asyncio.run(store.close())
+
+
+def test_store_reopened_on_restart(ep_path, calls, tmp_path):
+    store = jsonrpc.SqliteNotificationStore(str(tmp_path / 'notifications.sqlite'))
+    ep = jsonrpc.Entrypoint(ep_path, notification_queue=jsonrpc.NotificationQueue(store=store))
+
+    @ep.method()
+    async def probe(data: int = Body(...)) -> int:
+        calls.append(data)
+        return data
+
+    app = jsonrpc.API()
+    app.bind_entrypoint(ep)
+
+    for data in (1, 2):
+        with TestClient(app) as app_client:
+            app_client.post(ep_path, json={'jsonrpc': '2.0', 'method': 'probe', 'params': {'data': data}})
+        assert store.connection is None
+        assert store.executor is None
+
+    assert calls == [1, 2]
+    assert asyncio.run(store.load()) == []
+    asyncio.run(store.close())
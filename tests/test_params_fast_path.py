@@ -0,0 +1,154 @@
+import contextlib
+from typing import List, Optional
+
+import pytest
+from fastapi import Body, Depends, Header
+from pydantic import BaseModel, Field
+
+import fastapi_jsonrpc as jsonrpc
+
+
+class Point(BaseModel):
+    x: int
+    y: int = Field(0, ge=0)
+
+
+@pytest.fixture
+def ep(ep):
+    @ep.method()
+    def plain(
+        a: int = Body(...),
+        b: Optional[str] = Body(None),
+        c: Optional[str] = Body(...),
+        points: List[Point] = Body([]),
+        aliased: int = Body(0, alias='other'),
+    ) -> dict:
+        return {'a': a, 'b': b, 'c': c, 'points': [p.model_dump() for p in points], 'aliased': aliased}
+
+    @ep.method()
+    def whole(point: Point = jsonrpc.Params(...)) -> Point:
+        return point
+
+    @ep.method()
+    def with_header(a: int = Body(...), x_token: str = Header('token')) -> int:
+        return a
+
+    def get_value() -> int:
+        return 1
+
+    @ep.method()
+    def with_depends(a: int = Body(...), value: int = Depends(get_value)) -> int:
+        return a + value
+
+    async def set_x(ctx: jsonrpc.JsonRpcContext, call_next):
+        ctx.request.params['x'] = 42
+        await call_next()
+
+    @ep.method(middlewares=[jsonrpc.CallNextMiddleware(set_x)])
+    def changed_by_middleware(x: int = Body(...)) -> int:
+        return x
+
+    return ep
+
+
+def route(ep, name) -> jsonrpc.MethodRoute:
+    return next(r for r in ep.routes if isinstance(r, jsonrpc.MethodRoute) and r.name == name)
+
+
+def test_fast_path_detection(ep):
+    assert route(ep, 'plain').params_validator is not None
+    assert route(ep, 'plain').request_validator is not None
+    assert route(ep, 'whole').params_validator is not None
+    assert route(ep, 'whole').request_validator is not None
+    assert route(ep, 'with_header').params_validator is None
+    assert route(ep, 'with_header').request_validator is None
+    assert route(ep, 'with_depends').params_validator is None
+    assert route(ep, 'with_depends').request_validator is None
+
+
+@pytest.fixture(params=['request_validator', 'params_validator'])
+def fast_path(request):
+    return request.param
+
+
+@pytest.mark.parametrize('method, params', [
+    ('plain', {'a': 1, 'c': 'c'}),
+    ('plain', {'a': 1, 'b': None, 'c': 'c', 'points': [{'x': 1}], 'other': 5, 'extra': 1}),
+    ('plain', {}),
+    ('plain', {'a': 'x', 'c': None, 'points': [{'y': -1}, 1]}),
+    ('plain', {'a': 1, 'c': 'c', 'aliased': 'x'}),
+    ('whole', {'x': 1, 'y': 2}),
+    ('whole', {}),
+    ('whole', {'x': 'x', 'y': -1}),
+])
+def test_same_as_solve_dependencies(ep, method_request, fast_path, method, params):
+    method_route = route(ep, method)
+    if fast_path == 'params_validator':
+        method_route.request_validator = None
+    fast_resp = method_request(method, params)
+
+    method_route.request_validator = None
+    method_route.params_validator = None
+    slow_resp = method_request(method, params)
+
+    assert fast_resp == slow_resp
+
+
+@pytest.mark.parametrize('req', [
+    {'id': 0, 'jsonrpc': '2.0', 'method': 'plain', 'params': {'a': 'x'}, 'extra': 1},
+    {'id': 0, 'jsonrpc': '1.0', 'method': 'plain', 'params': {'a': 1, 'c': 'c'}},
+    {'id': [], 'jsonrpc': '2.0', 'method': 'plain'},
+    {'id': 0, 'jsonrpc': '2.0', 'method': 'plain', 'params': []},
+    {'id': 0, 'jsonrpc': '2.0', 'method': 'plain', 'params': None},
+    {'id': 0, 'jsonrpc': '2.0', 'method': 'unknown', 'extra': 1},
+    {'id': 0, 'jsonrpc': '2.0', 'method': 1},
+    {'id': '0', 'jsonrpc': '2.0', 'method': 'whole', 'params': {'x': 1}},
+])
+def test_envelope_same_as_solve_dependencies(ep, json_request, add_path_postfix, req):
+    path_postfix = '/plain' if add_path_postfix else ''
+    fast_resp = json_request(req, path_postfix=path_postfix)
+
+    for method_route in ep.routes:
+        if isinstance(method_route, jsonrpc.MethodRoute):
+            method_route.request_validator = None
+            method_route.params_validator = None
+    slow_resp = json_request(req, path_postfix=path_postfix)
+
+    assert fast_resp == slow_resp
+
+
+def test_params_changed_by_method_middleware(method_request):
+    assert method_request('changed_by_middleware', {'x': 1}) == {'id': 0, 'jsonrpc': '2.0', 'result': 42}
+
+
+def test_params_changed_by_entrypoint_middleware(ep, method_request):
+    @contextlib.asynccontextmanager
+    async def set_a(ctx: jsonrpc.JsonRpcContext):
+        ctx.request.params['a'] = 42
+        yield
+
+    ep.middlewares.append(set_a)
+    resp = method_request('plain', {'a': 1, 'c': 'c'})
+    assert resp['result']['a'] == 42
+
+
+def test_invalid_params_seen_by_entrypoint_middleware(ep, method_request):
+    seen = []
+
+    @contextlib.asynccontextmanager
+    async def record(ctx: jsonrpc.JsonRpcContext):
+        try:
+            yield
+        finally:
+            seen.append(ctx.request.params)
+
+    ep.middlewares.append(record)
+    resp = method_request('plain', {'a': 'x', 'c': 'c'})
+    assert resp['error']['code'] == -32602
+    assert seen == [{'a': 'x', 'c': 'c'}]
+
+
+def test_too_deep_json__parse_error(raw_request, add_path_postfix):
+    path_postfix = '/plain' if add_path_postfix else ''
+    resp = raw_request('[' * 100000 + ']' * 100000, path_postfix=path_postfix)
+    assert resp.json() == {'id': None, 'jsonrpc': '2.0', 'error': {'code': -32700, 'message': 'Parse error'}}
@@ -0,0 +1,97 @@
+import os
+
+import pytest
+from fastapi import Body, Depends
+from pydantic import BaseModel
+from starlette.testclient import TestClient
+
+import fastapi_jsonrpc as jsonrpc
+
+
+class Point(BaseModel):
+    x: int
+    y: int
+
+
+class Distance(BaseModel):
+    value: int
+    pid: int
+
+
+def manhattan(a: Point = Body(...), b: Point = Body(...)) -> Distance:
+    return Distance(value=abs(a.x - b.x) + abs(a.y - b.y), pid=os.getpid())
+
+
+def pid() -> int:
+    return os.getpid()
+
+
+def fail() -> int:
+    raise ValueError('in worker')
+
+
+@pytest.fixture
+def process_pool():
+    return jsonrpc.ProcessPool(max_workers=1, recycle_after=2)
+
+
+@pytest.fixture
+def ep(ep_path, process_pool):
+    ep = jsonrpc.Entrypoint(ep_path, process_pool=process_pool)
+    ep.add_method_route(manhattan, executor='process')
+    ep.add_method_route(pid, executor='process')
+    ep.add_method_route(fail, executor='process')
+    return ep
+
+
+def test_params_and_result(app_client, method_request):
+    resp = method_request('manhattan', {'a': {'x': 1, 'y': 2}, 'b': {'x': 4, 'y': 0}})
+    assert resp == {'id': 0, 'jsonrpc': '2.0', 'result': {'value': 5, 'pid': resp['result']['pid']}}
+    assert resp['result']['pid'] != os.getpid()
+
+
+def test_invalid_params(app_client, method_request):
+    resp = method_request('manhattan', {'a': {'x': 1, 'y': 2}})
+    assert resp['error']['code'] == -32602
+
+
+def test_warm_up_and_shutdown(app, process_pool):
+    with TestClient(app):
+        assert len(process_pool.executor._processes) == 1
+    assert process_pool.executor is None
+
+
+def test_recycle(app_client, method_request):
+    pids = [method_request('pid', {})['result'] for _ in range(3)]
+    assert pids[0] == pids[1]
+    assert pids[1] != pids[2]
+
+
+def test_error(app_client, method_request, assert_log_errors):
+    assert method_request('fail', {}) == {
+        'id': 0, 'jsonrpc': '2.0', 'error': {'code': -32603, 'message': 'Internal error'},
+    }
+    assert_log_errors('in worker', pytest.raises(ValueError))
+
+
+def test_default_pool(ep_path):
+    ep = jsonrpc.Entrypoint(ep_path)
+    ep.add_method_route(pid, executor='process')
+    assert isinstance(ep.process_pool, jsonrpc.ProcessPool)
+
+
+def test_not_params_only(ep_path):
+    ep = jsonrpc.Entrypoint(ep_path)
+
+    def with_dependency(value: int = Depends(pid)) -> int:
+        return value
+
+    async def coroutine() -> int:
+        return 1
+
+    with pytest.raises(RuntimeError):
+        ep.add_method_route(with_dependency, executor='process')
+    with pytest.raises(RuntimeError):
+        ep.add_method_route(coroutine, executor='process')
+    with pytest.raises(TypeError):
+        jsonrpc.Entrypoint(ep_path, executor='process')
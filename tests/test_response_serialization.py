@@ -0,0 +1,74 @@
+import contextlib
+from typing import List
+
+import pytest
+from fastapi import Body
+from fastapi.exceptions import ResponseValidationError
+from pydantic import BaseModel
+
+import fastapi_jsonrpc as jsonrpc
+
+
+class Item(BaseModel):
+    name: str
+    tags: List[str] = []
+
+
+@pytest.fixture
+def ep(ep):
+    @ep.method()
+    def get_item(name: str = Body(...)) -> Item:
+        return Item(name=name)
+
+    @ep.method()
+    def get_bad_item() -> Item:
+        return {'tags': 'not-a-list'}  # type: ignore[return-value]
+
+    return ep
+
+
+def test_single_pass_bytes(raw_request):
+    resp = raw_request('{"id": "a", "jsonrpc": "2.0", "method": "get_item", "params": {"name": "x"}}')
+    assert resp.content == b'{"jsonrpc":"2.0","result":{"name":"x","tags":[]},"id":"a"}'
+
+
+def test_batch_bytes(raw_request):
+    resp = raw_request(
+        '[{"id": 1, "jsonrpc": "2.0", "method": "get_item", "params": {"name": "x"}},'
+        ' {"id": 2, "jsonrpc": "2.0", "method": "unknown"}]'
+    )
+    assert resp.json() == [
+        {'id': 1, 'jsonrpc': '2.0', 'result': {'name': 'x', 'tags': []}},
+        {'id': 2, 'jsonrpc': '2.0', 'error': {'code': -32601, 'message': 'Method not found'}},
+    ]
+
+
+def test_invalid_result(json_request, assert_log_errors):
+    resp = json_request({'id': 1, 'jsonrpc': '2.0', 'method': 'get_bad_item', 'params': {}})
+    assert resp == {'id': 1, 'jsonrpc': '2.0', 'error': {'code': -32603, 'message': 'Internal error'}}
+    assert_log_errors(
+        "2 validation errors:\n"
+        "  {'type': 'missing', 'loc': ('response', 'result', 'name'), 'msg': 'Field required', "
+        "'input': {'tags': 'not-a-list'}}\n"
+        "  {'type': 'list_type', 'loc': ('response', 'result', 'tags'), 'msg': 'Input should be a valid list', "
+        "'input': 'not-a-list'}",
+        pytest.raises(ResponseValidationError),
+    )
+
+
+def test_raw_response_lazy(ep_path, app, app_client):
+    seen = []
+
+    @contextlib.asynccontextmanager
+    async def middleware(ctx: jsonrpc.JsonRpcContext):
+        yield
+        seen.append(ctx.raw_response)
+        ctx.raw_response['result']['name'] = 'patched'
+
+    ep = app.routes[-1].entrypoint
+    ep.middlewares.append(middleware)
+
+    resp = app_client.post(ep_path, json={'id': 1, 'jsonrpc': '2.0', 'method': 'get_item', 'params': {'name': 'x'}})
+
+    assert seen == [{'jsonrpc': '2.0', 'result': {'name': 'patched', 'tags': []}, 'id': 1}]
+    assert resp.json() == {'jsonrpc': '2.0', 'result': {'name': 'patched', 'tags': []}, 'id': 1}
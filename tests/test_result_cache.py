@@ -0,0 +1,239 @@
+import json
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+import pytest
+from fastapi import Body, Depends, Header
+from pydantic import BaseModel, field_serializer
+from starlette.testclient import TestClient
+
+import fastapi_jsonrpc as jsonrpc
+
+
+class FakeSharedBackend(jsonrpc.CacheBackend):
+    """Stands for a store shared by workers, e.g. Redis"""
+
+    def __init__(self):
+        self.storage: Dict[str, Tuple[Optional[float], bytes]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        item = self.storage.get(key)
+        if item is None or (item[0] is not None and item[0] <= time.monotonic()):
+            return None
+        return item[1]
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        self.storage[key] = (time.monotonic() + ttl if ttl is not None else None, value)
+
+
+class Result(BaseModel):
+    total: int
+
+    @field_serializer('total')
+    def count_serialization(self, total: int) -> int:
+        serializations['total'] += 1
+        return total
+
+
+serializations = Counter()
+
+
+def get_tenant(x_tenant: str = Header('default')) -> str:
+    return x_tenant
+
+
+@pytest.fixture
+def calls():
+    serializations.clear()
+    return Counter()
+
+
+def add_methods(ep, calls, backend=None):
+    @ep.method(cache=True)
+    def add(a: int = Body(...), b: int = Body(...)) -> Result:
+        calls['add'] += 1
+        return Result(total=a + b)
+
+    @ep.method(cache=jsonrpc.ResultCache(ttl=0.05))
+    def short_lived(a: int = Body(...)) -> int:
+        calls['short_lived'] += 1
+        return a
+
+    @ep.method(cache=jsonrpc.ResultCache(maxsize=2))
+    def small(a: int = Body(...)) -> int:
+        calls['small'] += 1
+        return a
+
+    @ep.method(cache=jsonrpc.ResultCache(key_dependencies=['tenant']))
+    def tenant_value(a: int = Body(...), tenant: str = Depends(get_tenant)) -> str:
+        calls['tenant_value'] += 1
+        return f'{tenant}-{a}'
+
+    @ep.method(cache=jsonrpc.ResultCache(backend=backend or FakeSharedBackend()))
+    def shared(a: int = Body(...)) -> int:
+        calls['shared'] += 1
+        return a
+
+    @ep.method(cache=True, response_model_exclude={'result': {'hidden'}})
+    def with_exclude(a: int = Body(...)) -> dict:
+        calls['with_exclude'] += 1
+        return {'a': a, 'hidden': 'secret'}
+
+
+@pytest.fixture
+def ep(ep_path, calls):
+    ep = jsonrpc.Entrypoint(ep_path)
+    add_methods(ep, calls)
+    return ep
+
+
+def test_hit(method_request, calls):
+    assert method_request('add', {'a': 1, 'b': 2}) == {'id': 0, 'jsonrpc': '2.0', 'result': {'total': 3}}
+    assert method_request('add', {'b': 2, 'a': 1}) == {'id': 0, 'jsonrpc': '2.0', 'result': {'total': 3}}
+    assert calls['add'] == 1
+    # hits are not serialized again
+    assert serializations['total'] == 1
+
+    assert method_request('add', {'a': 2, 'b': 2}) == {'id': 0, 'jsonrpc': '2.0', 'result': {'total': 4}}
+    assert calls['add'] == 2
+
+
+def test_batch_ids(json_request, calls):
+    resp = json_request([
+        {'id': 1, 'jsonrpc': '2.0', 'method': 'add', 'params': {'a': 1, 'b': 2}},
+        {'id': 'two', 'jsonrpc': '2.0', 'method': 'add', 'params': {'a': 1, 'b': 2}},
+    ])
+    assert resp == [
+        {'id': 1, 'jsonrpc': '2.0', 'result': {'total': 3}},
+        {'id': 'two', 'jsonrpc': '2.0', 'result': {'total': 3}},
+    ]
+
+
+def test_ttl(method_request, calls):
+    method_request('short_lived', {'a': 1})
+    method_request('short_lived', {'a': 1})
+    assert calls['short_lived'] == 1
+    time.sleep(0.06)
+    assert method_request('short_lived', {'a': 1}) == {'id': 0, 'jsonrpc': '2.0', 'result': 1}
+    assert calls['short_lived'] == 2
+
+
+def test_lru(method_request, calls):
+    for a in (1, 2, 1, 3):
+        method_request('small', {'a': a})
+    assert calls['small'] == 3
+    # 2 is least recently used and evicted
+    method_request('small', {'a': 1})
+    assert calls['small'] == 3
+    method_request('small', {'a': 2})
+    assert calls['small'] == 4
+
+
+def test_key_dependencies(ep_path, app_client, calls):
+    def call(tenant):
+        return app_client.post(ep_path, json={
+            'id': 1, 'jsonrpc': '2.0', 'method': 'tenant_value', 'params': {'a': 1},
+        }, headers={'X-Tenant': tenant}).json()['result']
+
+    assert call('one') == 'one-1'
+    assert call('two') == 'two-1'
+    assert call('one') == 'one-1'
+    assert calls['tenant_value'] == 2
+
+
+def test_not_fast_path(method_request, calls):
+    assert method_request('with_exclude', {'a': 1}) == {'id': 0, 'jsonrpc': '2.0', 'result': {'a': 1}}
+    assert method_request('with_exclude', {'a': 1}) == {'id': 0, 'jsonrpc': '2.0', 'result': {'a': 1}}
+    assert calls['with_exclude'] == 1
+
+
+@pytest.mark.parametrize('method', ['add', 'with_exclude'])
+def test_hit_raw_body(ep_path, app_client, calls, method):
+    for _ in range(2):
+        resp = app_client.post(ep_path, json={
+            'id': 7, 'jsonrpc': '2.0', 'method': method, 'params': {'a': 1, 'b': 2},
+        })
+    assert calls[method] == 1
+    pairs = json.loads(resp.content, object_pairs_hook=list)
+    assert [key for key, _ in pairs].count('id') == 1
+    assert dict(pairs)['id'] == 7
+
+
+def test_shared_backend(ep_path, calls):
+    backend = FakeSharedBackend()
+    for _ in range(2):
+        ep = jsonrpc.Entrypoint(ep_path)
+        add_methods(ep, calls, backend=backend)
+        app = jsonrpc.API()
+        app.bind_entrypoint(ep)
+        with TestClient(app) as client:
+            resp = client.post(ep_path, json={'id': 1, 'jsonrpc': '2.0', 'method': 'shared', 'params': {'a': 5}})
+        assert resp.json() == {'id': 1, 'jsonrpc': '2.0', 'result': 5}
+    assert calls['shared'] == 1
+
+
+def test_errors_not_cached(ep_path, calls):
+    ep = jsonrpc.Entrypoint(ep_path)
+
+    @ep.method(cache=True)
+    def fail(a: int = Body(...)) -> int:
+        calls['fail'] += 1
+        raise jsonrpc.InvalidParams()
+
+    app = jsonrpc.API()
+    app.bind_entrypoint(ep)
+    with TestClient(app) as client:
+        for _ in range(2):
+            client.post(ep_path, json={'id': 1, 'jsonrpc': '2.0', 'method': 'fail', 'params': {'a': 5}})
+    assert calls['fail'] == 2
+
+
+def test_unknown_key_dependency(ep_path):
+    ep = jsonrpc.Entrypoint(ep_path)
+    with pytest.raises(RuntimeError):
+        @ep.method(cache=jsonrpc.ResultCache(key_dependencies=['tenant']))
+        def probe(a: int = Body(...)) -> int:
+            return a
+
+
+def get_scale(scale: int = Body(1)) -> int:
+    return scale
+
+
+def test_dependencies_require_key(ep_path):
+    ep = jsonrpc.Entrypoint(ep_path)
+
+    with pytest.raises(RuntimeError):
+        @ep.method(cache=True)
+        def by_tenant(a: int = Body(...), tenant: str = Depends(get_tenant)) -> str:
+            return tenant
+
+    common_ep = jsonrpc.Entrypoint(ep_path, common_dependencies=[Depends(get_tenant)])
+    with pytest.raises(RuntimeError):
+        @common_ep.method(cache=True)
+        def by_common_tenant(a: int = Body(...)) -> int:
+            return a
+
+    @ep.method(cache=jsonrpc.ResultCache(key_dependencies=[]))
+    def tenant_ignored(a: int = Body(...), tenant: str = Depends(get_tenant)) -> int:
+        return a
+
+
+def test_dependency_params(ep_path, calls):
+    ep = jsonrpc.Entrypoint(ep_path)
+
+    @ep.method(cache=jsonrpc.ResultCache(key_dependencies=['s']))
+    def scaled(a: int = Body(...), s: int = Depends(get_scale)) -> int:
+        calls['scaled'] += 1
+        return a * s
+
+    app = jsonrpc.API()
+    app.bind_entrypoint(ep)
+    with TestClient(app) as client:
+        results = [
+            client.post(ep_path, json={'id': 1, 'jsonrpc': '2.0', 'method': 'scaled', 'params': params}).json()
+            for params in [{'a': 2, 'scale': 3}, {'a': 2, 'scale': 3}, {'a': 2, 'scale': 4}]
+        ]
+    assert [resp['result'] for resp in results] == [6, 6, 8]
+    assert calls['scaled'] == 2
@@ -0,0 +1,63 @@
+import pytest
+from fastapi import Body, Depends
+
+import fastapi_jsonrpc as jsonrpc
+
+
+def get_value() -> str:
+    return 'original'
+
+
+def get_override_value() -> str:
+    return 'override'
+
+
+@pytest.fixture
+def ep(ep):
+    @ep.method()
+    def probe(value: str = Depends(get_value)) -> str:
+        return value
+
+    @ep.method()
+    async def async_probe(data: str = Body(...)) -> str:
+        return data
+
+    return ep
+
+
+def route(ep, name) -> jsonrpc.MethodRoute:
+    return next(r for r in ep.routes if isinstance(r, jsonrpc.MethodRoute) and r.name == name)
+
+
+def test_dependency_overrides_tracked(app):
+    assert isinstance(app.dependency_overrides, jsonrpc.DependencyOverrides)
+    version = app.dependency_overrides.version
+    app.dependency_overrides[get_value] = get_override_value
+    assert app.dependency_overrides.version > version
+
+    app.dependency_overrides = {get_value: get_value}
+    assert isinstance(app.dependency_overrides, jsonrpc.DependencyOverrides)
+
+
+def test_plan_reused(ep, app, method_request):
+    assert method_request('probe', {}) == {'id': 0, 'jsonrpc': '2.0', 'result': 'original'}
+    plan = route(ep, 'probe').plan
+    assert plan.solve_dependency_overrides_provider is None
+    assert not plan.is_coroutine
+    assert route(ep, 'async_probe').plan.is_coroutine
+
+    assert method_request('probe', {}) == {'id': 0, 'jsonrpc': '2.0', 'result': 'original'}
+    assert route(ep, 'probe').plan is plan
+
+
+def test_plan_invalidated_by_overrides(ep, app, method_request):
+    assert method_request('probe', {}) == {'id': 0, 'jsonrpc': '2.0', 'result': 'original'}
+    plan = route(ep, 'probe').plan
+
+    app.dependency_overrides[get_value] = get_override_value
+    assert method_request('probe', {}) == {'id': 0, 'jsonrpc': '2.0', 'result': 'override'}
+    assert route(ep, 'probe').plan is not plan
+    assert route(ep, 'probe').plan.solve_dependency_overrides_provider is app
+
+    app.dependency_overrides.clear()
+    assert method_request('probe', {}) == {'id': 0, 'jsonrpc': '2.0', 'result': 'original'}
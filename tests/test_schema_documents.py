@@ -0,0 +1,114 @@
+import gzip
+import json
+
+import pytest
+from fastapi import Body
+from starlette.testclient import TestClient
+
+import fastapi_jsonrpc as jsonrpc
+
+
+@pytest.fixture
+def ep(ep):
+    @ep.method()
+    def probe(data: str = Body(...)) -> str:
+        return data
+
+    return ep
+
+
+@pytest.mark.parametrize('url', ['/openapi.json', '/openrpc.json'])
+def test_not_modified(app_client, url):
+    resp = app_client.get(url, headers={'Accept-Encoding': 'identity'})
+    assert resp.status_code == 200
+    etag = resp.headers['ETag']
+    assert 'Content-Encoding' not in resp.headers
+
+    resp = app_client.get(url, headers={'Accept-Encoding': 'identity', 'If-None-Match': etag})
+    assert resp.status_code == 304
+    assert resp.headers['ETag'] == etag
+    assert resp.content == b''
+
+    resp = app_client.get(url, headers={'Accept-Encoding': 'identity', 'If-None-Match': '"other"'})
+    assert resp.status_code == 200
+
+
+@pytest.mark.parametrize('url', ['/openapi.json', '/openrpc.json'])
+def test_gzip(app, app_client, url):
+    resp = app_client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert resp.headers['Content-Encoding'] == 'gzip'
+    assert resp.headers['Vary'] == 'Accept-Encoding'
+    # decoded by the client
+    expected = app.openapi() if url == '/openapi.json' else app.openrpc()
+    assert resp.json() == expected
+
+    gzip_etag = resp.headers['ETag']
+    identity_etag = app_client.get(url, headers={'Accept-Encoding': 'identity'}).headers['ETag']
+    assert gzip_etag != identity_etag
+
+
+def test_gzip_refused(app_client):
+    resp = app_client.get('/openrpc.json', headers={'Accept-Encoding': 'gzip;q=0'})
+    assert 'Content-Encoding' not in resp.headers
+
+
+def test_brotli(app_client):
+    brotli = pytest.importorskip('brotli')
+    resp = app_client.get('/openrpc.json', headers={'Accept-Encoding': 'gzip, br'})
+    assert resp.headers['Content-Encoding'] == 'br'
+    del brotli
+
+
+def test_generated_once(app, app_client, monkeypatch):
+    app_client.get('/openapi.json')
+    app_client.get('/openrpc.json')
+
+    def fail(*args, **kwargs):
+        raise AssertionError('regenerated')
+
+    monkeypatch.setattr(app, '_restore_json_schema_fine_component_names', fail)
+    monkeypatch.setattr(app, 'get_openrpc', fail)
+    monkeypatch.setattr(jsonrpc.SchemaDocument, '__init__', fail)
+
+    assert app_client.get('/openapi.json').status_code == 200
+    assert app_client.get('/openrpc.json').status_code == 200
+    assert app.openapi() is app.openapi()
+
+
+def test_reset(app, app_client, ep):
+    etag = app_client.get('/openrpc.json').headers['ETag']
+
+    @ep.method()
+    def probe2() -> str:
+        return 'probe2'
+
+    app.bind_entrypoint(ep)
+    app.openrpc_schema = None
+    app.openapi_schema = None
+
+    resp = app_client.get('/openrpc.json')
+    assert resp.headers['ETag'] != etag
+    assert 'probe2' in {m['name'] for m in resp.json()['methods']}
+    assert '/api/v1/jsonrpc/probe2' in app_client.get('/openapi.json').json()['paths']
+
+
+def test_root_path(app):
+    with TestClient(app, root_path='/prefix') as client:
+        resp = client.get('/openapi.json')
+    assert resp.json()['servers'] == [{'url': '/prefix'}]
+    assert 'servers' not in app.openapi()
+
+
+def test_body(app, app_client):
+    resp = app_client.get('/openrpc.json', headers={'Accept-Encoding': 'gzip'})
+    document = app.openrpc_document()
+    assert gzip.decompress(document.bodies['gzip']) == document.bodies['identity']
+    assert json.loads(document.bodies['identity']) == resp.json()
+
+
+def test_prebuild(ep):
+    app = jsonrpc.API(prebuild_schemas=True)
+    app.bind_entrypoint(ep)
+    with TestClient(app):
+        assert app.openrpc_schema is not None
+        assert app.openapi_schema is not None
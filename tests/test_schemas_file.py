@@ -0,0 +1,169 @@
+import json
+import logging
+import sys
+
+import pytest
+from fastapi import Body
+from fastapi.openapi.utils import get_openapi
+from pydantic import BaseModel
+from starlette.testclient import TestClient
+
+import fastapi_jsonrpc as jsonrpc
+from fastapi_jsonrpc.__main__ import main
+
+
+class LazyError(jsonrpc.BaseError):
+    CODE = 5001
+    MESSAGE = 'Lazy error'
+
+    class DataModel(BaseModel):
+        details: str
+
+
+def make_app(ep_path, **kwargs):
+    ep = jsonrpc.Entrypoint(ep_path)
+
+    @ep.method(errors=[LazyError])
+    def probe(data: str = Body(...)) -> str:
+        if data == 'fail':
+            raise LazyError(data={'details': 'lazy'})
+        return data
+
+    app = jsonrpc.API(**kwargs)
+    app.bind_entrypoint(ep)
+    return app
+
+
+@pytest.fixture
+def schemas_file(tmp_path):
+    return str(tmp_path / 'schemas.json')
+
+
+def test_error_models_built_for_openapi(ep_path):
+    LazyError.resp_model = None
+    app = make_app(ep_path)
+    assert LazyError.resp_model is None
+
+    responses = app.openapi()['paths'][ep_path + '/probe']['post']['responses']
+    assert LazyError.resp_model is not None
+    assert any(r['description'].startswith('[5001] Lazy error') for r in responses.values())
+
+
+def test_error_models_built_for_get_openapi(ep_path):
+    LazyError.resp_model = None
+    app = make_app(ep_path)
+
+    schema = get_openapi(title='test', version='1.0', routes=app.routes)
+    responses = schema['paths'][ep_path + '/probe']['post']['responses']
+    assert LazyError.resp_model is not None
+    assert any(r['description'].startswith('[5001] Lazy error') for r in responses.values())
+    assert any('content' in r for r in responses.values() if r['description'].startswith('[5001]'))
+
+
+def test_error_raised_without_docs(ep_path):
+    app = make_app(ep_path)
+    with TestClient(app) as client:
+        resp = client.post(ep_path, json={'id': 1, 'jsonrpc': '2.0', 'method': 'probe', 'params': {'data': 'fail'}})
+    assert resp.json()['error'] == {'code': 5001, 'message': 'Lazy error', 'data': {'details': 'lazy'}}
+
+
+def test_save_and_load(ep_path, schemas_file, monkeypatch):
+    app = make_app(ep_path, schemas_file=schemas_file)
+    app.save_schemas()
+    with open(schemas_file) as f:
+        saved = json.load(f)
+    assert saved == {'fingerprint': app.schemas_fingerprint(), 'openapi': app.openapi(), 'openrpc': app.openrpc()}
+
+    loaded_app = make_app(ep_path, schemas_file=schemas_file)
+
+    def fail(*args, **kwargs):
+        raise AssertionError('generated')
+
+    monkeypatch.setattr(jsonrpc, 'build_errors_responses', fail)
+    monkeypatch.setattr(loaded_app, 'get_openrpc', fail)
+
+    with TestClient(loaded_app) as client:
+        assert client.get('/openapi.json').json() == saved['openapi']
+        assert client.get('/openrpc.json').json() == saved['openrpc']
+
+
+def test_missing_file(ep_path, schemas_file):
+    app = make_app(ep_path, schemas_file=schemas_file)
+    assert ep_path + '/probe' in app.openapi()['paths']
+
+
+def test_invalid_file(ep_path, schemas_file, caplog):
+    with open(schemas_file, 'w') as f:
+        f.write('{not json')
+    app = make_app(ep_path, schemas_file=schemas_file)
+    assert app.openrpc()['methods'][0]['name'] == 'probe'
+    assert 'Invalid schemas file' in caplog.text
+
+
+def test_save_without_path(ep_path):
+    with pytest.raises(ValueError):
+        make_app(ep_path).save_schemas()
+
+
+def test_fingerprint(ep_path):
+    assert make_app(ep_path).schemas_fingerprint() == make_app(ep_path).schemas_fingerprint()
+    assert make_app(ep_path).schemas_fingerprint() != make_app(ep_path, version='2.0.0').schemas_fingerprint()
+
+    app = make_app(ep_path)
+    fingerprint = app.schemas_fingerprint()
+    ep = jsonrpc.Entrypoint(ep_path)
+
+    @ep.method()
+    def other() -> int:
+        return 1
+
+    app.bind_entrypoint(ep)
+    assert app.schemas_fingerprint() != fingerprint
+
+
+def test_outdated_file(ep_path, schemas_file, caplog):
+    caplog.set_level(logging.INFO)
+    make_app(ep_path, schemas_file=schemas_file).save_schemas()
+
+    app = make_app(ep_path, schemas_file=schemas_file, version='2.0.0')
+    assert app.openapi()['info']['version'] == '2.0.0'
+    assert 'is outdated' in caplog.text
+
+
+cli_app = make_app('/api/v1/jsonrpc')
+
+
+def test_cli(schemas_file, capsys):
+    main(['build-schemas', f'{__name__}:cli_app', '--output', schemas_file])
+    assert schemas_file in capsys.readouterr().out
+
+    app = make_app('/api/v1/jsonrpc', schemas_file=schemas_file)
+    assert app.load_schemas()['openrpc'] == cli_app.openrpc()
+
+
+def test_cli_no_output(capsys):
+    with pytest.raises(SystemExit):
+        main(['build-schemas', f'{__name__}:cli_app'])
+    assert 'schemas_file' in capsys.readouterr().err
+
+
+def test_fingerprint_annotation_types(ep_path, tmp_path, monkeypatch):
+    module = tmp_path / 'fingerprint_types.py'
+    module.write_text('import enum\n\n\nclass Color(enum.Enum):\n    red = "red"\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    from fingerprint_types import Color
+    # removed from sys.modules on teardown
+    monkeypatch.setitem(sys.modules, 'fingerprint_types', sys.modules['fingerprint_types'])
+
+    ep = jsonrpc.Entrypoint(ep_path)
+
+    @ep.method()
+    def paint(color: Color = Body(...)) -> str:
+        return color.value
+
+    app = jsonrpc.API()
+    app.bind_entrypoint(ep)
+    fingerprint = app.schemas_fingerprint()
+
+    module.write_text('import enum\n\n\nclass Color(enum.Enum):\n    red = "red"\n    green = "green"\n')
+    assert app.schemas_fingerprint() != fingerprint
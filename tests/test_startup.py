@@ -0,0 +1,60 @@
+import pydantic
+import pytest
+from fastapi import Body
+
+import fastapi_jsonrpc as jsonrpc
+
+
+@pytest.fixture
+def ep(ep):
+    @ep.method()
+    def probe(data: str = Body(...)) -> str:
+        return data
+
+    @ep.method()
+    def other(value: int = Body(...)) -> int:
+        return value
+
+    return ep
+
+
+def route(ep, name):
+    return ep.method_routes_index[name]
+
+
+def test_request_envelope_built_on_first_call(ep, method_request):
+    assert route(ep, 'probe')._request_validator_pending
+    assert method_request('probe', {'data': 'one'}) == {'id': 0, 'jsonrpc': '2.0', 'result': 'one'}
+    assert not route(ep, 'probe')._request_validator_pending
+    assert route(ep, 'probe')._request_validator is not None
+    assert route(ep, 'other')._request_validator_pending
+
+
+def test_models_created_once(ep_path, monkeypatch):
+    created = []
+    create_model = pydantic.create_model
+
+    def counting_create_model(name, *args, **kwargs):
+        created.append(name)
+        return create_model(name, *args, **kwargs)
+
+    monkeypatch.setattr(jsonrpc, 'create_model', counting_create_model)
+
+    ep = jsonrpc.Entrypoint(ep_path)
+
+    @ep.method()
+    def probe(data: str = Body(...)) -> str:
+        return data
+
+    assert sorted(created) == ['_Params[probe]', '_Request[probe]', '_Response[probe]']
+
+
+def test_startup_report(ep):
+    assert set(ep.method_build_times) == {'probe', 'other'}
+    assert all(seconds > 0 for seconds in ep.method_build_times.values())
+
+    report = ep.startup_report().splitlines()
+    assert report[0].startswith('/api/v1/jsonrpc: 2 methods built in ')
+    assert sorted(line.split()[-1] for line in report[1:]) == ['other', 'probe']
+
+    assert len(ep.startup_report(limit=1).splitlines()) == 2
@@ -0,0 +1,89 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import anyio
+import pytest
+from fastapi import Body
+
+import fastapi_jsonrpc as jsonrpc
+
+
+def square(value: int = Body(...)) -> int:
+    return value * value
+
+
+@pytest.fixture
+def thread_pool():
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='method-pool')
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def ep_thread_pool():
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='entrypoint-pool')
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def process_pool():
+    executor = ProcessPoolExecutor(max_workers=1)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def limiter():
+    return anyio.CapacityLimiter(1)
+
+
+@pytest.fixture
+def ep(ep_path, thread_pool, ep_thread_pool, process_pool, limiter):
+    ep = jsonrpc.Entrypoint(ep_path, executor=ep_thread_pool)
+
+    @ep.method(executor=thread_pool)
+    def method_pool() -> str:
+        assert jsonrpc.get_jsonrpc_method() == 'method_pool'
+        return threading.current_thread().name.split('_')[0]
+
+    @ep.method()
+    def entrypoint_pool() -> str:
+        return threading.current_thread().name.split('_')[0]
+
+    @ep.method(executor=limiter)
+    def limited() -> int:
+        return limiter.borrowed_tokens
+
+    @ep.method(executor=limiter)
+    async def coroutine() -> int:
+        return limiter.borrowed_tokens
+
+    ep.add_method_route(square, executor=process_pool)
+
+    return ep
+
+
+def test_method_executor(method_request):
+    assert method_request('method_pool', {}) == {'id': 0, 'jsonrpc': '2.0', 'result': 'method-pool'}
+
+
+def test_entrypoint_executor(method_request):
+    assert method_request('entrypoint_pool', {}) == {'id': 0, 'jsonrpc': '2.0', 'result': 'entrypoint-pool'}
+
+
+def test_limiter(method_request):
+    assert method_request('limited', {}) == {'id': 0, 'jsonrpc': '2.0', 'result': 1}
+
+
+def test_coroutine_not_affected(method_request):
+    assert method_request('coroutine', {}) == {'id': 0, 'jsonrpc': '2.0', 'result': 0}
+
+
+def test_process_pool(method_request):
+    assert method_request('square', {'value': 3}) == {'id': 0, 'jsonrpc': '2.0', 'result': 9}
+
+
+def test_invalid_executor(ep_path):
+    with pytest.raises(TypeError):
+        jsonrpc.Entrypoint(ep_path, executor=object())
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+from fastapi import Body, Depends
+
+import fastapi_jsonrpc as jsonrpc
+
+
+@pytest.fixture
+def cleanups():
+    return []
+
+
+@pytest.fixture
+def ep(ep_path, cleanups):
+    ep = jsonrpc.Entrypoint(ep_path, method_timeout=0.5, timeout_header='X-Timeout')
+
+    async def resource():
+        try:
+            yield 'resource'
+        finally:
+            cleanups.append('resource')
+
+    async def slow_dependency() -> str:
+        await asyncio.sleep(1)
+        return 'slow'
+
+    @ep.method(timeout=0.05)
+    async def sleep(delay: float = Body(...), res: str = Depends(resource)) -> float:
+        await asyncio.sleep(delay)
+        return delay
+
+    @ep.method()
+    async def sleep_default(delay: float = Body(...)) -> float:
+        await asyncio.sleep(delay)
+        cleanups.append('sleep_default')
+        return delay
+
+    @ep.method()
+    async def slow_deps(value: str = Depends(slow_dependency)) -> str:
+        return value
+
+    @ep.method()
+    def deadline() -> bool:
+        return jsonrpc.get_jsonrpc_context().deadline is not None
+
+    @ep.method()
+    async def own_timeout() -> str:
+        await asyncio.wait_for(asyncio.sleep(1), 0.01)
+        return 'unreachable'
+
+    return ep
+
+
+TIMEOUT_ERROR = {'code': -32002, 'message': 'Request timeout'}
+
+
+def test_in_time(method_request):
+    assert method_request('sleep', {'delay': 0}) == {'id': 0, 'jsonrpc': '2.0', 'result': 0}
+
+
+def test_method_timeout(json_request, cleanups):
+    assert json_request([
+        {'id': 1, 'jsonrpc': '2.0', 'method': 'sleep', 'params': {'delay': 1}},
+        {'id': 2, 'jsonrpc': '2.0', 'method': 'sleep_default', 'params': {'delay': 0.3}},
+    ]) == [
+        {'id': 1, 'jsonrpc': '2.0', 'error': TIMEOUT_ERROR},
+        {'id': 2, 'jsonrpc': '2.0', 'result': 0.3},
+    ]
+    # released on timeout, not when the whole batch is done
+    assert cleanups == ['resource', 'sleep_default']
+
+
+def test_entrypoint_timeout(method_request):
+    assert method_request('sleep_default', {'delay': 0.1}) == {'id': 0, 'jsonrpc': '2.0', 'result': 0.1}
+    assert method_request('sleep_default', {'delay': 1}) == {'id': 0, 'jsonrpc': '2.0', 'error': TIMEOUT_ERROR}
+
+
+def test_dependencies_timeout(method_request):
+    assert method_request('slow_deps', {}) == {'id': 0, 'jsonrpc': '2.0', 'error': TIMEOUT_ERROR}
+
+
+def test_timeout_header(ep_path, app_client):
+    def call(delay, headers):
+        return app_client.post(ep_path, json={
+            'id': 1, 'jsonrpc': '2.0', 'method': 'sleep_default', 'params': {'delay': delay},
+        }, headers=headers).json()
+
+    assert call(0.2, {'X-Timeout': '0.05'}) == {'id': 1, 'jsonrpc': '2.0', 'error': TIMEOUT_ERROR}
+    # client can't extend server timeout
+    assert call(1, {'X-Timeout': '10'}) == {'id': 1, 'jsonrpc': '2.0', 'error': TIMEOUT_ERROR}
+    # malformed value is ignored
+    assert call(0.2, {'X-Timeout': 'soon'}) == {'id': 1, 'jsonrpc': '2.0', 'result': 0.2}
+
+
+def test_batch(json_request):
+    resp = json_request([
+        {'id': 1, 'jsonrpc': '2.0', 'method': 'sleep', 'params': {'delay': 1}},
+        {'id': 2, 'jsonrpc': '2.0', 'method': 'sleep', 'params': {'delay': 0}},
+    ])
+    assert resp == [
+        {'id': 1, 'jsonrpc': '2.0', 'error': TIMEOUT_ERROR},
+        {'id': 2, 'jsonrpc': '2.0', 'result': 0},
+    ]
+
+
+def test_deadline_on_context(method_request):
+    assert method_request('deadline', {}) == {'id': 0, 'jsonrpc': '2.0', 'result': True}
+
+
+def test_own_timeout_not_converted(method_request, assert_log_errors):
+    assert method_request('own_timeout', {}) == {
+        'id': 0, 'jsonrpc': '2.0', 'error': {'code': -32603, 'message': 'Internal error'},
+    }
+    assert_log_errors('', pytest.raises(asyncio.TimeoutError))
+
+
+def test_errors_declared(ep):
+    for route in ep.routes:
+        if isinstance(route, jsonrpc.MethodRoute):
+            assert jsonrpc.RequestTimeout in route.errors